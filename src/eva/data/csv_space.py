@@ -1,9 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
 from eva.data.eva_dataset_base import EvaDatasetBase
 from eva.utilities.config import get
-from datetime import datetime
+import os
 import xarray as xr
 import numpy as np
-import csv
+import pandas as pd
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def read_csv_columns(filename, float_columns, int_columns, skip_rows):
+
+    """
+    Read columns of a CSV file in a single pass.
+
+    Args:
+        filename (str): The CSV file.
+        float_columns (list): Positions of the fields to read as float32.
+        int_columns (list): Positions of the fields to read as int64.
+        skip_rows (int): Number of header lines at the top of the file.
+
+    Returns:
+        dict: The array of each column keyed by its position.
+    """
+
+    dtypes = {column: np.float32 for column in float_columns}
+    dtypes.update({column: np.int64 for column in int_columns})
+
+    file_data = pd.read_csv(filename, header=None, skiprows=skip_rows, usecols=list(dtypes),
+                            dtype=dtypes, skipinitialspace=True)
+
+    return {column: file_data[column].to_numpy() for column in dtypes}
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def dates_to_datetime64(year, month, day, hour):
+
+    """
+    Convert arrays of date components to datetime64.
+
+    Args:
+        year (ndarray): The years.
+        month (ndarray): The months (1-12).
+        day (ndarray): The days of the month.
+        hour (ndarray): The hours (0-23).
+
+    Returns:
+        ndarray: The dates as datetime64[ns] or None if any of the dates is not valid.
+    """
+
+    first_of_month = (year - 1970) * 12 + (month - 1)
+    first_of_month = first_of_month.astype('datetime64[M]')
+    dates = first_of_month + (day - 1).astype('timedelta64[D]')
+
+    valid = (month >= 1) & (month <= 12) & (day >= 1) & (hour >= 0) & (hour <= 23)
+    valid &= dates.astype('datetime64[M]') == first_of_month
+    if not valid.all():
+        return None
+
+    return (dates + hour.astype('timedelta64[h]')).astype('datetime64[ns]')
+
+
+# --------------------------------------------------------------------------------------------------
 
 
 class CsvSpace(EvaDatasetBase):
@@ -17,6 +78,9 @@ class CsvSpace(EvaDatasetBase):
         """
         Executes the processing of CSV dataset.
 
+        Each file is parsed once for all the groups and the files are read in parallel. The rows
+        of the files are concatenated in the order the files are listed.
+
         Args:
             dataset_config (dict): Configuration dictionary for the dataset.
             data_collections (DataCollections): Object for managing data collections.
@@ -33,66 +97,76 @@ class CsvSpace(EvaDatasetBase):
         # get 'groups'
         groups = get(dataset_config, self.logger, 'groups')
 
-        # Set the collection name
-        collection_name = dataset_config['name']
-
-        ds_list = []
+        # Fields needed by all the groups
+        float_columns = set()
+        int_columns = set()
+        skip_rows = 0
+        for group in groups:
+            header_info = get(group, self.logger, 'header', None, False)
+            group_vars = get(group, self.logger, 'variables', None, False)
+            date_config = get(group, self.logger, 'date', None, False)
+
+            if header_info is not None:
+                skip_rows = max(skip_rows, int(header_info.get('rows')))
+            if group_vars is not None:
+                float_columns.update(group_vars.values())
+            if date_config is not None:
+                int_columns.update(date_config.values())
+
+        # Fields used for dates are read as integers and converted if also used as a variable
+        float_columns = sorted(float_columns - int_columns)
+        int_columns = sorted(int_columns)
 
         # Read in the CSV files
-        for file in filenames:
+        max_workers = max(min(len(filenames), os.cpu_count() or 1, 8), 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            files_data = list(executor.map(read_csv_columns, filenames,
+                                           [float_columns] * len(filenames),
+                                           [int_columns] * len(filenames),
+                                           [skip_rows] * len(filenames)))
 
-            f = open(file, "r")
-            fd = list(csv.reader(f, delimiter=","))
-            file_data = [[element.strip() for element in row] for row in fd]
-            f.close()
-
-            for group in groups:
-                group_name = get(group, self.logger, 'name')
-                header_info = get(group, self.logger, 'header', None, False)
-                group_vars = get(group, self.logger, 'variables', None, False)
-
-                selected_fields = get(group, self.logger, 'selected_fields', 'all')
-                date_config = get(group, self.logger, 'date', None, False)
-
-                coord_config = get(group, self.logger, 'coordinate', None, False)
-                coord = None if not coord_config else coord_config.get('name')
-
-                # skip header if present
-                if header_info is not None:
-                    nrows = int(header_info.get('rows'))
-                    file_data.pop(nrows-1)
-
-                # load datetime if available
-                if date_config is not None:
-                    coord = 'Cycle'
-                    var_name = group_name + "::datetime"
-                    dt_arr = self.get_datetime_array(file_data, date_config)
-                    ds = xr.Dataset({var_name: (coord, dt_arr),
-                                     coord: range(0, len(dt_arr))})
+        file_data = {}
+        for column in float_columns + int_columns:
+            file_data[column] = np.concatenate([columns[column] for columns in files_data])
 
+        ds_list = []
+        for group in groups:
+            group_name = get(group, self.logger, 'name')
+            group_vars = get(group, self.logger, 'variables', None, False)
+            date_config = get(group, self.logger, 'date', None, False)
+
+            coord_config = get(group, self.logger, 'coordinate', None, False)
+            coord = None if not coord_config else coord_config.get('name')
+
+            # load datetime if available
+            if date_config is not None:
+                coord = 'Cycle'
+                var_name = group_name + "::datetime"
+                dt_arr = self.get_datetime_array(file_data, date_config)
+                ds = xr.Dataset({var_name: (coord, dt_arr),
+                                 coord: range(0, len(dt_arr))})
+
+                ds_list.append(ds)
+
+            # load requested data
+            if group_vars is not None:
+                if coord is None:
+                    coord = 'Unit'
+                for key, var in group_vars.items():
+                    var_name = group_name + "::" + key
+                    var_arr = file_data[var].astype(np.float32, copy=False)
+
+                    ds = xr.Dataset({var_name: (coord, var_arr),
+                                     coord: range(0, len(var_arr))})
                     ds_list.append(ds)
 
-                # load requested data
-                if group_vars is not None:
-                    for key, var in group_vars.items():
-                        if coord is None:
-                            coord = 'Unit'
-                        var_name = group_name + "::" + key
-                        st_var_arr = [row[var] for row in file_data]
-                        var_arr = np.array(st_var_arr, dtype=np.float32)
-
-                        ds = xr.Dataset({var_name: (coord, var_arr),
-                                         coord: range(0, len(var_arr))})
-                        ds_list.append(ds)
-
         # Concatenate datasets from ds_list into a single dataset
         ds = xr.merge(ds_list)
 
         # Assert that the collection contains at least one variable
         if not ds.keys():
-            self.logger.abort('Collection \'' + dataset_config['name'] + '\', group \'' +
-                              group + '\' in file ' + filename +
-                              ' does not have any variables.')
+            self.logger.abort('Collection \'' + collection_name + '\' in files ' +
+                              f'{filenames} does not have any variables.')
 
         # add the dataset_config to the collections
         data_collections.create_or_add_to_collection(collection_name, ds)
@@ -129,7 +203,7 @@ class CsvSpace(EvaDatasetBase):
         may be in a single field of file_data or in 4 fields (y,m,d,h).
 
         Args:
-            file_data (list): List of data
+            file_data (dict): Integer array of each field keyed by its position
             date_config (dict): date configuration information
 
         Returns:
@@ -140,14 +214,15 @@ class CsvSpace(EvaDatasetBase):
         date_keys = {'year', 'month', 'day', 'hour'}
 
         if datetime_key in date_config:
-            date_str_list = [row[date_config.get('datetime')] for row in file_data]
+            # Split YYYYMMDDHH into its components
+            date_int = file_data[date_config.get('datetime')]
+            year, month_day_hour = np.divmod(date_int, 1000000)
+            month, day_hour = np.divmod(month_day_hour, 10000)
+            day, hour = np.divmod(day_hour, 100)
 
         elif all(k in (date_keys) for k in date_config):
-            yr = [row[date_config.get('year')] for row in file_data]
-            mon = [row[date_config.get('month')] for row in file_data]
-            day = [row[date_config.get('day')] for row in file_data]
-            hr = [row[date_config.get('hour')] for row in file_data]
-            date_str_list = [y + m + d + h for y, m, d, h in zip(yr, mon, day, hr)]
+            year, month, day, hour = [file_data[date_config.get(key)]
+                                      for key in ['year', 'month', 'day', 'hour']]
 
         else:
             self.logger.abort("The date configuration in yaml file does not contain required " +
@@ -156,6 +231,9 @@ class CsvSpace(EvaDatasetBase):
                               " \'year\': int, \'month\': int, \'day\': int, and \'hour\': int. " +
                               f" Date information found was {date_config}")
 
-        return np.array([np.datetime64(datetime.strptime(ds,
-                                       '%Y%m%d%H').strftime('%Y-%m-%dT%H:%M:%S.%f000000'),
-                                       'ns') for ds in date_str_list])
+        dt_arr = dates_to_datetime64(year, month, day, hour)
+        if dt_arr is None:
+            self.logger.abort(f'The dates in fields {date_config} are not all valid YYYYMMDDHH ' +
+                              'dates.')
+
+        return dt_arr
@@ -9,29 +9,74 @@
 # --------------------------------------------------------------------------------------------------
 
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
 import numpy as np
 import xarray as xr
 from netCDF4 import Dataset
 from eva.data.eva_dataset_base import EvaDatasetBase
 from eva.utilities.config import get
+from eva.utilities.utils import parse_channel_list, read_variable_levels
 
 
 # --------------------------------------------------------------------------------------------------
 
 
-def read_fms_tiles(files, variable, logger):
+def read_fms_tile(file, variables, levels=None):
 
     """
-    Given a list of FMS netCDF files and a variable name,
-    stitches the files together into an N+1 dimension variable.
+    Read variables from a single FMS netCDF tile file, opening the file once.
+
+    Args:
+        file (str): Path of the netCDF file.
+        variables (list): Names of the variables to extract.
+        levels (dict): Indices of the levels to read from each variable. All levels are read from
+                       variables that are not in it.
+
+    Returns:
+        dict: The (squeezed) array of each variable with missing values of floats set to NaN.
+
+    Raises:
+        KeyError: If a variable is not in the file.
+        IndexError: If a level is not in a 3D variable.
+    """
+
+    tile_vars = {}
+    with Dataset(file, mode='r') as f:
+        for variable in variables:
+            var = read_variable_levels(f.variables[variable], (levels or {}).get(variable))
+
+            if variable in ['lon', 'geolon']:
+                # transform longitudes to be -180 to 180
+                wrap = np.where(var > 180)
+                var[wrap] = var[wrap] - 360
+
+            tile_vars[variable] = var
+
+    return tile_vars
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def read_fms_tiles(files, variables, logger, levels=None):
+
+    """
+    Given a list of FMS netCDF files (one per tile) and variable names,
+    stitches the files together into an N+1 dimension array for each variable.
+
+    Each file is opened once to read all the variables and the tiles are read in parallel
+    processes.
 
     Args:
         files (list): List of netCDF file paths.
-        variable (str): Name of the variable to extract.
+        variables (list): Names of the variables to extract.
         logger (Logger): Logger object for logging messages.
+        levels (dict): Indices of the levels to read from each variable. All levels are read from
+                       variables that are not in it.
 
     Returns:
-        np.ndarray: Combined variable array from input files.
+        dict: Combined array of each variable with the tile as the last dimension.
     """
 
     # Check there are no duplicates in files
@@ -39,26 +84,33 @@ def read_fms_tiles(files, variable, logger):
         logger.abort('Duplicate files were found in input file ' +
                      f'list: {files}. \nExiting ...')
 
-    # Loop through nc files and store variable data in outvar
-    for i, file in enumerate(files):
-
-        with Dataset(file, mode='r') as f:
-            try:
-                var = np.squeeze(f.variables[variable][:])
-            except KeyError:
-                logger.abort(f"{variable} is not a valid variable. \nExiting ...")
-
-            if variable in ['lon', 'geolon']:
-                # transform longitudes to be -180 to 180
-                var[np.where(var > 180)] = var[np.where(var > 180)] - 360
+    outvars = {}
 
-            if i == 0:
-                # need to create outvar on the first file
-                outvar = np.empty(var.shape+(len(files),), dtype=var.dtype)
+    def store_tile(i, tile_vars):
+        for variable, var in tile_vars.items():
+            if variable not in outvars:
+                # need to create outvar on the first tile that is read
+                outvars[variable] = np.empty(var.shape+(len(files),), dtype=var.dtype)
             # add values to the correct part of the array
-            outvar[..., i] = var
-
-    return outvar
+            outvars[variable][..., i] = var
+
+    max_workers = max(min(len(files), os.cpu_count() or 1), 1)
+    try:
+        if max_workers == 1:
+            for i, file in enumerate(files):
+                store_tile(i, read_fms_tile(file, variables, levels))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(read_fms_tile, file, variables, levels): i
+                           for i, file in enumerate(files)}
+                for future in as_completed(futures):
+                    store_tile(futures[future], future.result())
+    except KeyError as error:
+        logger.abort(f"{error.args[0]} is not a valid variable. \nExiting ...")
+    except IndexError as error:
+        logger.abort(f"{error} \nExiting ...")
+
+    return outvars
 
 
 # --------------------------------------------------------------------------------------------------
@@ -100,34 +152,49 @@ class CubedSphereRestart(EvaDatasetBase):
         vars_2d = get(dataset_config, self.logger, '2d variables', default=[])
         vars_3d = get(dataset_config, self.logger, '3d variables', default=[])
 
+        # Optionally only read some levels of the 3D variables
+        # -------------------------
+        levels = parse_channel_list(get(dataset_config, self.logger, 'levels', []), self.logger)
+        levels = sorted(set(levels))
+
         # Read orographic fields first
         # -------------------------
         var_dict = {}
         group_name = 'FV3Orog'
-        for var in orog_vars:
-            var_dict[group_name + '::' + var] = (["lon", "lat", "tile"],
-                                                 read_fms_tiles(orog_filenames, var, self.logger))
+        if orog_vars:
+            orog_data = read_fms_tiles(orog_filenames, orog_vars, self.logger)
+            for var in orog_vars:
+                var_dict[group_name + '::' + var] = (["lon", "lat", "tile"], orog_data[var])
+
+        # 2D and 3D variables are read from the same restart files, 2D variables might still have
+        # a vertical dimension of size one so the levels only apply to the 3D variables
+        # -------------------------
+        if vars_2d or vars_3d:
+            variable_levels = {var: levels for var in vars_3d}
+            restart_data = read_fms_tiles(restart_filenames, vars_2d + vars_3d, self.logger,
+                                          variable_levels)
 
         # 2D variables
         # -------------------------
         group_name = 'FV3Vars2D'
         for var in vars_2d:
-            var_dict[group_name + '::' + var] = (["lon", "lat", "tile"],
-                                                 read_fms_tiles(restart_filenames,
-                                                                var, self.logger))
+            var_dict[group_name + '::' + var] = (["lon", "lat", "tile"], restart_data[var])
 
         # 3D variables
         # -------------------------
         group_name = 'FV3Vars3D'
         for var in vars_3d:
-            var_dict[group_name + '::' + var] = (["lev", "lon", "lat", "tile"],
-                                                 read_fms_tiles(restart_filenames,
-                                                                var, self.logger))
+            var_dict[group_name + '::' + var] = (["lev", "lon", "lat", "tile"], restart_data[var])
 
         # Create dataset_config from data dictionary
         # -------------------------
         ds = xr.Dataset(var_dict)
 
+        # Label the levels that were read with their index
+        # -------------------------
+        if levels and 'lev' in ds.dims:
+            ds = ds.assign_coords(lev=levels)
+
         # Assert that the collection contains at least one variable
         # -------------------------
         if not ds.keys():
@@ -10,10 +10,13 @@
 # --------------------------------------------------------------------------------------------------
 
 
+import functools
 import numpy as np
 from xarray import Dataset, concat, DataArray
 
+from eva.utilities.lat_lon_bucket_index import LatLonBucketIndex
 from eva.utilities.logger import Logger
+from eva.utilities.stats import VariableStatistics
 from eva.utilities.utils import fontColors as fcol, string_does_not_contain
 
 
@@ -45,6 +48,16 @@ class DataCollections:
         # If this is a time series, store it
         self.time_series = False if not time_series else True
 
+        # Channels of an active batch figure and the per variable data prepared for them
+        self._channel_batch = None
+        self._channel_batch_cache = {}
+
+        # Latitude/longitude bucket indices keyed by the coordinates they were built from
+        self._lat_lon_indices = {}
+
+        # Statistics of variables keyed by the variable and the selection from it
+        self._variable_statistics = {}
+
     # ----------------------------------------------------------------------------------------------
 
     def create_or_add_to_collection(self, collection_name, collection, concat_dimension=None):
@@ -103,6 +116,11 @@ class DataCollections:
             self._collections[collection_name] = concat([self._collections[collection_name],
                                                         collection], dim=concat_dimension)
 
+        # Any data prepared for a channel batch, indexed or summarized may now be stale
+        self._channel_batch_cache = {}
+        self._lat_lon_indices = {}
+        self._variable_statistics = {}
+
         # Check that nothing violates the naming conventions
         self.validate_names()
 
@@ -177,6 +195,11 @@ class DataCollections:
         # Add the variable to the collection
         self._collections[collection_name][group_variable_name] = variable
 
+        # Any data prepared for a channel batch, indexed or summarized may now be stale
+        self._channel_batch_cache.pop((collection_name, group_variable_name), None)
+        self._lat_lon_indices = {}
+        self._variable_statistics = {}
+
         # Check that nothing violates the naming conventions
         self.validate_names()
 
@@ -187,6 +210,11 @@ class DataCollections:
 
     # ----------------------------------------------------------------------------------------------
 
+    def get_collection_names(self):
+        return list(self._collections.keys())
+
+    # ----------------------------------------------------------------------------------------------
+
     def get_variable_data_array(self, collection_name, group_name, variable_name,
                                 channels=None, levels=None, datatypes=None):
 
@@ -221,6 +249,14 @@ class DataCollections:
         if channels is None and levels is None and datatypes is None:
             return data_array
 
+        # Serve single channel requests from the active channel batch if possible
+        if channels is not None and self._channel_batch is not None:
+            batch_entry = self._get_channel_batch_entry(collection_name, group_variable_name,
+                                                        channels)
+            if batch_entry is not None:
+                index = batch_entry['index'][channels]
+                return batch_entry['data_array'].isel(Channel=slice(index, index+1))
+
         if channels is not None:
             if isinstance(channels, int) or not any(not isinstance(c, int) for c in channels):
                 # Channel must be a dimension if it will be used for selection
@@ -289,7 +325,9 @@ class DataCollections:
             datatypes (str or list[str]): Indices of data types to select (optional).
 
         Returns:
-            ndarray: The selected variable data as a NumPy array.
+            ndarray: The selected variable data as a NumPy array. This can be a view of the
+                     collection, and is read-only when served from an active channel batch, so
+                     copy it (e.g. with flatten or copy) before modifying it in place.
         """
 
         # If time_series collection name must also be time_series
@@ -310,6 +348,242 @@ class DataCollections:
 
     # ----------------------------------------------------------------------------------------------
 
+    def get_valid_variable_data(self, collection_name, group_name, variable_name,
+                                channels=None, levels=None, datatypes=None):
+
+        """
+        Retrieve the flattened data of a specific variable with missing (NaN) values removed.
+
+        Args:
+            collection_name (str): Name of the collection.
+            group_name (str): Name of the group where the variable belongs.
+            variable_name (str): Name of the variable.
+            channels (int or list[int]): Indices of channels to select (optional).
+            levels (int or list[int]): Indices of levels to select (optional).
+            datatypes (str or list[str]): Indices of data types to select (optional).
+
+        Returns:
+            ndarray: The flattened variable data without missing values. This is read-only when
+                     served from an active channel batch.
+        """
+
+        return self._get_valid_variable_data(collection_name, group_name, variable_name,
+                                             channels, levels, datatypes)[0]
+
+    # ----------------------------------------------------------------------------------------------
+
+    def get_variable_statistics(self, collection_name, group_name, variable_name,
+                                channels=None, levels=None, datatypes=None):
+
+        """
+        Return the (cached) statistics object for a selection of a variable.
+
+        Args:
+            collection_name (str): Name of the collection.
+            group_name (str): Name of the group where the variable belongs.
+            variable_name (str): Name of the variable.
+            channels (int or list[int]): Indices of channels to select (optional).
+            levels (int or list[int]): Indices of levels to select (optional).
+            datatypes (str or list[str]): Indices of data types to select (optional).
+
+        Returns:
+            VariableStatistics: Statistics of the selected data.
+        """
+
+        key = (collection_name, group_name + '::' + variable_name, repr(channels), repr(levels),
+               repr(datatypes))
+
+        if key not in self._variable_statistics:
+            load_data = functools.partial(self._get_valid_variable_data, collection_name,
+                                          group_name, variable_name, channels, levels, datatypes)
+            self._variable_statistics[key] = VariableStatistics(load_data)
+
+        return self._variable_statistics[key]
+
+    # ----------------------------------------------------------------------------------------------
+
+    def get_lat_lon_index(self, index_key, latitude, longitude):
+
+        """
+        Return a coarse latitude/longitude bucket index, building it on first use.
+
+        Args:
+            index_key (tuple): Identifies the coordinates, e.g. the collection::group::variable
+                               names and any slicing of the latitude and longitude.
+            latitude (ndarray): Latitude values used to build the index if needed.
+            longitude (ndarray): Longitude values used to build the index if needed.
+
+        Returns:
+            LatLonBucketIndex: The index of the coordinates.
+        """
+
+        if index_key not in self._lat_lon_indices:
+            self._lat_lon_indices[index_key] = LatLonBucketIndex(latitude, longitude)
+
+        return self._lat_lon_indices[index_key]
+
+    # ----------------------------------------------------------------------------------------------
+
+    def begin_channel_batch(self, channels):
+
+        """
+        Start a batch of requests that each select one of a known list of channels.
+
+        While the batch is active, the first request for a variable selects all of the batch
+        channels in a single vectorized operation. Subsequent single channel requests for that
+        variable are served as views into the selection rather than a new copy per channel. The
+        views are read-only, callers that modify the data must copy it first.
+
+        Args:
+            channels (list[int]): The channels that will be requested during the batch.
+        """
+
+        self._channel_batch = list(channels)
+        self._channel_batch_cache = {}
+
+    # ----------------------------------------------------------------------------------------------
+
+    def end_channel_batch(self):
+
+        """End the active channel batch and release the data prepared for it."""
+
+        self._channel_batch = None
+        self._channel_batch_cache = {}
+
+    # ----------------------------------------------------------------------------------------------
+
+    def _get_valid_variable_data(self, collection_name, group_name, variable_name,
+                                 channels=None, levels=None, datatypes=None):
+
+        """
+        Retrieve the valid data of a variable along with the number of elements it had before the
+        missing values were removed.
+
+        Args:
+            collection_name (str): Name of the collection.
+            group_name (str): Name of the group where the variable belongs.
+            variable_name (str): Name of the variable.
+            channels (int or list[int]): Indices of channels to select (optional).
+            levels (int or list[int]): Indices of levels to select (optional).
+            datatypes (str or list[str]): Indices of data types to select (optional).
+
+        Returns:
+            tuple: The flattened variable data without missing values and the number of elements
+                   of the selection including missing values.
+        """
+
+        # When a channel batch is active the compacted data is prepared for all channels at once
+        if channels is not None and self._channel_batch is not None:
+            group_variable_name = group_name + '::' + variable_name
+            batch_entry = self._get_channel_batch_entry(collection_name, group_variable_name,
+                                                        channels)
+            if batch_entry is not None:
+                if 'compact' not in batch_entry:
+                    self._compact_channel_batch_entry(batch_entry)
+                index = batch_entry['index'][channels]
+                offsets = batch_entry['offsets']
+                data_array = batch_entry['data_array']
+                size = data_array.size // max(data_array.sizes['Channel'], 1)
+                return batch_entry['compact'][offsets[index]:offsets[index+1]], size
+
+        variable_data = self.get_variable_data(collection_name, group_name, variable_name,
+                                               channels, levels, datatypes)
+
+        # Flatten and mask missing data
+        variable_data = variable_data.flatten()
+        size = variable_data.size
+        if np.issubdtype(variable_data.dtype, np.floating):
+            variable_data = variable_data[~np.isnan(variable_data)]
+
+        return variable_data, size
+
+    # ----------------------------------------------------------------------------------------------
+
+    def _get_channel_batch_entry(self, collection_name, group_variable_name, channel):
+
+        """
+        Return the data prepared for a variable in the active channel batch.
+
+        Args:
+            collection_name (str): Name of the collection.
+            group_variable_name (str): Name of the variable in the form group::variable.
+            channel (int): The channel being requested.
+
+        Returns:
+            dict: The prepared data for the variable or None if the request cannot be served from
+                  the batch, in which case the caller should fall back to a direct selection.
+        """
+
+        # Only single integer channels are batched
+        if not isinstance(channel, int) or channel not in self._channel_batch:
+            return None
+
+        key = (collection_name, group_variable_name)
+        if key not in self._channel_batch_cache:
+
+            data_array = self._collections[collection_name][group_variable_name]
+            batch_entry = None
+
+            if 'Channel' in data_array.indexes:
+                # Positions of the batch channels that exist for this variable
+                positions = data_array.indexes['Channel'].get_indexer(self._channel_batch)
+                present = positions >= 0
+                positions = positions[present]
+                batch_channels = np.array(self._channel_batch)[present]
+
+                # Select all the channels in one pass and protect the selection since later
+                # requests will receive views into it
+                data_array_channels = data_array.isel(Channel=positions)
+                if isinstance(data_array_channels.data, np.ndarray):
+                    data_array_channels.data.setflags(write=False)
+
+                batch_entry = {}
+                batch_entry['data_array'] = data_array_channels
+                batch_entry['index'] = {int(c): i for i, c in enumerate(batch_channels)}
+
+            self._channel_batch_cache[key] = batch_entry
+
+        batch_entry = self._channel_batch_cache[key]
+        if batch_entry is None or channel not in batch_entry['index']:
+            return None
+
+        return batch_entry
+
+    # ----------------------------------------------------------------------------------------------
+
+    def _compact_channel_batch_entry(self, batch_entry):
+
+        """
+        Compute the valid (non-NaN) data for every channel of a batch entry in one sweep.
+
+        The compacted data of all channels is stored contiguously, grouped by channel, with
+        offsets such that the data for channel index i is compact[offsets[i]:offsets[i+1]].
+
+        Args:
+            batch_entry (dict): Entry returned by _get_channel_batch_entry.
+        """
+
+        data_array = batch_entry['data_array']
+        channel_axis = data_array.dims.index('Channel')
+
+        # View with the channel first so compacted values end up grouped by channel
+        data = np.moveaxis(data_array.values, channel_axis, 0)
+        nchannels = data.shape[0]
+
+        if np.issubdtype(data.dtype, np.floating):
+            valid = ~np.isnan(data)
+            compact = data[valid]
+            counts = valid.reshape(nchannels, -1).sum(axis=1)
+        else:
+            compact = data.reshape(-1)
+            counts = np.full(nchannels, compact.size // max(nchannels, 1))
+
+        compact.setflags(write=False)
+        batch_entry['compact'] = compact
+        batch_entry['offsets'] = np.concatenate(([0], np.cumsum(counts)))
+
+    # ----------------------------------------------------------------------------------------------
+
     def validate_names(self):
 
         """Validate naming conventions for collections, groups, and variables."""
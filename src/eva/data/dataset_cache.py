@@ -0,0 +1,269 @@
+# (C) Copyright 2021-2023 NOAA/NWS/EMC
+#
+# (C) Copyright 2021-2023 United States Government as represented by the Administrator of the
+# National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+from collections import OrderedDict
+import json
+
+from eva.data.data_collections import DataCollections
+from eva.data.data_driver import data_driver
+from eva.utilities.utils import file_fingerprints
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def dataset_recipes(datasets_config):
+
+    """
+    Group the datasets of a configuration by the collection they are read into.
+
+    Args:
+        datasets_config (list): The datasets of a configuration.
+
+    Returns:
+        list: The datasets that make up each collection in the order they are listed. Datasets
+              without a collection name are each in a group of their own.
+    """
+
+    recipes = {}
+    for ind, dataset_config in enumerate(datasets_config):
+        name = dataset_config.get('name', dataset_config.get('collection_name'))
+        recipes.setdefault(ind if name is None else name, []).append(dataset_config)
+
+    return list(recipes.values())
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def recipe_key(recipe):
+
+    """
+    Return a key that is the same for identical lists of datasets.
+
+    Args:
+        recipe (list): The datasets that make up a collection.
+
+    Returns:
+        str: The key.
+    """
+
+    return json.dumps(recipe, sort_keys=True, default=str)
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+class DatasetCache:
+
+    """
+    Collections read from the datasets of several configurations, each read only once.
+
+    The datasets are grouped into the ones that make up each collection. A group that is identical
+    in several configurations is read once into a private DataCollections and every configuration
+    gets its own (shallow) copy of the collections it produced, so the transforms of one
+    configuration do not change the data of another.
+
+    A cache can also retain some groups that no configuration needs any more, for configurations
+    that are not known yet (e.g. later jobs of eva serve). These are dropped least recently used
+    first and are read again if the size or modification time of one of their files changed.
+    """
+
+    def __init__(self, retain=0):
+
+        """
+        Initialize an empty cache.
+
+        Args:
+            retain (int, optional): Number of groups of datasets to keep once no registered
+                                    configuration needs them. Default is 0.
+        """
+
+        self.retain = retain
+
+        # Collections produced by each group of datasets, least recently used first
+        self.collections = OrderedDict()
+
+        # Size and modification time of the files of the retained groups when they were read
+        self.fingerprints = {}
+
+        # Number of configurations that still need each group of datasets
+        self.uses = {}
+
+        self.reads = 0
+        self.hits = 0
+
+    # ----------------------------------------------------------------------------------------------
+
+    def register(self, datasets_config):
+
+        """
+        Record that a configuration will need its datasets.
+
+        Args:
+            datasets_config (list): The datasets of the configuration.
+        """
+
+        for recipe in dataset_recipes(datasets_config):
+            key = recipe_key(recipe)
+            self.uses[key] = self.uses.get(key, 0) + 1
+
+    # ----------------------------------------------------------------------------------------------
+
+    def shared_recipes(self, datasets_configs):
+
+        """
+        Return the groups of datasets that are needed by more than one configuration.
+
+        Args:
+            datasets_configs (list): The datasets of each configuration.
+
+        Returns:
+            list: The groups of datasets.
+        """
+
+        counts = {}
+        recipes = {}
+        for datasets_config in datasets_configs:
+            for recipe in dataset_recipes(datasets_config):
+                key = recipe_key(recipe)
+                counts[key] = counts.get(key, 0) + 1
+                recipes[key] = recipe
+
+        return [recipes[key] for key, count in counts.items() if count > 1]
+
+    # ----------------------------------------------------------------------------------------------
+
+    def keep_only_read(self):
+
+        """
+        Stop keeping collections other than the ones that have already been read.
+
+        Worker processes forked from a process with this cache share the collections that were read
+        before the fork, but a collection read in a worker is only needed by the configuration that
+        read it, so it should not be kept for the lifetime of the worker.
+        """
+
+        self.uses = {key: uses for key, uses in self.uses.items() if key in self.collections}
+
+    # ----------------------------------------------------------------------------------------------
+
+    def read(self, recipe, timing, logger):
+
+        """
+        Return the collections made by a group of datasets, reading them if needed.
+
+        Args:
+            recipe (list): The datasets that make up a collection.
+            timing (Timing): Timing object for tracking execution time.
+            logger (Logger): An instance of the logger for logging messages.
+
+        Returns:
+            dict: The xarray Dataset of each collection made by the datasets.
+        """
+
+        key = recipe_key(recipe)
+        if key in self.collections:
+            if self.retain == 0 or self.fingerprints[key] == file_fingerprints(recipe):
+                self.hits += 1
+                self.collections.move_to_end(key)
+                return self.collections[key]
+            logger.info('The files of a cached collection changed, reading them again.')
+            self.drop(key)
+
+        recipe_collections = DataCollections()
+        for dataset_config in recipe:
+            logger.info('Running data driver')
+            timing.start('DataDriverExecute')
+            data_driver(dataset_config, recipe_collections, timing, logger)
+            timing.stop('DataDriverExecute')
+
+        self.reads += 1
+        collections = {name: recipe_collections.get_data_collection(name)
+                       for name in recipe_collections.get_collection_names()}
+
+        # Only keep the collections that a registered configuration will need again, or that may
+        # be needed later when retaining
+        if key in self.uses or self.retain > 0:
+            self.collections[key] = collections
+            if self.retain > 0:
+                self.fingerprints[key] = file_fingerprints(recipe)
+            self.drop_unused()
+        return collections
+
+    # ----------------------------------------------------------------------------------------------
+
+    def add_to_collections(self, datasets_config, data_collections, timing, logger):
+
+        """
+        Add the collections made by the datasets of a configuration to its data collections.
+
+        Args:
+            datasets_config (list): The datasets of the configuration.
+            data_collections (DataCollections): The data collections of the configuration.
+            timing (Timing): Timing object for tracking execution time.
+            logger (Logger): An instance of the logger for logging messages.
+        """
+
+        for recipe in dataset_recipes(datasets_config):
+            for name, collection in self.read(recipe, timing, logger).items():
+                data_collections.create_or_add_to_collection(name, collection)
+
+    # ----------------------------------------------------------------------------------------------
+
+    def release(self, datasets_config):
+
+        """
+        Record that a configuration no longer needs its datasets, dropping those no longer needed.
+
+        Args:
+            datasets_config (list): The datasets of the configuration.
+        """
+
+        for recipe in dataset_recipes(datasets_config):
+            key = recipe_key(recipe)
+            self.uses[key] = self.uses.get(key, 0) - 1
+            if self.uses[key] <= 0:
+                self.uses.pop(key)
+                if self.retain == 0:
+                    self.drop(key)
+        self.drop_unused()
+
+    # ----------------------------------------------------------------------------------------------
+
+    def drop(self, key):
+
+        """
+        Drop the collections of a group of datasets.
+
+        Args:
+            key (str): The key of the group.
+        """
+
+        self.collections.pop(key, None)
+        self.fingerprints.pop(key, None)
+
+    # ----------------------------------------------------------------------------------------------
+
+    def drop_unused(self):
+
+        """
+        Drop the least recently used groups that no registered configuration needs, keeping at
+        most the number that is retained.
+        """
+
+        unused = [key for key in self.collections if key not in self.uses]
+        for key in unused[:max(len(unused) - self.retain, 0)]:
+            self.drop(key)
+
+
+# --------------------------------------------------------------------------------------------------
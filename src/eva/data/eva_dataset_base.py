@@ -8,7 +8,6 @@
 
 # imports
 from abc import ABC, abstractmethod
-import importlib
 import os
 import sys
 import yaml
@@ -17,6 +16,7 @@ import yaml
 from eva.eva_path import return_eva_path
 from eva.utilities.config import Config
 from eva.utilities.logger import Logger
+from eva.utilities.registry import registered_object
 from eva.utilities.timing import Timing
 from eva.utilities.utils import camelcase_to_underscore
 from eva.data.data_collections import DataCollections
@@ -113,28 +113,19 @@ class EvaDatasetFactory():
         # Convert capitilized string to one with underscores
         # --------------------------------------------------
         eva_module_name = camelcase_to_underscore(eva_class_name)
-
-        # Check user provided class name against valid tasks
-        # --------------------------------------------------
-        # List of modules in directory
-        valid_module = os.listdir(os.path.join(return_eva_path(), eva_group_name))
-        # Remove files like __*
-        valid_module = [vm for vm in valid_module if '__' not in vm]
-        # Remove trailing .py
-        valid_module = [vm.replace(".py", "") for vm in valid_module]
-        # Abort if not found
+        module_to_import = "eva."+eva_group_name+"."+eva_module_name
         expected_file = os.path.join(return_eva_path(), eva_group_name, eva_module_name)
-        if (eva_module_name not in valid_module):
-            logger.abort(f'Expecting to find a class called \'{eva_class_name}\' in a file ' +
-                         f'called \'{expected_file}.py\' but no such file was found.')
 
-        # Import class based on user selected task
-        # ----------------------------------------
-        module_to_import = "eva."+eva_group_name+"."+eva_module_name
+        # Import class based on user selected task, classes that are not registered are looked
+        # for in the module named after them
+        # ------------------------------------------------------------------------------------
         timing.start(f'EvaDatasetFactory import: {eva_class_name} from {module_to_import}')
         try:
-            eva_class = getattr(importlib.import_module(module_to_import), eva_class_name)
+            eva_class = registered_object(eva_group_name, eva_class_name, module_to_import)
         except Exception as e:
+            if isinstance(e, ModuleNotFoundError) and e.name == module_to_import:
+                logger.abort(f'Expecting to find a class called \'{eva_class_name}\' in a ' +
+                             f'file called \'{expected_file}.py\' but no such file was found.')
             logger.abort(f'Expecting to find a class called \'{eva_class_name}\' in a file ' +
                          f'called \'{expected_file}.py\' but no such file was found or an error ' +
                          f'occurred during import. \n Reported error: {e}.')
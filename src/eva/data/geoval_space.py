@@ -49,7 +49,7 @@ class GeovalSpace(EvaDatasetBase):
         # Convert levels to list
         levels = []
         if levels_str_or_list is not []:
-            levels = parse_channel_list(levels_str_or_list, self.logger)
+            levels = sorted(set(parse_channel_list(levels_str_or_list, self.logger)))
 
         # Filename to be used for reads
         # ---------------------------------------
@@ -77,9 +77,23 @@ class GeovalSpace(EvaDatasetBase):
             if np.size(dims) > 1:
                 rename_dims_dict[dims[1]] = f'Level'
             rename_dict[v] = f'{instr_name}::{v}'
+
+        # Keep only the requested levels, the file is read lazily so only these levels are read
+        if levels and rename_dims_dict:
+            for level_dim in rename_dims_dict:
+                nlevels = instr_ds.sizes[level_dim]
+                if levels[0] < 0 or levels[-1] >= nlevels:
+                    self.logger.abort(f'Levels {levels} are not all within the {nlevels} ' +
+                                      f'levels of {data_filename}.')
+            instr_ds = instr_ds.isel({level_dim: levels for level_dim in rename_dims_dict})
+
         instr_ds = instr_ds.rename(rename_dict)
         instr_ds = instr_ds.rename_dims(rename_dims_dict)
 
+        # Label the levels that were kept with their index
+        if levels and rename_dims_dict:
+            instr_ds = instr_ds.assign_coords(Level=levels)
+
         # Add the dataset_config to the collections
         data_collections.create_or_add_to_collection(collection_name, instr_ds)
 
@@ -8,9 +8,9 @@
 
 # --------------------------------------------------------------------------------------------------
 
+from concurrent.futures import ThreadPoolExecutor
 import os
 import numpy as np
-from itertools import groupby
 from xarray import Dataset, open_dataset
 
 from eva.data.eva_dataset_base import EvaDatasetBase
@@ -20,20 +20,9 @@ from eva.utilities.utils import parse_channel_list
 # --------------------------------------------------------------------------------------------------
 
 
-def all_equal(iterable):
-
-    """
-    Check if all elements in an iterable are equal.
-
-    Args:
-        iterable: An iterable object to check.
-
-    Returns:
-        bool: True if all elements are equal, False otherwise.
-    """
-
-    g = groupby(iterable)
-    return next(g, True) and not next(g, False)
+# GeoVaLs that are written to satellite diags but are not read
+geoval_variables = ['air_temperature', 'air_pressure', 'air_pressure_levels',
+                    'atmosphere_absorber_01', 'atmosphere_absorber_02', 'atmosphere_absorber_03']
 
 
 # --------------------------------------------------------------------------------------------------
@@ -117,6 +106,10 @@ def satellite_dataset(ds):
     """
     Build a new dataset to reshape satellite data.
 
+    The variables of a satellite diag are flattened to nobs*nchans. Variables whose values repeat
+    over the channels of the first observation are kept per observation, the others are reshaped
+    to (nobs, nchans). All the variables are classified together, one comparison per data type.
+
     Args:
         ds (Dataset): The input xarray Dataset.
 
@@ -133,17 +126,28 @@ def satellite_dataset(ds):
         'BC_angord_arr_dim': (('BC_angord_arr_dim'), np.arange(0, 4))
     }
 
-    data_vars = {}
-    # Loop through each variable
-    for var in ds.variables:
+    # Ignore geovals data
+    variables = [var for var in ds.variables if var not in geoval_variables]
+
+    # Variables with len of nchans are passed along, the rest are flattened over nobs*nchans
+    channel_vars = [var for var in variables if len(ds[var]) == nchans]
+    flat_vars = [var for var in variables if var not in channel_vars and var != 'BC_angord']
 
-        # Ignore geovals data
-        if var in ['air_temperature', 'air_pressure', 'air_pressure_levels',
-                   'atmosphere_absorber_01', 'atmosphere_absorber_02', 'atmosphere_absorber_03']:
-            continue
+    # Check if values repeat over nchans for all flattened variables of the same type at once
+    repeating = {}
+    flat_vars_by_dtype = {}
+    for var in flat_vars:
+        flat_vars_by_dtype.setdefault((ds[var].dtype, ds[var].shape), []).append(var)
+    for var_list in flat_vars_by_dtype.values():
+        first_obs = np.stack([ds[var].data[0:nchans] for var in var_list])
+        condition = (first_obs == first_obs[:, 0:1]).reshape(len(var_list), -1).all(axis=1)
+        repeating.update(zip(var_list, condition))
+
+    data_vars = {}
+    for var in variables:
 
         # If variable has len of nchans, pass along data
-        if len(ds[var]) == nchans:
+        if var in channel_vars:
             data_vars[var] = (('nchans'), ds[var].data)
 
         # If variable is BC_angord, reshape data
@@ -152,20 +156,15 @@ def satellite_dataset(ds):
                               (iters, nchans, ds.dims['BC_angord_arr_dim']))
             data_vars[var] = (('nobs', 'nchans', 'BC_angord_arr_dim'), data)
 
-        # Deals with how to handle nobs data
-        else:
-            # Check if values repeat over nchans
-            condition = all_equal(ds[var].data[0:nchans])
-
-            # If values are repeating over nchan iterations, keep as nobs
-            if condition:
-                data = ds[var].data[0::nchans]
-                data_vars[var] = (('nobs'), data)
+        # If values are repeating over nchan iterations, keep as nobs
+        elif repeating[var]:
+            data = ds[var].data[0::nchans]
+            data_vars[var] = (('nobs'), data)
 
-            # Else, reshape to be a 2d array
-            else:
-                data = np.reshape(ds[var].data, (iters, nchans))
-                data_vars[var] = (('nobs', 'nchans'), data)
+        # Else, reshape to be a 2d array
+        else:
+            data = np.reshape(ds[var].data, (iters, nchans))
+            data_vars[var] = (('nobs', 'nchans'), data)
 
     # create dataset_config
     new_ds = Dataset(data_vars=data_vars,
@@ -211,6 +210,7 @@ class GsiObsSpace(EvaDatasetBase):
         filenames = get(dataset_config, self.logger, 'filenames')
 
         # File variable type
+        variable = None
         if 'satellite' in dataset_config:
             satellite = get(dataset_config, self.logger, 'satellite')
             sensor = get(dataset_config, self.logger, 'sensor')
@@ -225,67 +225,20 @@ class GsiObsSpace(EvaDatasetBase):
         # -------------------------
         groups = get(dataset_config, self.logger, 'groups')
 
-        # Loop over filenames
-        # -------------------
-        for filename in filenames:
-
-            # Loop over groups
-            for group in groups:
-
-                # Group name and variables
-                group_name = get(group, self.logger, 'name')
-                group_vars = get(group, self.logger, 'variables', 'all')
-
-                # Set the collection name
-                collection_name = dataset_config['name']
-
-                ds = open_dataset(filename, mask_and_scale=False,
-                                  decode_times=False)
-
-                # If user specifies all variables set to group list
-                if group_vars == 'all':
-                    group_vars = list(ds.data_vars)
-
-                # Reshape variables if satellite diag
-                if 'nchans' in ds.dims:
-                    ds = satellite_dataset(ds)
-                    ds = subset_channels(ds, channels, self.logger)
-
-                # Adjust variable names if uv
-                if 'variable' in locals():
-                    if variable == 'uv':
-                        group_vars = uv(group_vars)
-
-                # Check that all user variables are in the dataset_config
-                if not all(v in list(ds.data_vars) for v in group_vars):
-                    self.logger.abort('For collection \'' + dataset_config['name']
-                                      + '\', group \'' + group_name + '\' in file ' + filename +
-                                      f' . Variables {group_vars} not all present in ' +
-                                      f'the data set variables: {list(ds.keys())}')
-
-                # Drop data variables not in user requested variables
-                vars_to_remove = list(set(list(ds.keys())) - set(group_vars))
-                ds = ds.drop_vars(vars_to_remove)
-
-                # Explicitly add the channels to the collection (we do not want to include this
-                # in the 'variables' list in the YAML to avoid transforms being applied to them)
-                if 'nchans' in ds.dims:
-                    channels_used = ds['nchans']
-                    ds[group_name + '::channelNumber'] = channels_used
-
-                # Rename variables with group
-                rename_dict = {}
-                for group_var in group_vars:
-                    rename_dict[group_var] = group_name + '::' + group_var
-                ds = ds.rename(rename_dict)
-
-                # Assert that the collection contains at least one variable
-                if not ds.keys():
-                    self.logger.abort('Collection \'' + dataset_config['name'] + '\', group \'' +
-                                      group_name + '\' in file ' + filename +
-                                      ' does not have any variables.')
-
-            # Add the dataset_config to the collections
+        # Set the collection name
+        collection_name = dataset_config['name']
+
+        # Read the files in parallel
+        # --------------------------
+        def read_file(filename):
+            return self.read_file(collection_name, filename, groups, channels, variable)
+
+        max_workers = max(min(len(filenames), os.cpu_count() or 1, 8), 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            file_datasets = list(executor.map(read_file, filenames))
+
+        # Add the datasets to the collections in the order of the files
+        for ds in file_datasets:
             data_collections.create_or_add_to_collection(collection_name, ds, 'nobs')
 
         # Nan out unphysical values
@@ -299,6 +252,99 @@ class GsiObsSpace(EvaDatasetBase):
 
     # ----------------------------------------------------------------------------------------------
 
+    def read_file(self, collection_name, filename, groups, channels, variable):
+
+        """
+        Read the requested variables of all groups from a GSI diag file.
+
+        The file is opened once and only the variables requested by the groups (and the channel
+        numbers of satellite diags) are decoded.
+
+        Args:
+            collection_name (str): Name of the collection.
+            filename (str): The GSI diag file.
+            groups (list): Configuration of the groups to read.
+            channels (list): Channels to keep for satellite diags (all if empty).
+            variable (str): The variable of a conventional diag (None for satellite diags).
+
+        Returns:
+            Dataset: The variables of all groups named group::variable.
+        """
+
+        ds_file = open_dataset(filename, mask_and_scale=False, decode_times=False)
+        file_vars = list(ds_file.data_vars)
+
+        # Variables requested by each group
+        group_vars_list = []
+        for group in groups:
+
+            # Group name and variables
+            group_name = get(group, self.logger, 'name')
+            group_vars = get(group, self.logger, 'variables', 'all')
+
+            # If user specifies all variables set to group list
+            if group_vars == 'all':
+                group_vars = list(file_vars)
+
+            # Adjust variable names if uv
+            if variable == 'uv':
+                group_vars = uv(group_vars)
+
+            group_vars_list.append((group_name, group_vars))
+
+        # Only decode the requested variables
+        satellite_diag = 'nchans' in ds_file.dims
+        read_vars = [var for var in file_vars if
+                     any(var in group_vars for _, group_vars in group_vars_list) or
+                     (satellite_diag and var == 'sensor_chan')]
+        ds_read = ds_file[read_vars].load()
+        ds_file.close()
+        ds_file = ds_read
+
+        # Reshape variables if satellite diag
+        if satellite_diag:
+            ds_file = satellite_dataset(ds_file)
+            ds_file = subset_channels(ds_file, channels, self.logger)
+
+        ds_groups = Dataset(attrs=ds_file.attrs)
+        for group_name, group_vars in group_vars_list:
+
+            # Check that all user variables are in the dataset_config
+            if not all(v in list(ds_file.data_vars) for v in group_vars):
+                self.logger.abort('For collection \'' + collection_name
+                                  + '\', group \'' + group_name + '\' in file ' + filename +
+                                  f' . Variables {group_vars} not all present in ' +
+                                  f'the data set variables: {file_vars}')
+
+            # Drop data variables not in user requested variables
+            vars_to_remove = list(set(list(ds_file.keys())) - set(group_vars))
+            ds = ds_file.drop_vars(vars_to_remove)
+
+            # Explicitly add the channels to the collection (we do not want to include this
+            # in the 'variables' list in the YAML to avoid transforms being applied to them)
+            if 'nchans' in ds.dims:
+                channels_used = ds['nchans']
+                ds[group_name + '::channelNumber'] = channels_used
+
+            # Rename variables with group
+            rename_dict = {}
+            for group_var in group_vars:
+                rename_dict[group_var] = group_name + '::' + group_var
+            ds = ds.rename(rename_dict)
+
+            # Assert that the collection contains at least one variable
+            if not ds.keys():
+                self.logger.abort('Collection \'' + collection_name + '\', group \'' +
+                                  group_name + '\' in file ' + filename +
+                                  ' does not have any variables.')
+
+            # Merge with other groups
+            ds_groups = ds_groups.merge(ds)
+
+        return ds_groups
+
+    # ----------------------------------------------------------------------------------------------
+
     def generate_default_config(self, filenames, collection_name):
 
         """
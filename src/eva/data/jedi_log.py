@@ -10,8 +10,11 @@
 # --------------------------------------------------------------------------------------------------
 
 
+from concurrent.futures import ProcessPoolExecutor
+import glob
 import os
 import numpy as np
+import re
 import xarray as xr
 
 from eva.data.eva_dataset_base import EvaDatasetBase
@@ -23,6 +26,40 @@ from eva.data.eva_dataset_base import EvaDatasetBase
 # Parameters
 space = ' '
 
+# Convergence variables: name, search term, separator, position, data type and whether the
+# variable comes from the minimizer iterations or the quadratic cost function
+convergence_variables = [
+    ('inner_iteration', '{minimizer} Starting Iteration', 'Iteration', 1, 'int32', 'minimizer'),
+    ('gradient_reduction', 'Gradient reduction (', '=', 1, 'float32', 'minimizer'),
+    ('residual_norm', 'Residual norm (', '=', 1, 'float32', 'minimizer'),
+    ('norm_reduction', 'Norm reduction (', '=', 1, 'float32', 'minimizer'),
+    ('j', 'Quadratic cost function: J ', '=', 1, 'float32', 'j'),
+    ('jb', 'Quadratic cost function: Jb', '=', 1, 'float32', 'j'),
+    ('jojc', 'Quadratic cost function: JoJc', '=', 1, 'float32', 'j'),
+]
+
+# Terms that make a chunk a quadratic cost function chunk
+j_chunk_terms = ['Quadratic cost function: J ', 'Quadratic cost function: Jb']
+
+# Every line that has something to parse contains one of these terms
+search_terms_any = ['Minimizer algorithm', 'Starting Iteration', 'end of iteration',
+                    'Gradient reduction (', 'Residual norm (', 'Norm reduction (',
+                    'Quadratic cost function', 'OOPS_STATS']
+
+# The newline before a line that is empty or only spaces
+empty_line = re.compile(r'\n(?=[^\S\n]*\n)')
+
+# Timing and memory statistics, e.g.
+# OOPS_STATS DRIPCG iteration 1    - Runtime:     6.93 sec,  Local Memory:   452.73 Mb
+# OOPS_STATS Run end               - Runtime:    16.62 sec,  Memory: total:     3.15 Gb, per task:
+#                                    min =   512.48 Mb, max =   545.75 Mb
+oops_stats_line = re.compile(r'OOPS_STATS (?P<stage>.+?)\s+- Runtime:\s*(?P<runtime>[\d.]+) sec,'
+                             r'\s*(?:Local Memory:\s*(?P<memory>[\d.]+) (?P<unit>[KMGT]b)|'
+                             r'.*max =\s*(?P<max_memory>[\d.]+) (?P<max_unit>[KMGT]b))')
+
+# Conversion of memory units to Mb
+memory_units = {'Kb': 1.0/1024.0, 'Mb': 1.0, 'Gb': 1024.0, 'Tb': 1024.0*1024.0}
+
 
 # --------------------------------------------------------------------------------------------------
 
@@ -50,226 +87,446 @@ def get_data_from_line(jedi_log_line, search_term, separator, position):
 # --------------------------------------------------------------------------------------------------
 
 
-class JediLog(EvaDatasetBase):
+class JediLogParser:
 
     """
-    A class for handling Jedi log data.
+    Single pass parser of the convergence and timing information in a Jedi log.
+
+    The log is made of chunks separated by empty lines. A chunk belongs to a minimizer iteration if
+    it contains both the start and the end of an iteration and to the quadratic cost function if it
+    contains both J and Jb. For each chunk only the first value of each convergence variable is
+    kept, so memory use depends on the number of iterations and not on the size of the log.
+
+    The log is read in blocks of lines. Within a block only the lines that contain a search term
+    and the empty lines are looked at, so most of a large log is never split into lines.
     """
 
-    def execute(self, dataset_config, data_collections, timing):
+    def __init__(self, block_size=1 << 16):
 
         """
-        Executes the processing of Jedi log data.
+        Initialize the parser.
 
         Args:
-            dataset_config (dict): Configuration dictionary for the dataset.
-            data_collections (DataCollections): Object for managing data collections.
-            timing (Timing): Timing object for tracking execution time.
+            block_size (int): Approximate number of characters read from the log at a time.
         """
 
-        # Get name of the log file to parse
-        jedi_log_to_parse = dataset_config.get('jedi_log_to_parse')
+        self.block_size = block_size
 
-        # Collection name to use
-        collection_name = dataset_config.get('collection_name')
+        self.minimizer_algorithm = None
+        self.minimizer_terms = None
+        self.search_terms = None
+        self.test_string = ''
+        self.ended_with_newline = True
+
+        self.parsed = {}
+        self.parsed['minimizer'] = {var[0]: [] for var in convergence_variables}
+        self.parsed['j'] = {var[0]: [] for var in convergence_variables}
+        self.parsed['minimizer_chunks'] = 0
+        self.parsed['j_chunks'] = 0
+        self.parsed['stage'] = []
+        self.parsed['runtime'] = []
+        self.parsed['memory'] = []
+
+        # State of the current chunk
+        self.chunk_values = {}
+        self.chunk_terms = set()
+
+    # ----------------------------------------------------------------------------------------------
+
+    def parse(self, jedi_log_to_parse):
+
+        """
+        Parse a Jedi log.
+
+        Args:
+            jedi_log_to_parse (str): Path to the Jedi log.
+
+        Returns:
+            dict: The log, the minimizer algorithm, the convergence values found in the minimizer
+                  and quadratic cost function chunks, the number of chunks of each kind and the
+                  stage, runtime (sec) and memory (Mb) of the timing statistics.
+        """
 
-        # Read log file into a string
         with open(jedi_log_to_parse) as jedi_log_to_parse_open:
-            jedi_log_text = jedi_log_to_parse_open.read()
+            while True:
+                block = jedi_log_to_parse_open.read(self.block_size)
+                if not block:
+                    break
+                block = block + jedi_log_to_parse_open.readline()
+                self.parse_block(block)
 
-        # Split log into list of lines
-        jedi_log_lines = jedi_log_text.split('\n')
+        # As when splitting the whole log on newlines, a final newline is followed by an empty line
+        # that ends the last chunk. A last line without a newline leaves its chunk incomplete.
+        if self.ended_with_newline:
+            self.end_chunk()
 
-        # Check if this was a ctest and if so determine test prepend string
-        test_string = ''
-        for jedi_log_line in jedi_log_lines:
-            if jedi_log_line[0:4] == 'test':
-                test_string = jedi_log_line.split(' ')[1] + ': '
-
-        # Clean up lines
-        self.jedi_log_lines = []
-        for jedi_log_line in jedi_log_lines:
-            # Replace test number
-            new_line = jedi_log_line.replace(test_string, '')
-            # If new line is just spaces then set to empty string
-            if new_line.isspace():
-                new_line = ''
-            # Assemble new list of strings
-            self.jedi_log_lines.append(new_line)
-
-        # Split log into list of strings. Each element is all lines between two empty lines in the
-        # in the log file.
-        chunk_start_points = [-1]
-        for jedi_log_line_ind, jedi_log_line in enumerate(self.jedi_log_lines):
-            if jedi_log_line == '':
-                chunk_start_points.append(jedi_log_line_ind)
-        chunk_start_points.append(len(self.jedi_log_lines)+1)
-
-        self.log_chunks = []
-        for i in range(len(chunk_start_points)-2):
-            chunk = self.jedi_log_lines[chunk_start_points[i]+1:chunk_start_points[i+1]]
-            self.log_chunks.append('\n'.join(chunk))
+        self.parsed['minimizer_algorithm'] = self.minimizer_algorithm
+        self.parsed['jedi_log'] = jedi_log_to_parse
 
-        # Get list of things to parse from the dictionary
-        data_to_parse = dataset_config.get('data_to_parse')
+        return self.parsed
 
-        # Loop and add to dataset
-        for metric in data_to_parse:
-            if metric == 'convergence' and data_to_parse[metric]:
-                convergence_ds = self.parse_convergence()
-                # Add to the Eva dataset
-                data_collections.create_or_add_to_collection(collection_name, convergence_ds)
+    # ----------------------------------------------------------------------------------------------
+
+    def parse_block(self, block):
+
+        """
+        Parse a block of whole lines of the log.
+
+        Args:
+            block (str): The lines. Only the last block of the log may not end with a newline.
+        """
+
+        self.ended_with_newline = block.endswith('\n')
+
+        # End of the lines that end with a newline
+        lines_end = block.rfind('\n') + 1
+
+        # Lines that change the test string are parsed on their own
+        position = 0
+        while True:
+            if block.startswith('test', position, lines_end):
+                test_line = position
+            else:
+                test_line = block.find('\ntest', position, lines_end)
+                test_line = lines_end if test_line < 0 else test_line + 1
+            self.parse_lines(block[position:test_line])
+            if test_line == lines_end:
+                break
+            line_end = block.find('\n', test_line)
+            self.parse_raw_line(block[test_line:line_end])
+            position = line_end + 1
+
+        # The last line of the log when it does not end with a newline
+        if lines_end < len(block):
+            self.parse_raw_line(block[lines_end:])
 
     # ----------------------------------------------------------------------------------------------
 
-    def get_from_log(self, search_term, separator, position, custom_log=None):
+    def parse_lines(self, lines):
 
         """
-        Searches the Jedi log for a specified term and extracts the corresponding data.
+        Parse lines of the log that end with a newline and do not change the test string.
+
+        Only the lines that contain a search term and the empty lines are looked at.
 
         Args:
-            search_term (str): Search term to look for in the Jedi log.
-            separator (str): Separator used to split the log line.
-            position (int): Position of the desired data after splitting.
-            custom_log: Custom log to search in (optional).
+            lines (str): The lines.
+        """
+
+        if not lines:
+            return
+
+        # Replace test number. A newline is put in front so that every line follows a newline.
+        if self.test_string:
+            lines = lines.replace(self.test_string, '')
+        lines = '\n' + lines
+
+        # Start of the lines that contain a search term
+        line_starts = set()
+        for term in search_terms_any:
+            position = lines.find(term)
+            while position >= 0:
+                line_starts.add(lines.rfind('\n', 0, position) + 1)
+                position = lines.find(term, lines.find('\n', position))
+
+        # Empty lines only matter if they end a chunk that has something in it
+        if not line_starts:
+            if (self.chunk_values or self.chunk_terms) and empty_line.search(lines):
+                self.end_chunk()
+            return
+
+        # Parse the lines with search terms and the empty lines in the order they are in the log
+        line_events = [(line_start, False) for line_start in line_starts]
+        line_events += [(match.end(), True) for match in empty_line.finditer(lines)]
+        for line_start, is_empty in sorted(line_events):
+            if is_empty:
+                self.end_chunk()
+            else:
+                self.parse_line(lines[line_start:lines.find('\n', line_start)])
+
+    # ----------------------------------------------------------------------------------------------
+
+    def parse_raw_line(self, jedi_log_line):
 
-        Returns:
-            str: Extracted data value or None if not found.
         """
+        Parse a line of the log that may change the test string.
 
-        if custom_log is None:
-            log = self.jedi_log_lines
-        else:
-            log = custom_log
+        Args:
+            jedi_log_line (str): The line without its newline.
+        """
+
+        # Check if this was a ctest and if so determine test prepend string
+        if jedi_log_line[0:4] == 'test':
+            self.test_string = jedi_log_line.split(' ')[1] + ': '
 
-        # Loop over elements of string
-        for jedi_log_line in log:
-            data_val = get_data_from_line(jedi_log_line, search_term, separator, position)
-            if data_val is not None:
-                return data_val
-        return None
+        # Replace test number
+        if self.test_string:
+            jedi_log_line = jedi_log_line.replace(self.test_string, '')
+
+        if jedi_log_line == '' or jedi_log_line.isspace() or \
+           any(term in jedi_log_line for term in search_terms_any):
+            self.parse_line(jedi_log_line)
 
     # ----------------------------------------------------------------------------------------------
 
-    def get_matching_chunks(self, search_terms):
+    def parse_line(self, jedi_log_line):
 
         """
-        Finds log chunks that match a list of search terms.
+        Parse an empty line or a line containing a search term (with any test prepend string
+        removed).
 
         Args:
-            search_terms (list): List of search terms to match in log chunks.
+            jedi_log_line (str): The line.
+        """
 
-        Returns:
-            list: List of matching log chunks.
+        # Empty lines (or lines of spaces) separate the chunks
+        if jedi_log_line == '' or jedi_log_line.isspace():
+            self.end_chunk()
+            return
+
+        # Get the name of the minimizer
+        if self.minimizer_algorithm is None and 'Minimizer algorithm' in jedi_log_line:
+            self.minimizer_algorithm = jedi_log_line.split('=')[1]
+            self.minimizer_terms = [f'{self.minimizer_algorithm} Starting Iteration',
+                                    f'{self.minimizer_algorithm} end of iteration']
+            self.search_terms = [(var[0], var[1].format(minimizer=self.minimizer_algorithm),
+                                  var[2], var[3]) for var in convergence_variables]
+
+        # Terms that identify the kind of chunk
+        for term in (self.minimizer_terms or []) + j_chunk_terms:
+            if term in jedi_log_line:
+                self.chunk_terms.add(term)
+
+        # First value of each variable in the chunk
+        for var_name, search_term, separator, position in self.search_terms or []:
+            if search_term in jedi_log_line and var_name not in self.chunk_values:
+                var_found = get_data_from_line(jedi_log_line, search_term, separator, position)
+                if var_found:
+                    self.chunk_values[var_name] = var_found
+
+        # Timing and memory
+        if 'OOPS_STATS' in jedi_log_line:
+            match = oops_stats_line.search(jedi_log_line)
+            if match:
+                if match['memory'] is not None:
+                    memory = float(match['memory']) * memory_units[match['unit']]
+                else:
+                    memory = float(match['max_memory']) * memory_units[match['max_unit']]
+                self.parsed['stage'].append(match['stage'])
+                self.parsed['runtime'].append(float(match['runtime']))
+                self.parsed['memory'].append(memory)
+
+    # ----------------------------------------------------------------------------------------------
+
+    def end_chunk(self):
+
+        """
+        Keep the values of the chunk that has ended if it is a minimizer or cost function chunk.
+        """
+
+        is_chunk_type = {}
+        is_chunk_type['minimizer'] = self.minimizer_terms is not None and \
+            all(term in self.chunk_terms for term in self.minimizer_terms)
+        is_chunk_type['j'] = all(term in self.chunk_terms for term in j_chunk_terms)
+
+        for chunk_type in ['minimizer', 'j']:
+            if is_chunk_type[chunk_type]:
+                self.parsed[chunk_type + '_chunks'] += 1
+                for var_name, value in self.chunk_values.items():
+                    self.parsed[chunk_type][var_name].append(value)
+
+        self.chunk_values.clear()
+        self.chunk_terms.clear()
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def parse_jedi_log(jedi_log_to_parse):
+
+    """
+    Parse a Jedi log. This is a function so that logs can be parsed in other processes.
+
+    Args:
+        jedi_log_to_parse (str): Path to the Jedi log.
+
+    Returns:
+        dict: The parsed log as returned by JediLogParser.parse.
+    """
+
+    return JediLogParser().parse(jedi_log_to_parse)
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def expand_jedi_logs(jedi_log_to_parse):
+
+    """
+    Expand the Jedi logs to parse into a list of files.
+
+    Args:
+        jedi_log_to_parse (str or list): A log, a glob or a list of logs and globs.
+
+    Returns:
+        list: The logs. Globs are expanded in sorted order.
+    """
+
+    if not isinstance(jedi_log_to_parse, list):
+        jedi_log_to_parse = [jedi_log_to_parse]
+
+    jedi_logs = []
+    for jedi_log in jedi_log_to_parse:
+        if glob.has_magic(jedi_log):
+            jedi_logs.extend(sorted(glob.glob(jedi_log)))
+        else:
+            jedi_logs.append(jedi_log)
+
+    return jedi_logs
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def stack_runs(run_datasets):
+
+    """
+    Stack the datasets of several runs along a new Run dimension.
+
+    The runs can have different numbers of iterations and statistics. Each variable is padded to
+    the longest run with NaN (or empty strings), so integer variables become float32.
+
+    Args:
+        run_datasets (list): The dataset of each run.
+
+    Returns:
+        xr.Dataset: Dataset with the variables of all runs along the Run dimension.
+    """
+
+    var_names = []
+    dim_sizes = {}
+    for run_ds in run_datasets:
+        var_names += [var for var in run_ds.data_vars if var not in var_names]
+        for dim, size in run_ds.sizes.items():
+            dim_sizes[dim] = max(dim_sizes.get(dim, 0), size)
+
+    stacked_ds = xr.Dataset()
+    for var in var_names:
+        run_arrays = [run_ds[var] for run_ds in run_datasets if var in run_ds]
+
+        # Data type and fill value
+        dtype = np.result_type(*[run_array.dtype for run_array in run_arrays])
+        if dtype.kind in 'biu':
+            dtype = np.dtype('float32')
+        fill_value = '' if dtype.kind == 'U' else np.nan
+
+        # Shape that holds the variable of every run
+        dims = list(run_arrays[0].dims)
+        shape = tuple(dim_sizes[dim] for dim in dims)
+        stacked = np.full((len(run_datasets),) + shape, fill_value, dtype=dtype)
+        for run_ind, run_ds in enumerate(run_datasets):
+            if var in run_ds:
+                run_data = run_ds[var].data
+                stacked[(run_ind,) + tuple(slice(0, n) for n in run_data.shape)] = run_data
+
+        stacked_ds[var] = xr.DataArray(stacked, dims=['Run'] + dims)
+
+    return stacked_ds
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+class JediLog(EvaDatasetBase):
+
+    """
+    A class for handling Jedi log data.
+    """
+
+    def execute(self, dataset_config, data_collections, timing):
+
+        """
+        Executes the processing of Jedi log data.
+
+        Args:
+            dataset_config (dict): Configuration dictionary for the dataset.
+            data_collections (DataCollections): Object for managing data collections.
+            timing (Timing): Timing object for tracking execution time.
         """
 
-        # Create array to hold chunks that match
-        matching_chunks = []
+        # Get name of the log file to parse. This can also be a glob or a list of logs (or globs)
+        # that are stacked along a Run dimension.
+        jedi_log_to_parse = dataset_config.get('jedi_log_to_parse')
+        multiple_runs = isinstance(jedi_log_to_parse, list) or glob.has_magic(jedi_log_to_parse)
+        jedi_logs = expand_jedi_logs(jedi_log_to_parse)
+        if not jedi_logs:
+            self.logger.abort(f'No Jedi logs were found matching {jedi_log_to_parse}')
 
-        # Loop over elements of string
-        for log_chunk in self.log_chunks:
+        # Collection name to use
+        collection_name = dataset_config.get('collection_name')
 
-            # Build an array to check each match
-            search_terms_match = []
-            for search_term in search_terms:
-                search_terms_match.append(search_term in log_chunk)
+        # Get list of things to parse from the dictionary
+        data_to_parse = dataset_config.get('data_to_parse')
 
-            # Append if all search terms are in the chunk
-            if all(search_terms_match):
-                matching_chunks.append(log_chunk)
+        # Parse each log in a single pass, several logs are parsed in parallel
+        timing.start('JediLog: parse')
+        if len(jedi_logs) == 1:
+            parsed_logs = [parse_jedi_log(jedi_logs[0])]
+        else:
+            max_workers = max(min(len(jedi_logs), os.cpu_count() or 1), 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                parsed_logs = list(executor.map(parse_jedi_log, jedi_logs))
+        timing.stop('JediLog: parse')
 
-        return matching_chunks
+        # Loop and add to dataset
+        run_datasets = []
+        for parsed in parsed_logs:
+            jedi_log_ds = xr.Dataset()
+            for metric in data_to_parse:
+                if metric == 'convergence' and data_to_parse[metric]:
+                    jedi_log_ds = jedi_log_ds.merge(self.parse_convergence(parsed))
+                if metric == 'timing' and data_to_parse[metric]:
+                    jedi_log_ds = jedi_log_ds.merge(self.parse_timing(parsed))
+            run_datasets.append(jedi_log_ds)
+
+        if multiple_runs:
+            jedi_log_ds = stack_runs(run_datasets)
+            if jedi_log_ds.data_vars:
+                jedi_log_ds['run::jedi_log'] = xr.DataArray(np.array(jedi_logs), dims=['Run'])
+
+        # Add to the Eva dataset
+        if jedi_log_ds.data_vars:
+            data_collections.create_or_add_to_collection(collection_name, jedi_log_ds)
 
     # ----------------------------------------------------------------------------------------------
 
-    def parse_convergence(self):
+    def parse_convergence(self, parsed):
 
         """
         Parses convergence data from the Jedi log.
 
+        Args:
+            parsed (dict): The parsed Jedi log as returned by JediLogParser.parse.
+
         Returns:
             xr.Dataset: Dataset containing the parsed convergence data.
         """
 
-        # Get the name of the minimizer
-        minimizer_algorithm = self.get_from_log('Minimizer algorithm', '=', 1)
-
-        # Get the chunks for the minimizer part (Norm reduction etc)
-        minimizer_chunks_strings = [f'{minimizer_algorithm} Starting Iteration',
-                                    f'{minimizer_algorithm} end of iteration']
-        minimizer_chunks = self.get_matching_chunks(minimizer_chunks_strings)
-
-        # Get the chunks for the J, Jb, JoJc part
-        j_chunks_strings = [f'Quadratic cost function: J ',
-                            f'Quadratic cost function: Jb']
-        j_chunks = self.get_matching_chunks(j_chunks_strings)
-
         # Total number of inner iterations
-        total_iter = len(minimizer_chunks)
+        total_iter = parsed['minimizer_chunks']
 
         # Check that some minimizer chunks were found
         if total_iter == 0:
-            self.logger.abort('The number of iterations found in the log is zero. Check the ' +
-                              'parsing of the log is correct.')
+            self.logger.abort(f'The number of iterations found in the log {parsed["jedi_log"]} ' +
+                              'is zero. Check the parsing of the log is correct.')
 
         # Create list of variables that need to be built
         var_names = []
-        var_search_criteria = []
-        var_split = []
-        var_position = []
         var_dtype = []
-        if minimizer_chunks:
-
-            # Inner iteration number
-            var_names.append('inner_iteration')
-            var_search_criteria.append(f'{minimizer_algorithm} Starting Iteration')
-            var_split.append('Iteration')
-            var_position.append(1)
-            var_dtype.append('int32')
-
-            # Gradient reduction
-            var_names.append('gradient_reduction')
-            var_search_criteria.append('Gradient reduction (')
-            var_split.append('=')
-            var_position.append(1)
-            var_dtype.append('float32')
-
-            # Residual norm
-            var_names.append('residual_norm')
-            var_search_criteria.append('Residual norm (')
-            var_split.append('=')
-            var_position.append(1)
-            var_dtype.append('float32')
-
-            # Norm reduction
-            var_names.append('norm_reduction')
-            var_search_criteria.append('Norm reduction (')
-            var_split.append('=')
-            var_position.append(1)
-            var_dtype.append('float32')
-
-        if j_chunks:
-
-            # Inner iteration number
-            var_names.append('j')
-            var_search_criteria.append('Quadratic cost function: J ')
-            var_split.append('=')
-            var_position.append(1)
-            var_dtype.append('float32')
-
-            # Gradient reduction
-            var_names.append('jb')
-            var_search_criteria.append('Quadratic cost function: Jb')
-            var_split.append('=')
-            var_position.append(1)
-            var_dtype.append('float32')
-
-            # Norm reduction
-            var_names.append('jojc')
-            var_search_criteria.append('Quadratic cost function: JoJc')
-            var_split.append('=')
-            var_position.append(1)
-            var_dtype.append('float32')
+        for var_name, _, _, _, dtype, chunk_type in convergence_variables:
+            if parsed[chunk_type + '_chunks'] > 0:
+                var_names.append(var_name)
+                var_dtype.append(dtype)
 
         # Create a dataset to hold the convergence data
         convergence_ds = xr.Dataset()
@@ -279,18 +536,11 @@ class JediLog(EvaDatasetBase):
         convergence_ds[gn] = xr.DataArray(np.zeros(total_iter, dtype='int32'))
         convergence_ds[gn].data[:] = range(1, total_iter+1)
 
-        # Concatenate chunks to simplify search algorithm
-        min_and_j_chunks = minimizer_chunks + j_chunks
-
         ds_vars = []
         for var_ind, var in enumerate(var_names):
-            var_array = []
-            for min_and_j_chunk in min_and_j_chunks:
-                min_and_j_chunk_split = min_and_j_chunk.split('\n')
-                var_found = self.get_from_log(var_search_criteria[var_ind], var_split[var_ind],
-                                              var_position[var_ind], min_and_j_chunk_split)
-                if var_found:
-                    var_array.append(var_found)
+
+            # Values in the minimizer chunks followed by those in the cost function chunks
+            var_array = parsed['minimizer'][var] + parsed['j'][var]
 
             # Add to the dataset if there is something to add
             if var_array:
@@ -307,18 +557,11 @@ class JediLog(EvaDatasetBase):
 
         # Outer iteration
         # ---------------
-        outer_iteration = 0
-        outer_iterations = []
         if 'convergence::inner_iteration' in convergence_ds:
             inner_iterations = convergence_ds['convergence::inner_iteration'].data[:]
 
-            # Set outer iteration number
-            for inner_iteration in inner_iterations:
-                if inner_iteration == 1:
-                    outer_iteration = outer_iteration + 1
-
-                # Append vector of outer iterations
-                outer_iterations.append(outer_iteration)
+            # Outer iteration number increases each time the inner iteration restarts at 1
+            outer_iterations = np.cumsum(inner_iterations == 1)
 
             gn = f'convergence::outer_iteration'
             convergence_ds[gn] = xr.DataArray(np.zeros(total_iter, dtype='int32'))
@@ -345,10 +588,47 @@ class JediLog(EvaDatasetBase):
                 convergence_ds[gn_nz] = xr.DataArray(np.zeros(total_iter, dtype=var_dtype[var_ind]))
                 convergence_ds[gn_nz].data[:] = var_array_nz
 
+        # Runtime and memory of each inner iteration
+        # ------------------------------------------
+        iteration_stage = f'{parsed["minimizer_algorithm"]} iteration '
+        iteration_stats = [ind for ind, stage in enumerate(parsed['stage'])
+                           if stage.startswith(iteration_stage)]
+        if len(iteration_stats) == total_iter:
+            for var in ['runtime', 'memory']:
+                gn = f'convergence::{var}'
+                convergence_ds[gn] = xr.DataArray(np.array(parsed[var], dtype='float32')
+                                                  [iteration_stats])
+
         return convergence_ds
 
     # ----------------------------------------------------------------------------------------------
 
+    def parse_timing(self, parsed):
+
+        """
+        Parses the timing and memory statistics (OOPS_STATS lines) from the Jedi log.
+
+        Args:
+            parsed (dict): The parsed Jedi log as returned by JediLogParser.parse.
+
+        Returns:
+            xr.Dataset: Dataset containing the stage, runtime (sec) and memory (Mb) of each
+                        statistic along the Stat dimension. The memory is the local memory, or the
+                        largest memory of a task for statistics that give totals.
+        """
+
+        timing_ds = xr.Dataset()
+        timing_ds['timing::stage'] = xr.DataArray(np.array(parsed['stage'], dtype=str),
+                                                  dims=['Stat'])
+        timing_ds['timing::runtime'] = xr.DataArray(np.array(parsed['runtime'], dtype='float32'),
+                                                    dims=['Stat'])
+        timing_ds['timing::memory'] = xr.DataArray(np.array(parsed['memory'], dtype='float32'),
+                                                   dims=['Stat'])
+
+        return timing_ds
+
+    # ----------------------------------------------------------------------------------------------
+
     def generate_default_config(self, filenames, collection_name):
 
         """
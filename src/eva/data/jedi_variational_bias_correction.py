@@ -10,6 +10,12 @@
 # --------------------------------------------------------------------------------------------------
 
 
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import os
+import re
+
+import netCDF4
 import numpy as np
 import xarray as xr
 
@@ -20,6 +26,159 @@ from eva.utilities.config import get
 # --------------------------------------------------------------------------------------------------
 
 
+# Groups of the bias file that are read
+bias_groups = [
+    'BiasCoefficients',
+    'BiasCoefficientErrors',
+]
+
+# ISO date in the name of a bias file
+bias_file_date = re.compile(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})')
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def expand_files(files):
+
+    """
+    Expand a file name, glob or list of file names and globs into a list of files.
+
+    Args:
+        files (str or list): File name or glob, or a list of them.
+
+    Returns:
+        list: The files, globs are expanded in sorted order.
+    """
+
+    expanded = []
+    for file in files if isinstance(files, list) else [files]:
+        if glob.has_magic(file):
+            expanded.extend(sorted(glob.glob(file)))
+        else:
+            expanded.append(file)
+
+    return expanded
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def read_varbc_cycle(bias_file, lapse_file):
+
+    """
+    Read the bias and lapse files of a single cycle, opening each file once.
+
+    Args:
+        bias_file (str): The VarBC (netCDF) bias file.
+        lapse_file (str): The t-lapse (text) file.
+
+    Returns:
+        xr.Dataset: The bias data with Channel as dimension.
+
+    Raises:
+        ValueError: If the Record dimension of the bias file is not 1.
+    """
+
+    with netCDF4.Dataset(bias_file, 'r') as nc:
+
+        # Root and groups are read through the same open file
+        bias_dataset = xr.open_dataset(xr.backends.NetCDF4DataStore(nc)).load()
+
+        # Get record dimension size
+        if len(bias_dataset['Record']) != 1:
+            raise ValueError(f'{bias_file}: This code currently only supports reading VarBC ' +
+                             'files where the Record diminsion is 1')
+
+        group_datasets = [bias_dataset]
+        for group in bias_groups:
+            dsg = xr.open_dataset(xr.backends.NetCDF4DataStore(nc.groups[group])).load()
+
+            # Rename variables with group
+            group_datasets.append(dsg.rename_vars({var: f'{group}::{var}'
+                                                   for var in dsg.data_vars}))
+
+    # Store the groups in bias_dataset
+    bias_dataset = xr.merge(group_datasets)
+
+    # Now add coordinate for channels dimension going from 0 to channel
+    bias_dataset = bias_dataset.assign_coords(
+        {'Channel': range(len(bias_dataset.Channel))}
+    )
+
+    # Squeeze the record dimension and remove record coordinate
+    bias_dataset = bias_dataset.squeeze('Record')
+    bias_dataset = bias_dataset.drop_vars('Record')
+
+    # Rename numberObservationsUsed to Bias::numberObservationsUsed
+    bias_dataset = bias_dataset.rename_vars(
+        {'numberObservationsUsed': 'Bias::numberObservationsUsed'}
+    )
+
+    # Remove attrributes from the dataset
+    bias_dataset.attrs = {}
+
+    # Read the third column of the t-lapse file (text)
+    lapse_data = np.loadtxt(lapse_file, usecols=2, ndmin=1, dtype=np.float64)
+
+    # Store lapse data in flat_dataset with channel as dimension/coordinate
+    bias_dataset['Bias::tlapse'] = xr.DataArray(lapse_data, dims=['Channel'])
+
+    return bias_dataset
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def stack_cycles(cycle_datasets):
+
+    """
+    Stack the datasets of several cycles along a new Cycle dimension.
+
+    The array of each variable is allocated once for all the cycles. Cycles that do not have a
+    variable are filled with NaN, so integer variables missing from some cycles become float32.
+
+    Args:
+        cycle_datasets (list): The dataset of each cycle.
+
+    Returns:
+        xr.Dataset: Dataset with the variables of all cycles along the Cycle dimension.
+
+    Raises:
+        ValueError: If a variable does not have the same shape in every cycle.
+    """
+
+    var_names = []
+    for cycle_ds in cycle_datasets:
+        var_names += [var for var in cycle_ds.data_vars if var not in var_names]
+
+    stacked_ds = xr.Dataset(coords={'Channel': cycle_datasets[0]['Channel'].values})
+    for var in var_names:
+        cycle_arrays = [cycle_ds[var] for cycle_ds in cycle_datasets if var in cycle_ds]
+        first = cycle_arrays[0]
+        if any(cycle_array.shape != first.shape for cycle_array in cycle_arrays):
+            raise ValueError(f'{var} does not have the same shape in all cycles')
+
+        dtype = np.result_type(*[cycle_array.dtype for cycle_array in cycle_arrays])
+        if len(cycle_arrays) < len(cycle_datasets):
+            dtype = np.dtype('float32') if dtype.kind in 'biu' else dtype
+            stacked = np.full((len(cycle_datasets),) + first.shape, np.nan, dtype=dtype)
+        else:
+            stacked = np.empty((len(cycle_datasets),) + first.shape, dtype=dtype)
+
+        for cycle_ind, cycle_ds in enumerate(cycle_datasets):
+            if var in cycle_ds:
+                stacked[cycle_ind] = cycle_ds[var].values
+
+        stacked_ds[var] = xr.DataArray(stacked, dims=['Cycle'] + list(first.dims),
+                                       attrs=first.attrs)
+
+    return stacked_ds
+
+
+# --------------------------------------------------------------------------------------------------
+
+
 class JediVariationalBiasCorrection(EvaDatasetBase):
 
     """
@@ -69,59 +228,50 @@ class JediVariationalBiasCorrection(EvaDatasetBase):
             self.logger.assert_abort(key in dataset_config, "For JediVariationalBiasCorrection " +
                                      f"the config must contain key: {key}")
 
-        # Parse config
+        # Parse config. The bias and lapse files can also be globs or lists of files (or globs)
+        # in which case the cycles are stacked along a Cycle dimension.
         collection_name = dataset_config['name']
         bias_file = get(dataset_config, self.logger, 'bias_file')
         lapse_file = get(dataset_config, self.logger, 'lapse_file')
 
-        groups = [
-            'BiasCoefficients',
-            'BiasCoefficientErrors',
-        ]
-
-        # Create a new dataset to store the bias data
-        bias_dataset = xr.open_dataset(bias_file)
-
-        # Get record dimension size
-        self.logger.assert_abort(len(bias_dataset['Record']) == 1, 'This code currently only  '
-                                 'supports reading VarBC files where the Record diminsion is 1')
-
-        # Loop over groups, open and store in bias_dataset
-        for group in groups:
-            dsg = xr.open_dataset(bias_file, group=group)
-
-            # Rename variables with group
-            dsg = dsg.rename_vars({var: f'{group}::{var}' for var in dsg.data_vars})
-
-            # Store the data in the bias_dataset
-            bias_dataset = xr.merge([bias_dataset, dsg])
-
-        # Now add coordinate for channels dimension going from 0 to channel
-        bias_dataset = bias_dataset.assign_coords(
-            {'Channel': range(len(bias_dataset.Channel))}
-        )
-
-        # Squeeze the record dimension and remove record coordinate
-        bias_dataset = bias_dataset.squeeze('Record')
-        bias_dataset = bias_dataset.drop_vars('Record')
-
-        # Rename numberObservationsUsed to Bias::numberObservationsUsed
-        bias_dataset = bias_dataset.rename_vars(
-            {'numberObservationsUsed': 'Bias::numberObservationsUsed'}
-        )
-
-        # Remove attrributes from the dataset
-        bias_dataset.attrs = {}
-
-        # Read the t-lapse file (text) into a dataset
-        with open(lapse_file, 'r') as f:
-            lapse_data = f.readlines()
-
-        # Store the third element of each line as numpy array
-        lapse_data = np.array([float(line.split()[2]) for line in lapse_data])
-
-        # Store lapse data in flat_dataset with channel as dimension/coordinate
-        bias_dataset['Bias::tlapse'] = xr.DataArray(lapse_data, dims=['Channel'])
+        multiple_cycles = isinstance(bias_file, list) or glob.has_magic(bias_file)
+        bias_files = expand_files(bias_file)
+        lapse_files = expand_files(lapse_file)
+        if not bias_files:
+            self.logger.abort(f'No bias files were found matching {bias_file}')
+        if len(bias_files) != len(lapse_files):
+            self.logger.abort(f'The {len(bias_files)} bias files and {len(lapse_files)} lapse ' +
+                              'files do not pair up. There must be one lapse file per bias file.')
+
+        # Read each cycle, several cycles are read in parallel
+        try:
+            if len(bias_files) == 1:
+                cycle_datasets = [read_varbc_cycle(bias_files[0], lapse_files[0])]
+            else:
+                max_workers = max(min(len(bias_files), os.cpu_count() or 1), 1)
+                chunksize = max(len(bias_files) // (4 * max_workers), 1)
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    cycle_datasets = list(executor.map(read_varbc_cycle, bias_files, lapse_files,
+                                                       chunksize=chunksize))
+
+            if multiple_cycles:
+                bias_dataset = stack_cycles(cycle_datasets)
+            else:
+                bias_dataset = cycle_datasets[0]
+        except ValueError as error:
+            self.logger.abort(str(error))
+
+        if multiple_cycles:
+            bias_dataset['MetaData::bias_file'] = xr.DataArray(np.array(bias_files),
+                                                               dims=['Cycle'])
+
+            # Dates of the cycles if they are in the names of the bias files. As for time series
+            # the dates have all the dimensions so they can be selected like the data.
+            dates = [bias_file_date.search(os.path.basename(f)) for f in bias_files]
+            if all(dates):
+                dates = np.array([date.group(1) for date in dates], dtype='datetime64[ns]')
+                dates = np.repeat(dates[:, np.newaxis], bias_dataset.sizes['Channel'], axis=1)
+                bias_dataset['MetaData::Dates'] = xr.DataArray(dates, dims=['Cycle', 'Channel'])
 
         # Add bias_dataset to data_collections
         data_collections.create_or_add_to_collection(collection_name, bias_dataset)
@@ -9,12 +9,12 @@
 
 # --------------------------------------------------------------------------------------------------
 
+from concurrent.futures import ThreadPoolExecutor
+import copy
 import os
 import numpy as np
-import array
 
-from xarray import Dataset, concat, merge, align
-from scipy.io import FortranFile
+from xarray import Dataset
 from datetime import datetime
 
 from eva.data.eva_dataset_base import EvaDatasetBase
@@ -24,6 +24,13 @@ from eva.utilities.utils import parse_channel_list, is_number
 # --------------------------------------------------------------------------------------------------
 
 
+# Contents of the control files that have been read, keyed by path and modification time
+control_file_cache = {}
+
+
+# --------------------------------------------------------------------------------------------------
+
+
 class MonDataSpace(EvaDatasetBase):
 
     """
@@ -110,59 +117,15 @@ class MonDataSpace(EvaDatasetBase):
         # ---------------------------
         threshold = float(get(dataset_config, self.logger, 'missing_value_threshold', 1.0e30))
 
-        ds_list = []
-        for filename in filenames:
-
-            lat = []
-            lon = []
-            if stn_data:
-
-                # Read station data file.  Note that the variable dimensions
-                # will NOT be the same for different station data files.
-                # y_range is set here because it's the number of obs which is not in the control
-                # file and is only known once the ieee file is read.
-                darr, cycle_tm, dims, lat, lon = self.read_stn_ieee(filename, coords, dims,
-                                                                    ndims_used, dims_arr, vars)
-                y_range = np.arange(1, dims['ydef']+1)
-
-            else:
-                # read data file
-                darr, cycle_tm = self.read_ieee(filename, coords, dims, ndims_used,
-                                                dims_arr, vars, gsistat=attribs['gsistat'])
-
-            # add cycle as a variable to data array
-            cyc_darr = self.var_to_np_array(dims, ndims_used, dims_arr, cycle_tm)
-
-            # create dataset from file contents
-            timestep_ds = None
-            timestep_ds = self.load_dset(vars, coords, darr, dims, ndims_used,
-                                         dims_arr, x_range, y_range, z_range, cyc_darr)
-
-            if attribs['sat']:
-                timestep_ds.attrs['satellite'] = attribs['sat']
-            if attribs['sensor']:
-                timestep_ds.attrs['sensor'] = attribs['sensor']
-
-            # Add lat and lon variables.  This is done separately because they are
-            # only single dimension arrays unlike the obs which are 2d (level, nobs).
-            if stn_data and len(lat):
-                timestep_ds['lat'] = (['Nobs'], (lat))
-            if stn_data and len(lon):
-                timestep_ds['lon'] = (['Nobs'], (lon))
-
-            # add cycle_tm dim for concat
-            timestep_ds['Time'] = cycle_tm.strftime("%Y%m%d%H")
-
-            # Add this dataset to the list of ds_list
-            ds_list.append(timestep_ds)
-
-        # Align all datasets.  This syncs the dimensions and variables
-        # of all datasets in ds_list using NaN for all missing data.
         if stn_data:
-            ds_list = align(*ds_list, join='outer', exclude=[])
+            # Read all the cycles and pad the stations of each to a common Nobs dimension
+            ds = self.load_stn_cycles(filenames, coords, dims, ndims_used, dims_arr, vars,
+                                      attribs, x_range)
 
-        # Concatenate datasets from ds_list into a single dataset
-        ds = concat(ds_list, dim='Time')
+        else:
+            # Read all the cycles into one array and build the dataset from it
+            ds = self.load_cycles(filenames, coords, dims, ndims_used, dims_arr, vars, attribs,
+                                  x_range, y_range, z_range)
 
         # Group name and variables
         # ------------------------
@@ -193,7 +156,7 @@ class MonDataSpace(EvaDatasetBase):
             # Assert that the collection contains at least one variable
             if not ds.keys():
                 self.logger.abort('Collection \'' + dataset_config['name'] + '\', group \'' +
-                                  group_name + '\' in file ' + filename +
+                                  group_name + '\' in file ' + filenames[-1] +
                                   ' does not have any variables.')
 
         # Add the dataset to the collections
@@ -336,6 +299,34 @@ class MonDataSpace(EvaDatasetBase):
             dict: Dictionary containing datatype information.
         """
 
+        control = self.read_control_file(control_file)
+        if 'ctl_dict' not in control:
+            control['ctl_dict'] = self.parse_ctl_lines(control['lines'])
+
+        # The parsed contents are shared by all datasets, return a copy that can be modified
+        return copy.deepcopy(control['ctl_dict'])
+
+    # ----------------------------------------------------------------------------------------------
+
+    def parse_ctl_lines(self, lines):
+
+        """
+        Parse the lines of a control file and extract information into dictionaries.
+
+        Args:
+            lines (list): Lines of the control file.
+
+        Returns:
+            dict: Dictionary containing various coordinates and information.
+            dict: Dictionary containing dimension sizes.
+            dict: Dictionary containing sensor and satellite attributes.
+            list: List of variable names.
+            list: List of scan positions.
+            dict: Dictionary containing channel information.
+            dict: Dictionary containing level information.
+            dict: Dictionary containing datatype information.
+        """
+
         coords = {'xdef': None, 'ydef': None, 'zdef': None}
         coord_list = []
         dims = {'xdef': 0, 'ydef': 0, 'zdef': 0}
@@ -367,162 +358,187 @@ class MonDataSpace(EvaDatasetBase):
                      'data type': 'DataType'
         }
 
-        with open(control_file, 'r') as fp:
-            lines = fp.readlines()
-            for line in lines:
+        for line in lines:
 
-                # Locate the coordinates using coord_dict.  There will be 1-3
-                # coordinates specified as XDEF, YDEF, and ZDEF.
+            # Locate the coordinates using coord_dict.  There will be 1-3
+            # coordinates specified as XDEF, YDEF, and ZDEF.
+            if 'DEF' in line:
                 for item in list(coord_dict.keys()):
-
-                    if 'DEF' in line and item in line:
+                    if item in line:
                         coord_list.append(coord_dict[item])
 
-                # In most cases xdef, ydef, and zdef specify the size of
-                # the coresponding coordinate.
-                #
-                # Scan is different. If xdef coresponds to Scan then the xdef line
-                # specifies the number of scan steps, starting position, and step size.
-                # The last 2 are floats.  Add all to scan_info for later use.
-                if line.find('xdef') != -1:
-                    strs = line.split()
-                    for st in strs:
-                        if st.isdigit():
-                            dim_list.append(int(st))
-                        if is_number(st):
-                            scan_info.append(st)
-
-                if line.find('ydef') != -1:
+            # In most cases xdef, ydef, and zdef specify the size of
+            # the coresponding coordinate.
+            #
+            # Scan is different. If xdef coresponds to Scan then the xdef line
+            # specifies the number of scan steps, starting position, and step size.
+            # The last 2 are floats.  Add all to scan_info for later use.
+            if line.find('xdef') != -1:
+                strs = line.split()
+                for st in strs:
+                    if st.isdigit():
+                        dim_list.append(int(st))
+                    if is_number(st):
+                        scan_info.append(st)
+
+            if line.find('ydef') != -1:
+                strs = line.split()
+                for st in strs:
+                    if st.isdigit():
+                        dim_list.append(int(st))
+
+            if line.find('zdef') != -1:
+                strs = line.split()
+                for st in strs:
+                    if st.isdigit():
+                        dim_list.append(int(st))
+
+            if line.find('vars') != -1:
+                strs = line.split()
+                for st in strs:
+                    if st.isdigit():
+                        nvars = int(st)
+
+            if line.find('title') != -1:
+                if line.find('conventional') == -1 and line.find('gsistat') == -1:
                     strs = line.split()
-                    for st in strs:
-                        if st.isdigit():
-                            dim_list.append(int(st))
+                    attribs['sensor'] = strs[1]
+                    attribs['sat'] = strs[2]
+
+            if line.find('datatype station') != -1 or line.find('DTYPE station') != -1:
+                attribs['datatype'] = 'station'
+
+            if line.find('gsistat') != -1:
+                attribs['gsistat'] = True
+
+            if line.find('subtype') != -1:
+                strs = line.split()
+                datatype.append(strs[self.type_con] + strs[self.datatype_con] + '_' +
+                                strs[self.subtype_con])
+                datatype_assim.append(strs[9])
+
+            # Note we need to extract the actual channel numbers.  We have the
+            # number of channels via the xdef line, but they are not necessarily
+            # ordered consecutively.
+            #
+            # If channel is used then assign channel numbers to the chan_assim and
+            # chan_nassim arrays based on the channel's iuse setting in the control
+            # file.  In the file 1 = assimilated, -1 = not assimilated.
+            if line.find('channel=') != -1:
+                strs = line.split()
+                if strs[4].isdigit():
+                    channo.append(int(strs[self.channel_num_rad]))
+                if strs[self.channel_iuse_rad] == '1':
+                    chan_assim.append(int(strs[self.channel_num_rad]))
+                if strs[self.channel_iuse_rad] == '-1':
+                    chan_nassim.append(int(strs[self.channel_num_rad]))
+
+            if line.find('level=') != -1:
+
+                strs = line.split()
+                tlev = strs[2].replace(',', '')
+                if tlev.isdigit():
+                    levs.append(int(tlev))
+
+                # Ozn data control files include the assim flag on the Level definition
+                # lines.  Con data control files use level but assim is included on the
+                # datatype line, not Level
+                #
+                if len(strs) >= self.level_iuse_ozn:
+                    if strs[self.level_iuse_ozn] == '1':
+                        level_assim.append(int(tlev))
+                    if strs[self.level_iuse_ozn] == '-1':
+                        level_nassim.append(int(tlev))
+
+        # The list of variables is at the end of the file between the lines
+        # "vars" and "end vars".
+        start = len(lines) - (nvars + 1)
+        for x in range(start, start + nvars):
+            strs = lines[x].split()
+            vars.append(strs[0])
+
+        # Ignore any coordinates in the control file that have a value of 1.
+        used = 0
+        mydef = ["xdef", "ydef", "zdef"]
+        for x in range(len(coord_list)):
+            coords[mydef[used]] = coord_list[x]
+            dims[mydef[used]] = dim_list[x]
+            used += 1
+
+        # If Scan is in the coords calculate the scan positions.
+        # scan_info[0] = num steps, [1] = start position, [2] = step size
+        if 'Scan' in coords.values():
+            scanpo = [(float(scan_info[1]))]
+            for x in range(1, int(scan_info[0])):
+                scanpo.append(float(scan_info[1])+(float(scan_info[2])*x))
+
+        # If Channel is in the coords then pad out the chan_assim adn chan_nassim
+        # arrays with zeros.  They need to be the correct length to use 'Channel' as
+        # the dimension.  Also the yaml file can use the 'select where' transform
+        # to drop all values < 1 and plot only the assim/nassim channel markers.
+        if 'Channel' in coords.values():
+            for x in range(len(chan_assim), len(channo)):
+                chan_assim.append(0)
+            for x in range(len(chan_nassim), len(channo)):
+                chan_nassim.append(0)
+            chans_dict = {'chan_nums': channo,
+                          'chans_assim': chan_assim,
+                          'chans_nassim': chan_nassim}
+
+        if 'Level' in coords.values():
+            levs_dict = {'levels': levs}
+
+            if len(level_assim) > 0 or len(level_nassim) > 0:
+                for x in range(len(level_assim), len(levs)):
+                    level_assim.append(0)
+                for x in range(len(level_nassim), len(levs)):
+                    level_nassim.append(0)
+                levs_dict['levels_assim'] = level_assim
+                levs_dict['levels_nassim'] = level_nassim
 
-                if line.find('zdef') != -1:
-                    strs = line.split()
-                    for st in strs:
-                        if st.isdigit():
-                            dim_list.append(int(st))
+        if 'DataType' in coords.values():
+            datatype_dict = {'datatype': datatype,
+                             'assim': datatype_assim}
 
-                if line.find('vars') != -1:
-                    strs = line.split()
-                    for st in strs:
-                        if st.isdigit():
-                            nvars = int(st)
+        return coords, dims, attribs, vars, scanpo, levs_dict, chans_dict, datatype_dict
 
-                if line.find('title') != -1:
-                    if line.find('conventional') == -1 and line.find('gsistat') == -1:
-                        strs = line.split()
-                        attribs['sensor'] = strs[1]
-                        attribs['sat'] = strs[2]
+    # ----------------------------------------------------------------------------------------------
 
-                if line.find('datatype station') != -1 or line.find('DTYPE station') != -1:
-                    attribs['datatype'] = 'station'
+    def get_stn_ctl_dict(self, control_file):
 
-                if line.find('gsistat') != -1:
-                    attribs['gsistat'] = True
+        """
+        Parse the station data control file and extract information into dictionaries.
 
-                if line.find('subtype') != -1:
-                    strs = line.split()
-                    datatype.append(strs[self.type_con] + strs[self.datatype_con] + '_' +
-                                    strs[self.subtype_con])
-                    datatype_assim.append(strs[9])
+        Args:
+            control_file (str): Path to the control file.
 
-                # Note we need to extract the actual channel numbers.  We have the
-                # number of channels via the xdef line, but they are not necessarily
-                # ordered consecutively.
-                #
-                # If channel is used then assign channel numbers to the chan_assim and
-                # chan_nassim arrays based on the channel's iuse setting in the control
-                # file.  In the file 1 = assimilated, -1 = not assimilated.
-                if line.find('channel=') != -1:
-                    strs = line.split()
-                    if strs[4].isdigit():
-                        channo.append(int(strs[self.channel_num_rad]))
-                    if strs[self.channel_iuse_rad] == '1':
-                        chan_assim.append(int(strs[self.channel_num_rad]))
-                    if strs[self.channel_iuse_rad] == '-1':
-                        chan_nassim.append(int(strs[self.channel_num_rad]))
+        Returns:
+            dict: Dictionary containing various coordinates and information.
+            dict: Dictionary containing dimension sizes.
+            dict: Dictionary containing sensor and satellite attributes.
+            list: List of variable names.
+            list: List of scan positions.
+            dict: Dictionary containing channel information.
+            dict: Dictionary containing level information.
+            dict: Dictionary containing datatype information.
+        """
 
-                if line.find('level=') != -1:
+        control = self.read_control_file(control_file)
+        if 'stn_ctl_dict' not in control:
+            control['stn_ctl_dict'] = self.parse_stn_ctl_lines(control['lines'])
 
-                    strs = line.split()
-                    tlev = strs[2].replace(',', '')
-                    if tlev.isdigit():
-                        levs.append(int(tlev))
-
-                    # Ozn data control files include the assim flag on the Level definition
-                    # lines.  Con data control files use level but assim is included on the
-                    # datatype line, not Level
-                    #
-                    if len(strs) >= self.level_iuse_ozn:
-                        if strs[self.level_iuse_ozn] == '1':
-                            level_assim.append(int(tlev))
-                        if strs[self.level_iuse_ozn] == '-1':
-                            level_nassim.append(int(tlev))
-
-            # The list of variables is at the end of the file between the lines
-            # "vars" and "end vars".
-            start = len(lines) - (nvars + 1)
-            for x in range(start, start + nvars):
-                strs = lines[x].split()
-                vars.append(strs[0])
-
-            # Ignore any coordinates in the control file that have a value of 1.
-            used = 0
-            mydef = ["xdef", "ydef", "zdef"]
-            for x in range(len(coord_list)):
-                coords[mydef[used]] = coord_list[x]
-                dims[mydef[used]] = dim_list[x]
-                used += 1
-
-            # If Scan is in the coords calculate the scan positions.
-            # scan_info[0] = num steps, [1] = start position, [2] = step size
-            if 'Scan' in coords.values():
-                scanpo = [(float(scan_info[1]))]
-                for x in range(1, int(scan_info[0])):
-                    scanpo.append(float(scan_info[1])+(float(scan_info[2])*x))
-
-            # If Channel is in the coords then pad out the chan_assim adn chan_nassim
-            # arrays with zeros.  They need to be the correct length to use 'Channel' as
-            # the dimension.  Also the yaml file can use the 'select where' transform
-            # to drop all values < 1 and plot only the assim/nassim channel markers.
-            if 'Channel' in coords.values():
-                for x in range(len(chan_assim), len(channo)):
-                    chan_assim.append(0)
-                for x in range(len(chan_nassim), len(channo)):
-                    chan_nassim.append(0)
-                chans_dict = {'chan_nums': channo,
-                              'chans_assim': chan_assim,
-                              'chans_nassim': chan_nassim}
-
-            if 'Level' in coords.values():
-                levs_dict = {'levels': levs}
-
-                if len(level_assim) > 0 or len(level_nassim) > 0:
-                    for x in range(len(level_assim), len(levs)):
-                        level_assim.append(0)
-                    for x in range(len(level_nassim), len(levs)):
-                        level_nassim.append(0)
-                    levs_dict['levels_assim'] = level_assim
-                    levs_dict['levels_nassim'] = level_nassim
-
-            if 'DataType' in coords.values():
-                datatype_dict = {'datatype': datatype,
-                                 'assim': datatype_assim}
-
-            fp.close()
-        return coords, dims, attribs, vars, scanpo, levs_dict, chans_dict, datatype_dict
+        # The parsed contents are shared by all datasets, return a copy that can be modified
+        return copy.deepcopy(control['stn_ctl_dict'])
 
     # ----------------------------------------------------------------------------------------------
 
-    def get_stn_ctl_dict(self, control_file):
+    def parse_stn_ctl_lines(self, lines):
 
         """
-        Parse the station data control file and extract information into dictionaries.
+        Parse the lines of a station data control file and extract information into dictionaries.
 
         Args:
-            control_file (str): Path to the control file.
+            lines (list): Lines of the control file.
 
         Returns:
             dict: Dictionary containing various coordinates and information.
@@ -561,75 +577,226 @@ class MonDataSpace(EvaDatasetBase):
                      'data type': 'DataType'
         }
 
-        with open(control_file, 'r') as fp:
-            lines = fp.readlines()
-            for line in lines:
+        for line in lines:
 
-                # Find level information
-                if line.find('level=') != -1:
-                    strs = line.split()
+            # Find level information
+            if line.find('level=') != -1:
+                strs = line.split()
 
-                    lev_vals.append({'lev_val': strs[4], 'iuse': strs[7], 'err_val': strs[10]})
-                    lev_str = strs[2].split(',')
-                    levs.append(int(lev_str[0]))
+                lev_vals.append({'lev_val': strs[4], 'iuse': strs[7], 'err_val': strs[10]})
+                lev_str = strs[2].split(',')
+                levs.append(int(lev_str[0]))
 
-                    if strs[7] == '1':
-                        level_assim.append(int(lev_str[0]))
-                    else:
-                        level_nassim.append(int(lev_str[0]))
+                if strs[7] == '1':
+                    level_assim.append(int(lev_str[0]))
+                else:
+                    level_nassim.append(int(lev_str[0]))
 
-                if line.find('vars') != -1:
-                    strs = line.split()
-                    for st in strs:
-                        if st.isdigit():
-                            nvars = int(st)
-
-                if line.find('title') != -1:
-                    if line.find('conventional') == -1 and line.find('gsistat') == -1:
-                        strs = line.split()
-                        attribs['sensor'] = strs[1]
-                        attribs['sat'] = strs[2]
-
-            # The list of variables is at the end of the file between the lines
-            # "vars" and "end vars".  Note that for ozn station control files the
-            # var is repeated for every level (e.g. obs1, obs2, obs3, etc).  These
-            # need to be combined into single entries in the vars list and nvars
-            # then set to the final size of the vars list.
-            start = len(lines) - (nvars + 1)
-            for x in range(start, start + nvars):
-                strs = lines[x].split()
-                if strs[-1] not in vars:
-                    vars.append(strs[-1])
-
-            # set levels
-            dim_list.append(len(lev_vals))
-            dim_list.append(0)
-
-            # Ignore any coordinates in the control file that have a value of 1.
-            used = 0
-            mydef = ["xdef", "ydef", "zdef"]
-
-            if 'Level' in coords.values():
-                for x in range(len(level_assim), len(levs)):
-                    level_assim.append(0)
-                for x in range(len(level_nassim), len(levs)):
-                    level_nassim.append(0)
-                levs_dict = {'levels': levs,
-                             'levels_assim': level_assim,
-                             'levels_nassim': level_nassim}
-                dims['xdef'] = len(levs)
+            if line.find('vars') != -1:
+                strs = line.split()
+                for st in strs:
+                    if st.isdigit():
+                        nvars = int(st)
 
-            if 'DataType' in coords.values():
-                datatype_dict = {'datatype': datatype,
-                                 'assim': datatype_assim}
+            if line.find('title') != -1:
+                if line.find('conventional') == -1 and line.find('gsistat') == -1:
+                    strs = line.split()
+                    attribs['sensor'] = strs[1]
+                    attribs['sat'] = strs[2]
+
+        # The list of variables is at the end of the file between the lines
+        # "vars" and "end vars".  Note that for ozn station control files the
+        # var is repeated for every level (e.g. obs1, obs2, obs3, etc).  These
+        # need to be combined into single entries in the vars list and nvars
+        # then set to the final size of the vars list.
+        start = len(lines) - (nvars + 1)
+        for x in range(start, start + nvars):
+            strs = lines[x].split()
+            if strs[-1] not in vars:
+                vars.append(strs[-1])
+
+        # set levels
+        dim_list.append(len(lev_vals))
+        dim_list.append(0)
+
+        # Ignore any coordinates in the control file that have a value of 1.
+        used = 0
+        mydef = ["xdef", "ydef", "zdef"]
+
+        if 'Level' in coords.values():
+            for x in range(len(level_assim), len(levs)):
+                level_assim.append(0)
+            for x in range(len(level_nassim), len(levs)):
+                level_nassim.append(0)
+            levs_dict = {'levels': levs,
+                         'levels_assim': level_assim,
+                         'levels_nassim': level_nassim}
+            dims['xdef'] = len(levs)
+
+        if 'DataType' in coords.values():
+            datatype_dict = {'datatype': datatype,
+                             'assim': datatype_assim}
 
-        fp.close()
         return coords, dims, attribs, vars, scanpo, levs_dict, chans_dict, datatype_dict
 
     # ----------------------------------------------------------------------------------------------
 
+    def load_cycles(self, filenames, coords, dims, ndims_used, dims_arr, vars, attribs,
+                    x_range, y_range, z_range):
+
+        """
+        Read the IEEE files of all cycles in parallel and create a single dataset from them.
+
+        Args:
+            filenames (list): Names of the IEEE files, one for each cycle.
+            coords (dict): Dictionary of coordinates.
+            dims (dict): Dictionary of dimension sizes.
+            ndims_used (int): Number of dimensions used.
+            dims_arr (list): List of dimension names used.
+            vars (list): List of variable names.
+            attribs (dict): Dictionary containing sensor and satellite attributes.
+            x_range (numpy.ndarray or None): Valid x coordinate range.
+            y_range (numpy.ndarray or None): Valid y coordinate range.
+            z_range (numpy.ndarray or None): Valid z coordinate range.
+
+        Returns:
+            xarray.Dataset: Dataset with the variables of all cycles along the Time dimension.
+        """
+
+        coord_names = [coords[dims_arr[x]] for x in range(ndims_used)]
+        coord_ranges = [x_range, y_range, z_range][0:ndims_used]
+        var_shape = tuple(dims[dims_arr[x]] for x in range(ndims_used))
+
+        # Each cycle is read straight into its slice of the array of all cycles
+        darr = np.zeros((len(filenames), len(vars)) + var_shape, dtype=np.float32)
+
+        def read_cycle(index):
+            _, cycle_tm = self.read_ieee(filenames[index], coords, dims, ndims_used, dims_arr,
+                                         vars, gsistat=attribs['gsistat'],
+                                         rtn_array=darr[index])
+            return cycle_tm
+
+        max_workers = max(min(len(filenames), os.cpu_count() or 1, 8), 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            cycle_tms = list(executor.map(read_cycle, range(len(filenames))))
+
+        for filename, cycle_tm in zip(filenames, cycle_tms):
+            if cycle_tm is None:
+                self.logger.abort(f'Unable to find the cycle time (YYYYMMDDHH) in the name of ' +
+                                  f'file {filename}.')
+
+        # Variables of all cycles
+        var_dims = ['Time'] + coord_names
+        data_vars = {}
+        for x in range(len(vars)):
+            data_vars[vars[x]] = (var_dims, darr[:, x])
+
+            # MinMon plots require both the 'allgnorm' data and log('allgnorm').
+            if ndims_used == 1 and vars[x] == 'allgnorm':
+                data_vars['log_gnorm'] = (var_dims, np.log(darr[:, x]))
+
+        # tack on 'cycle' as a variable
+        data_vars['cycle'] = (var_dims, self.var_to_np_array(dims, ndims_used, dims_arr,
+                                                             cycle_tms))
+
+        new_coords = dict(zip(coord_names, coord_ranges))
+        new_coords['Time'] = [cycle_tm.strftime("%Y%m%d%H") for cycle_tm in cycle_tms]
+
+        ds = Dataset(data_vars, coords=new_coords)
+
+        if attribs['sat']:
+            ds.attrs['satellite'] = attribs['sat']
+        if attribs['sensor']:
+            ds.attrs['sensor'] = attribs['sensor']
+
+        return ds
+
+    # ----------------------------------------------------------------------------------------------
+
+    def load_stn_cycles(self, filenames, coords, dims, ndims_used, dims_arr, vars, attribs,
+                        x_range):
+
+        """
+        Read the IEEE station files of all cycles in parallel and create a single dataset.
+
+        The number of stations differs between cycles. Stations are indexed by their position in
+        the file so the union of the stations of all cycles is the longest of them and cycles
+        with fewer stations are padded with missing values.
+
+        Args:
+            filenames (list): Names of the IEEE station files, one for each cycle.
+            coords (dict): Dictionary of coordinates.
+            dims (dict): Dictionary of dimension sizes.
+            ndims_used (int): Number of dimensions used.
+            dims_arr (list): List of dimension names used.
+            vars (list): List of variable names.
+            attribs (dict): Dictionary containing sensor and satellite attributes.
+            x_range (numpy.ndarray or None): Valid x coordinate range.
+
+        Returns:
+            xarray.Dataset: Dataset with the variables of all cycles along the Time dimension.
+        """
+
+        # Each read updates the number of obs in its own copy of the dimensions
+        def read_cycle(filename):
+            return self.read_stn_ieee(filename, coords, dict(dims), ndims_used, dims_arr, vars)
+
+        max_workers = max(min(len(filenames), os.cpu_count() or 1, 8), 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            cycles = list(executor.map(read_cycle, filenames))
+
+        for filename, (_, cycle_tm, _, _, _) in zip(filenames, cycles):
+            if cycle_tm is None:
+                self.logger.abort(f'Unable to find the cycle time (YYYYMMDDHH) in the name of ' +
+                                  f'file {filename}.')
+
+        # Union of the stations of all cycles
+        nlev = dims[dims_arr[0]]
+        nobs = max(cycle[2]['ydef'] for cycle in cycles)
+
+        darr = np.full((len(cycles), len(vars), nlev, nobs), np.nan, dtype=np.float32)
+        cyc_darr = np.full((len(cycles), nlev, nobs), np.datetime64('NaT'),
+                           dtype='datetime64[us]')
+        lat = np.full((len(cycles), nobs), np.nan, dtype=np.float32)
+        lon = np.full((len(cycles), nobs), np.nan, dtype=np.float32)
+
+        for t, (cycle_darr, cycle_tm, cycle_dims, cycle_lat, cycle_lon) in enumerate(cycles):
+            numobs = cycle_dims['ydef']
+            darr[t, :, :, 0:numobs] = cycle_darr
+            cyc_darr[t, :, 0:numobs] = np.datetime64(cycle_tm)
+            lat[t, 0:numobs] = cycle_lat
+            lon[t, 0:numobs] = cycle_lon
+
+        # Variables of all cycles
+        var_dims = ['Time', coords[dims_arr[0]], coords[dims_arr[1]]]
+        data_vars = {}
+        for x in range(len(vars)):
+            data_vars[vars[x]] = (var_dims, darr[:, x])
+        data_vars['cycle'] = (var_dims, cyc_darr)
+
+        # Add lat and lon variables.  These are only single dimension arrays for each cycle
+        # unlike the obs which are 2d (level, nobs).
+        data_vars['lat'] = (['Time', 'Nobs'], lat)
+        data_vars['lon'] = (['Time', 'Nobs'], lon)
+
+        new_coords = {}
+        new_coords[coords[dims_arr[0]]] = x_range
+        new_coords[coords[dims_arr[1]]] = np.arange(1, nobs+1)
+        new_coords['Time'] = [cycle[1].strftime("%Y%m%d%H") for cycle in cycles]
+
+        ds = Dataset(data_vars, coords=new_coords)
+
+        if attribs['sat']:
+            ds.attrs['satellite'] = attribs['sat']
+        if attribs['sensor']:
+            ds.attrs['sensor'] = attribs['sensor']
+
+        return ds
+
+    # ----------------------------------------------------------------------------------------------
+
     def read_ieee(self, file_name, coords, dims, ndims_used, dims_arr, vars,
-                  file_path=None, gsistat=False):
+                  file_path=None, gsistat=False, rtn_array=None):
 
         """
         Read data from an IEEE file and arrange it into a numpy array.
@@ -642,6 +809,9 @@ class MonDataSpace(EvaDatasetBase):
             dims_arr (list): List of dimension names used.
             vars (list): List of variable names.
             file_path (str, optional): Path to the directory containing the file. Defaults to None.
+            gsistat (bool, optional): Whether this is a gsistat file. Defaults to False.
+            rtn_array (numpy.ndarray, optional): Zero filled float32 array of shape (nvars, dims)
+                                                 to read into. Allocated if not provided.
 
         Returns:
             numpy.ndarray: Numpy array containing the read data.
@@ -659,78 +829,105 @@ class MonDataSpace(EvaDatasetBase):
 
         filename = os.path.join(file_path, file_name) if file_path else file_name
 
-        load_data = True
-        if os.path.isfile(filename):
-            f = FortranFile(filename, 'r', '>u4')
-        else:
-            self.logger.info(f"WARNING:  file {filename} is missing")
-            load_data = False
-
+        # Shape of each variable
         if ndims_used == 1:		# MinMon, regional RadMon time,bcoef,bcor
-            rtn_array = np.empty((0, dims[dims_arr[0]]), dtype=float)
-            if not load_data:
-                zarray = np.zeros((dims[dims_arr[0]]), float)
-            dimensions = [dims[dims_arr[0]]]
+            var_shape = (dims[dims_arr[0]],)
+        elif ndims_used == 2:		# RadMon time, bcoef, bcor, OznMon time
+            var_shape = (dims[dims_arr[0]], dims[dims_arr[1]])
+        else:		# RadMon angle, ConMon time/vert
+            var_shape = (dims[dims_arr[0]], dims[dims_arr[1]], dims[dims_arr[2]])
 
-        if ndims_used == 2:		# RadMon time, bcoef, bcor, OznMon time
-            rtn_array = np.empty((0, dims[dims_arr[0]], dims[dims_arr[1]]), float)
-            if not load_data:
-                zarray = np.zeros((dims[dims_arr[0]], dims[dims_arr[1]]), float)
-            dimensions = [dims[dims_arr[1]], dims[dims_arr[0]]]
+        if rtn_array is None:
+            rtn_array = np.zeros((len(vars),) + var_shape, dtype=np.float32)
 
-        if ndims_used == 3:		# RadMon angle, ConMon time/vert
-            rtn_array = np.empty((0, dims[dims_arr[0]], dims[dims_arr[1]],
-                                  dims[dims_arr[2]]), float)
-            zarray = np.zeros((dims[dims_arr[0]], dims[dims_arr[1]],
-                               dims[dims_arr[2]]), float)
+        if not os.path.isfile(filename):
+            self.logger.info(f"WARNING:  file {filename} is missing")
+            return rtn_array, cycle_tm
 
-            dimensions = [dims[dims_arr[0]], dims[dims_arr[1]]]
+        # gsistat files are raw native floats without record markers, each variable gets a
+        # copy of the whole file
+        if ndims_used == 1 and gsistat:
+            rtn_array[:] = np.fromfile(filename, dtype=np.float32)
+            return rtn_array, cycle_tm
 
+        # Record layout of the file as runs of (number of records, values per record, variables)
+        if ndims_used == 3:
+            record_runs = []
             for x in range(len(vars)):
-
-                if load_data:
-                    # satang variable is not used and a non-standard size
-                    if vars[x] == 'satang':
-                        skip = f.read_reals(dtype=np.dtype('>f4')).reshape(dims['xdef'],
-                                                                           dims['ydef'])
-                        tarr = zarray
-                    else:
-                        mylist = []
-                        for z in range(dims['zdef']):
-                            arr = f.read_reals(dtype=np.dtype('>f4')).reshape(dims['ydef'],
-                                                                              dims['xdef'])
-                            mylist.append(np.transpose(arr))
-                        tarr = np.dstack(mylist)
-
+                # satang variable is not used and a non-standard size
+                if vars[x] == 'satang':
+                    record_runs.append([1, dims['xdef']*dims['ydef'], []])
+                elif record_runs and record_runs[-1][2]:
+                    record_runs[-1][0] += dims['zdef']
+                    record_runs[-1][2].append(x)
                 else:
-                    tarr = zarray
+                    record_runs.append([dims['zdef'], dims['ydef']*dims['xdef'], [x]])
+        else:
+            record_runs = [[len(vars), int(np.prod(var_shape)), list(range(len(vars)))]]
 
-                rtn_array = np.append(rtn_array, [tarr], axis=0)
+        payloads = self.read_fortran_records(filename, [run[0:2] for run in record_runs])
 
-        else:		# ndims_used == 1|2
-            for x in range(len(vars)):
-                if load_data:
-                    if ndims_used == 1:
-                        if gsistat:
-                            with open(filename, 'rb') as infile:
-                                binary_data = infile.read()
-                            arr = array.array('f')
-                            arr.frombytes(binary_data)
-                        else:
-                            arr = f.read_reals(dtype=np.dtype('>f4'))
-
-                    else:
-                        arr = np.transpose(f.read_reals(dtype=np.dtype('>f4')).reshape(dimensions))
-                else:
-                    arr = zarray
+        # Copy each run of records into the preallocated array
+        for (nrecords, nvalues, run_vars), payload in zip(record_runs, payloads):
+            if not run_vars:
+                continue
+            if ndims_used == 1:
+                rtn_array[run_vars] = payload
+            elif ndims_used == 2:
+                # Records are stored with the first dimension varying fastest
+                rtn_array[run_vars] = payload.reshape(len(run_vars), dims[dims_arr[1]],
+                                                      dims[dims_arr[0]]).transpose(0, 2, 1)
+            else:
+                # One record per zdef, each with xdef varying fastest
+                rtn_array[run_vars] = payload.reshape(len(run_vars), dims['zdef'], dims['ydef'],
+                                                      dims['xdef']).transpose(0, 3, 2, 1)
 
-                rtn_array = np.append(rtn_array, [arr], axis=0)
-        if load_data:
-            f.close()
         return rtn_array, cycle_tm
 
     # ----------------------------------------------------------------------------------------------
 
+    def read_fortran_records(self, filename, record_runs):
+
+        """
+        Memory map a big endian sequential Fortran file of float records.
+
+        Args:
+            filename (str): Name of the file to read.
+            record_runs (list): Consecutive runs of records in the file as (number of records,
+                                number of values in each record).
+
+        Returns:
+            list: For each run a (number of records, number of values) big endian array viewing
+            the record payloads in the file.
+        """
+
+        file_size = os.path.getsize(filename)
+        file_map = np.memmap(filename, dtype=np.uint8, mode='r') if file_size else None
+
+        payloads = []
+        offset = 0
+        for nrecords, nvalues in record_runs:
+
+            # Each record is its payload between two markers holding the payload size in bytes
+            record_dtype = np.dtype([('head', '>u4'), ('data', '>f4', (nvalues,)),
+                                     ('tail', '>u4')])
+
+            if offset + nrecords*record_dtype.itemsize > file_size:
+                self.logger.abort(f'File {filename} is smaller than expected from the dimensions ' +
+                                  'in the control file.')
+
+            records = np.ndarray((nrecords,), dtype=record_dtype, buffer=file_map, offset=offset)
+            if np.any(records['head'] != 4*nvalues) or np.any(records['tail'] != 4*nvalues):
+                self.logger.abort(f'File {filename} has records with sizes that do not match ' +
+                                  'the dimensions in the control file.')
+
+            payloads.append(records['data'])
+            offset += nrecords*record_dtype.itemsize
+
+        return payloads
+
+    # ----------------------------------------------------------------------------------------------
+
     def read_stn_ieee(self, file_name, coords, dims, ndims_used, dims_arr,
                       vars, file_path=None):
 
@@ -767,46 +964,54 @@ class MonDataSpace(EvaDatasetBase):
 
         filename = os.path.join(file_path, file_name) if file_path else file_name
 
-        load_data = True
-        if os.path.isfile(filename):
-            f = FortranFile(filename, 'r', '>u4')
-        else:
+        if not os.path.isfile(filename):
             self.logger.info(f"WARNING:  file {filename} is missing")
-            load_data = False
-
-        mylist = []
-        lat = []
-        lon = []
-        numobs = 0
-
-        if load_data:
-            nlev = 1
-            while (nlev):
-
-                # Header components are stn id, lat, lon, time, nlev, flag.
-                # Data follows header if nlev > 0, else it's EOF.
-                record = f.read_record('>i8', '>f4', '>f4', '>f4', '>i4', '>i4')
-                nlev = record[4]
-                if nlev:
-                    lat.append(record[1])
-                    lon.append(record[2])
-                    data = f.read_record('>f4').reshape([len(vars), dims[dims_arr[0]]])
-                    numobs += 1
-                    mylist.append(data)
-
-            # dimensions are nvar, nlev, numobs
-            rtn_array = np.dstack(mylist)
-            dims['ydef'] = numobs
-            f.close()
-
-        else:
-            rtn_array = np.zeros((len(vars), dims[dims_arr[0]], 1), float)
-            lat.append(0)
-            lon.append(0)
+            rtn_array = np.zeros((len(vars), dims[dims_arr[0]], 1), np.float32)
             dims['ydef'] = 1
-
-        rtn_lat = np.asarray(lat).reshape(-1)
-        rtn_lon = np.asarray(lon).reshape(-1)
+            return rtn_array, cycle_tm, dims, np.zeros(1, np.float32), np.zeros(1, np.float32)
+
+        # Each station is a header record (stn id, lat, lon, time, nlev, flag) followed by a
+        # data record of nvar x nlev values. The file ends with a header that has nlev = 0.
+        nvalues = len(vars)*dims[dims_arr[0]]
+        header_dtype = [('head_start', '>u4'), ('stn', '>i8'), ('lat', '>f4'), ('lon', '>f4'),
+                        ('time', '>f4'), ('nlev', '>i4'), ('flag', '>i4'), ('head_end', '>u4')]
+        data_dtype = [('data_start', '>u4'), ('data', '>f4', (nvalues,)), ('data_end', '>u4')]
+        header_dtype = np.dtype(header_dtype)
+        station_dtype = np.dtype(header_dtype.descr + data_dtype)
+        header_size = header_dtype.itemsize - 8
+
+        file_size = os.path.getsize(filename)
+        file_map = np.memmap(filename, dtype=np.uint8, mode='r') if file_size else None
+
+        # View every complete station in the file and find the terminating header
+        max_stations = file_size // station_dtype.itemsize
+        stations = np.ndarray((max_stations,), dtype=station_dtype, buffer=file_map)
+        end_of_file = np.flatnonzero(stations['nlev'] == 0)
+        numobs = int(end_of_file[0]) if end_of_file.size else max_stations
+
+        if numobs*station_dtype.itemsize + header_dtype.itemsize > file_size:
+            self.logger.abort(f'Station file {filename} does not end with an end of file record.')
+        terminator = np.ndarray((1,), dtype=header_dtype, buffer=file_map,
+                                offset=numobs*station_dtype.itemsize)
+        if terminator['nlev'][0] != 0:
+            self.logger.abort(f'Station file {filename} does not end with an end of file record.')
+
+        stations = stations[0:numobs]
+        if np.any(stations['head_start'] != header_size) or \
+           np.any(stations['head_end'] != header_size) or \
+           np.any(stations['data_start'] != 4*nvalues) or \
+           np.any(stations['data_end'] != 4*nvalues):
+            self.logger.abort(f'Station file {filename} has records with sizes that do not ' +
+                              'match the dimensions in the control file.')
+
+        # dimensions are nvar, nlev, numobs
+        rtn_array = np.empty((len(vars), dims[dims_arr[0]], numobs), np.float32)
+        rtn_array[...] = stations['data'].reshape(numobs, len(vars),
+                                                  dims[dims_arr[0]]).transpose(1, 2, 0)
+        dims['ydef'] = numobs
+
+        rtn_lat = stations['lat'].astype(np.float32)
+        rtn_lon = stations['lon'].astype(np.float32)
 
         return rtn_array, cycle_tm, dims, rtn_lat, rtn_lon
 
@@ -821,27 +1026,27 @@ class MonDataSpace(EvaDatasetBase):
             dims (dict): Dictionary of dimension sizes.
             ndims_used (int): Number of dimensions used.
             dims_arr (list): List of dimension names used.
-            var: Value to fill the array with.
+            var: Value to fill the array with, or a list of values (e.g. one per cycle) in which
+                 case the array has an extra leading dimension.
 
         Returns:
             numpy.ndarray: Numpy array with the requested dimensions and filled with the given
             value.
         """
 
-        # build numpy array with requested dimensions
-        d = {
-            1: np.reshape([[var] * dims[dims_arr[0]]], (dims[dims_arr[0]])),
-            2: np.reshape([[var] * dims[dims_arr[0]]] * dims[dims_arr[1]],
-                          (dims[dims_arr[0]], dims[dims_arr[1]])),
-            3: np.reshape([[var] * dims[dims_arr[0]] * dims[dims_arr[1]] * dims[dims_arr[2]]],
-                          (dims[dims_arr[0]], dims[dims_arr[1]], dims[dims_arr[2]]))
-        }
-
-        try:
-            cycle_arr = d[ndims_used]
-        except KeyError:
+        if ndims_used not in [1, 2, 3]:
             self.logger.abort(f'ndims_used must be in range of 1-3, value is {ndims_used}')
 
+        # Datetimes are stored as datetime64 so the array can be filled by broadcasting
+        values = np.array(var)
+        if values.dtype == object:
+            values = values.astype('datetime64[us]')
+
+        # build numpy array with requested dimensions
+        shape = tuple(dims[dims_arr[x]] for x in range(ndims_used))
+        cycle_arr = np.empty(values.shape + shape, dtype=values.dtype)
+        cycle_arr[...] = values.reshape(values.shape + (1,) * ndims_used)
+
         return cycle_arr
 
     # ----------------------------------------------------------------------------------------------
@@ -927,108 +1132,6 @@ class MonDataSpace(EvaDatasetBase):
 
     # ----------------------------------------------------------------------------------------------
 
-    def load_dset(self, vars, coords, darr, dims, ndims_used,
-                  dims_arr, x_range, y_range, z_range, cyc_darr=None):
-
-        """
-        Create a dataset from various components.
-
-        Args:
-            vars (list): List of variable names.
-            coords (dict): Dictionary of coordinates.
-            darr (numpy.ndarray): Numpy array of data.
-            dims (dict): Dictionary of dimension sizes.
-            ndims_used (int): Number of dimensions used.
-            dims_arr (list): List of dimension names used.
-            x_range (numpy.ndarray or None): Valid x coordinate range.
-            y_range (numpy.ndarray or None): Valid y coordinate range.
-            z_range (numpy.ndarray or None): Valid z coordinate range.
-            cyc_darr (numpy.ndarray): Numpy array of cycle data.
-
-        Returns:
-            xarray.Dataset: Created dataset.
-        """
-
-        # create dataset from file components
-        rtn_ds = None
-
-        new_coords = {}
-        for x in range(0, len(vars)):
-            if ndims_used == 1:
-                d = {
-                    vars[x]: {"dims": (coords[dims_arr[0]]), "data": darr[x, :]}
-                }
-
-                # MinMon plots require both the 'allgnorm' data and log('allgnorm').
-                if vars[x] == 'allgnorm':
-                    d.update({
-                        "log_gnorm": {"dims": (coords[dims_arr[0]]), "data": np.log(darr[x, :])}
-                    })
-                new_coords = {
-                    coords[dims_arr[0]]: x_range
-                }
-            if ndims_used == 2:
-                d = {
-                    vars[x]: {"dims": (coords[dims_arr[0]], coords[dims_arr[1]]),
-                              "data": darr[x, :, :]}
-                }
-                new_coords = {
-                    coords[dims_arr[0]]: x_range,
-                    coords[dims_arr[1]]: y_range
-                }
-            if ndims_used == 3:
-                d = {
-                    vars[x]: {"dims": (coords[dims_arr[0]], coords[dims_arr[1]],
-                                       coords[dims_arr[2]]),
-                              "data": darr[x, :, :]}
-                }
-                new_coords = {
-                    coords[dims_arr[0]]: x_range,
-                    coords[dims_arr[1]]: y_range,
-                    coords[dims_arr[2]]: z_range
-                }
-
-            new_ds = Dataset.from_dict(d)
-            rtn_ds = new_ds if rtn_ds is None else rtn_ds.merge(new_ds)
-
-        # Add the new coordinates to the dataset
-        rtn_ds = rtn_ds.assign_coords(new_coords)
-
-        # tack on 'cycle' as a variable
-        # -----------------------------
-        if cyc_darr is not None:
-            if ndims_used == 1:
-                new_cyc = Dataset(
-                    {
-                        'cycle': ((coords[dims_arr[0]]), cyc_darr),
-                    },
-                    coords={coords[dims_arr[0]]: x_range},
-                )
-            if ndims_used == 2:
-                new_cyc = Dataset(
-                    {
-                        'cycle': ((coords[dims_arr[0]], coords[dims_arr[1]]), cyc_darr),
-                    },
-                    coords={coords[dims_arr[0]]: x_range,
-                            coords[dims_arr[1]]: y_range},
-                )
-            if ndims_used == 3:
-                new_cyc = Dataset(
-                    {
-                        'cycle': ((coords[dims_arr[0]], coords[dims_arr[1]],
-                                   coords[dims_arr[2]]), cyc_darr),
-                    },
-                    coords={coords[dims_arr[0]]: x_range,
-                            coords[dims_arr[1]]: y_range,
-                            coords[dims_arr[2]]: z_range},
-                )
-
-            rtn_ds = rtn_ds.merge(new_cyc)
-
-        return rtn_ds
-
-    # ----------------------------------------------------------------------------------------------
-
     def loadConditionalItems(self, dataset, chans_dict, levs_dict, datatype_dict,
                              scanpo, iterations=None):
 
@@ -1094,6 +1197,44 @@ class MonDataSpace(EvaDatasetBase):
 
     # ----------------------------------------------------------------------------------------------
 
+    def read_control_file(self, control_file):
+
+        """
+        Return the cached contents of a control file, reading it if it has not been read before.
+
+        Control files are shared by many datasets so they are cached by path and modification
+        time, and the results of parsing them are added to the cached contents.
+
+        Args:
+            control_file (str): Path to the control file.
+
+        Returns:
+            dict: The lines of the control file, whether it is for station data and anything
+                  parsed from it so far.
+        """
+
+        stat = os.stat(control_file)
+        path = os.path.abspath(control_file)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+
+        if key not in control_file_cache:
+            with open(control_file, 'r') as fp:
+                lines = fp.readlines()
+
+            # Drop versions of the file that have since been modified
+            for old_key in [k for k in control_file_cache if k[0] == path]:
+                del control_file_cache[old_key]
+
+            control = {}
+            control['lines'] = lines
+            control['is_stn'] = any('DTYPE station' in line or 'dtype station' in line
+                                    for line in lines)
+            control_file_cache[key] = control
+
+        return control_file_cache[key]
+
+    # ----------------------------------------------------------------------------------------------
+
     def is_stn_data(self, control_file):
 
         """
@@ -1106,9 +1247,4 @@ class MonDataSpace(EvaDatasetBase):
             is_stn(boolean): True if this is a control file.
         """
 
-        with open(control_file, 'r') as fp:
-            content = fp.read()
-            is_stn = True if 'DTYPE station' in content or 'dtype station' in content else False
-            fp.close()
-
-        return is_stn
+        return self.read_control_file(control_file)['is_stn']
@@ -8,10 +8,10 @@
 
 # --------------------------------------------------------------------------------------------------
 
-import numpy as np
 import xarray as xr
 from netCDF4 import Dataset
 from eva.utilities.config import get
+from eva.utilities.utils import parse_channel_list, read_variable_levels
 from eva.data.eva_dataset_base import EvaDatasetBase
 
 # --------------------------------------------------------------------------------------------------
@@ -75,25 +75,35 @@ class SocaRestart(EvaDatasetBase):
         soca_vars = get(dataset_config, self.logger, 'variables', default=[])
         coord_vars = get(dataset_config, self.logger, 'coordinate variables', default=None)
 
+        # Optionally only read some levels of the 3D variables
+        # -------------------------
+        levels = parse_channel_list(get(dataset_config, self.logger, 'levels', []), self.logger)
+        levels = sorted(set(levels))
+
         # Read orographic fields first
         # -------------------------
         var_dict = {}
         group_name = 'SOCAgrid'
         for var in coord_vars:
-            dims, data = read_soca(geometry_file, var, self.logger)
+            dims, data = read_soca(geometry_file, var, self.logger, levels)
             var_dict[group_name + '::' + var] = (dims, data)
 
         # SOCA variables
         # -------------------------
         group_name = 'SOCAVars'
         for var in soca_vars:
-            dims, data = read_soca(soca_filenames, var, self.logger)
+            dims, data = read_soca(soca_filenames, var, self.logger, levels)
             var_dict[group_name + '::' + var] = (dims, data)
 
         # Create dataset_config from data dictionary
         # -------------------------
         ds = xr.Dataset(var_dict)
 
+        # Label the levels that were read with their index
+        # -------------------------
+        if levels and 'lev' in ds.dims:
+            ds = ds.assign_coords(lev=levels)
+
         # Assert that the collection contains at least one variable
         # -------------------------
         if not ds.keys():
@@ -132,7 +142,7 @@ class SocaRestart(EvaDatasetBase):
 # --------------------------------------------------------------------------------------------------
 
 
-def read_soca(file, variable, logger):
+def read_soca(file, variable, logger, levels=None):
 
     """
     Read SOCA data from the specified file for the given variable.
@@ -141,6 +151,7 @@ def read_soca(file, variable, logger):
         file (str): Path to the SOCA data file.
         variable (str): Name of the variable to read.
         logger (Logger): Logger for logging messages.
+        levels (list): Indices of the levels to read from 3D variables (all if None or empty).
 
     Returns:
         tuple: A tuple containing dimensions (list) and data (numpy.ndarray) for the specified
@@ -152,9 +163,11 @@ def read_soca(file, variable, logger):
             dims = ["lon", "lat"]
             if len(f.variables[variable].dimensions) > 3:
                 dims = ["lev", "lon", "lat"]
-            var = np.squeeze(f.variables[variable][:])
+            var = read_variable_levels(f.variables[variable], levels)
         except KeyError:
             logger.abort(f"{variable} is not a valid variable. \nExiting ...")
+        except IndexError as error:
+            logger.abort(f"{error} \nExiting ...")
 
     return dims, var
 
@@ -9,30 +9,28 @@
 
 # --------------------------------------------------------------------------------------------------
 
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import argparse
+import multiprocessing
 import os
+import sys
+import time
 from collections import defaultdict
-import xarray as xr
-import numpy as np
 
 from eva.utilities.config import get
 from eva.utilities.logger import Logger
 from eva.utilities.timing import Timing
-from eva.data.data_driver import data_driver
-from eva.time_series.time_series import add_empty_to_timeseries
-from eva.time_series.time_series import collapse_collection_to_time_series
-from eva.time_series.time_series_utils import create_empty_data, get_filename, check_file
-from eva.transforms.transform_driver import transform_driver
-from eva.plotting.batch.base.plot_tools.figure_driver import figure_driver
-from eva.data.data_collections import DataCollections
 from eva.utilities.duration import iso_duration_to_timedelta
 from eva.utilities.utils import load_yaml_file
 
+# The readers, transforms and plotting backends (xarray, matplotlib, emcpy etc.) are imported by
+# the functions that use them so that only what a configuration needs is imported.
+
 # --------------------------------------------------------------------------------------------------
 
 
-def read_transform(logger, timing, eva_dict, data_collections):
+def read_transform(logger, timing, eva_dict, data_collections, dataset_cache=None):
 
     """
     Read the data and perform any transforms based on the configuration.
@@ -42,11 +40,16 @@ def read_transform(logger, timing, eva_dict, data_collections):
         timing (Timing): An instance of the timing object for timing the process.
         eva_dict (dict): The configuration dictionary for the EVA process.
         data_collections (DataCollections): An instance of the data collections object.
+        dataset_cache (DatasetCache, optional): Cache of the collections read for other
+        configurations. When given, datasets already read are not read again.
 
     Returns:
         None
     """
 
+    from eva.data.data_driver import data_driver
+    from eva.transforms.transform_driver import transform_driver
+
     # Get the datasets configuration
     datasets_config = get(eva_dict, logger, 'datasets')
 
@@ -54,13 +57,16 @@ def read_transform(logger, timing, eva_dict, data_collections):
     suppress_collection_display = get(eva_dict, logger, 'suppress_collection_display', False)
 
     # Loop over datasets reading each one in turn, internally appending the data_collections
-    for dataset_config in datasets_config:
+    if dataset_cache is not None:
+        dataset_cache.add_to_collections(datasets_config, data_collections, timing, logger)
+    else:
+        for dataset_config in datasets_config:
 
-        # Prepare diagnostic data
-        logger.info('Running data driver')
-        timing.start('DataDriverExecute')
-        data_driver(dataset_config, data_collections, timing, logger)
-        timing.stop('DataDriverExecute')
+            # Prepare diagnostic data
+            logger.info('Running data driver')
+            timing.start('DataDriverExecute')
+            data_driver(dataset_config, data_collections, timing, logger)
+            timing.stop('DataDriverExecute')
 
     # After reading all datasets display the collection
     if not suppress_collection_display:
@@ -98,6 +104,13 @@ def read_transform_time_series(logger, timing, eva_dict, data_collections):
         None
     """
 
+    from eva.data.data_collections import DataCollections
+    from eva.data.data_driver import data_driver
+    from eva.time_series.time_series import add_empty_to_timeseries
+    from eva.time_series.time_series import collapse_collection_to_time_series
+    from eva.time_series.time_series_utils import get_filename, check_file
+    from eva.transforms.transform_driver import transform_driver
+
     # Iterate through list of time series dictionaries
     for time_series_config in eva_dict['time_series']:
 
@@ -214,7 +227,7 @@ def read_transform_time_series(logger, timing, eva_dict, data_collections):
 # --------------------------------------------------------------------------------------------------
 
 
-def eva(eva_config, eva_logger=None):
+def eva(eva_config, eva_logger=None, dataset_cache=None):
 
     """
     Execute the Evaluation and Visualization Analysis (EVA) process based on the provided
@@ -225,6 +238,8 @@ def eva(eva_config, eva_logger=None):
         the path to a YAML configuration file.
         eva_logger (Logger, optional): An instance of the logger for logging messages. Default is
         None.
+        dataset_cache (DatasetCache, optional): Cache of collections shared with other
+        configurations. Not used for time series. Default is None.
 
     Returns:
         None
@@ -255,21 +270,45 @@ def eva(eva_config, eva_logger=None):
 
     # Create the data collections
     # ---------------------------
+    from eva.data.data_collections import DataCollections
     data_collections = DataCollections('time_series' in eva_dict)
 
+    # Optionally only make the figures whose configuration or input data have changed
+    # --------------------------------------------------------------------------------
+    figure_manifest = None
+    if eva_dict['graphics'].get('incremental_rebuild', False):
+        if 'time_series' in eva_dict:
+            logger.info('incremental_rebuild is not used for time series and will be ignored.')
+        else:
+            from eva.plotting.batch.base.plot_tools.figure_manifest import FigureManifest
+            timing.start('FigureManifest')
+            figure_manifest = FigureManifest(eva_dict, logger)
+            timing.stop('FigureManifest')
+
     # Check to see if this a time series run of eva and then read and transform
     # -------------------------------------------------------------------------
     if 'time_series' in eva_dict:
         read_transform_time_series(logger, timing, eva_dict, data_collections)
+    elif figure_manifest is not None:
+        # Only read the collections that the stale figures need
+        if figure_manifest.stale:
+            read_transform(logger, timing, figure_manifest.restrict_config(eva_dict),
+                           data_collections, dataset_cache)
+        else:
+            logger.info('All figures are up to date so no data will be read.')
     else:
-        read_transform(logger, timing, eva_dict, data_collections)
-
-    # Generate figure(s)
-    # ------------------
-    logger.info(f'Running figure driver')
-    timing.start('FigureDriverExecute')
-    figure_driver(eva_dict, data_collections, timing, logger)
-    timing.stop('FigureDriverExecute')
+        read_transform(logger, timing, eva_dict, data_collections, dataset_cache)
+
+    # Generate figure(s), the plotting backend is only imported if there are figures to make
+    # --------------------------------------------------------------------------------------
+    if eva_dict['graphics'].get('figure_list'):
+        from eva.plotting.batch.base.plot_tools.figure_driver import figure_driver
+        logger.info(f'Running figure driver')
+        timing.start('FigureDriverExecute')
+        figure_driver(eva_dict, data_collections, timing, logger, figure_manifest)
+        timing.stop('FigureDriverExecute')
+    else:
+        logger.info('The configuration does not have any figures to make.')
 
     timing.finalize()
 
@@ -277,33 +316,190 @@ def eva(eva_config, eva_logger=None):
 # --------------------------------------------------------------------------------------------------
 
 
+# Cache inherited by the forked workers of eva_batch
+_batch_cache = None
+
+
+def _run_batch_config(eva_dict):
+
+    """
+    Run eva for one configuration of a batch, catching any failure.
+
+    Parameters:
+        eva_dict (dict): The configuration dictionary for the EVA process.
+
+    Returns:
+        tuple: The error message, None if eva succeeded, and the elapsed time in seconds.
+    """
+
+    dataset_cache = None if 'time_series' in eva_dict else _batch_cache
+
+    start = time.perf_counter()
+    try:
+        eva(eva_dict, dataset_cache=dataset_cache)
+        error = None
+    except SystemExit as exit_error:
+        error = f'aborted with exit code {exit_error.code}'
+    except Exception as exception:
+        error = f'{type(exception).__name__}: {exception}'
+
+    return error, time.perf_counter() - start
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def eva_batch(eva_configs, workers=1, dataset_cache=None):
+
+    """
+    Run eva for several configurations, reading the datasets they have in common only once.
+
+    The datasets of each configuration are grouped by the collection they are read into. A group
+    that is identical in several configurations is read once and each configuration runs its
+    transforms and graphics on its own copy of the collections. With more than one worker the
+    shared groups are read before the configurations are run in forked worker processes, which
+    inherit the collections that were read. A failing configuration does not stop the others.
+
+    Parameters:
+        eva_configs (list): Configuration dictionaries or paths to YAML configuration files.
+        workers (int, optional): Number of configurations to run at the same time. Default is 1.
+        dataset_cache (DatasetCache, optional): Cache to read the datasets through, e.g. one that
+                                                retains collections between batches. Default is a
+                                                new cache for this batch.
+
+    Returns:
+        list: The configurations that failed.
+    """
+
+    global _batch_cache
+
+    from eva.data.dataset_cache import DatasetCache
+
+    logger = Logger('EvaBatch')
+
+    # Load all the configurations
+    # ---------------------------
+    names = []
+    eva_dicts = []
+    for ind, eva_config in enumerate(eva_configs):
+        if isinstance(eva_config, dict):
+            names.append(f'config {ind}')
+            eva_dicts.append(eva_config)
+        else:
+            names.append(eva_config)
+            eva_dicts.append(load_yaml_file(eva_config, logger))
+
+    # Register the datasets of each configuration with the cache
+    # ----------------------------------------------------------
+    if dataset_cache is None:
+        dataset_cache = DatasetCache()
+    reads = dataset_cache.reads
+    hits = dataset_cache.hits
+    datasets_configs = []
+    for eva_dict in eva_dicts:
+        if 'time_series' not in eva_dict and 'datasets' in eva_dict:
+            dataset_cache.register(eva_dict['datasets'])
+            datasets_configs.append(eva_dict['datasets'])
+
+    # Workers are forked so that they share the collections read in this process
+    if workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+        logger.info('Configurations will be run one at a time as worker processes cannot be ' +
+                    'forked on this platform.')
+        workers = 1
+    workers = max(min(workers, len(eva_dicts)), 1)
+
+    _batch_cache = dataset_cache
+    start = time.perf_counter()
+    try:
+        if workers > 1:
+            # Read the datasets that are used by more than one configuration before forking
+            timing = Timing()
+            for recipe in dataset_cache.shared_recipes(datasets_configs):
+                dataset_cache.read(recipe, timing, logger)
+
+            # The workers only keep what they inherit, anything else they read is dropped once
+            # the configuration that read it is done
+            dataset_cache.keep_only_read()
+
+            fork_context = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=fork_context) as executor:
+                results = list(executor.map(_run_batch_config, eva_dicts))
+        else:
+            results = []
+            for eva_dict in eva_dicts:
+                results.append(_run_batch_config(eva_dict))
+
+                # Drop the collections that no remaining configuration needs
+                if 'time_series' not in eva_dict and 'datasets' in eva_dict:
+                    dataset_cache.release(eva_dict['datasets'])
+    finally:
+        _batch_cache = None
+
+    # Summary of the batch
+    # --------------------
+    failures = []
+    for name, (error, elapsed) in zip(names, results):
+        if error is None:
+            logger.info(f'{name}: completed in {elapsed:.2f} seconds')
+        else:
+            logger.info(f'{name}: failed after {elapsed:.2f} seconds, {error}')
+            failures.append(name)
+
+    logger.info(f'Ran {len(eva_dicts)} configurations in {time.perf_counter() - start:.2f} ' +
+                f'seconds with {workers} worker(s), {len(failures)} failed. Collections were ' +
+                f'read {dataset_cache.reads - reads} time(s) in this process and reused ' +
+                f'{dataset_cache.hits - hits} time(s).')
+
+    return failures
+
+
+# --------------------------------------------------------------------------------------------------
+
+
 def main():
 
     """
     Entry point for main eva program. Reads configuration from a YAML file and executes eva
-    based on what is described in the configuration file.
+    based on what is described in the configuration file. When several configuration files are
+    given they are run as a batch in which datasets common to several of them are read once.
+    'eva serve' and 'eva submit' run and use a long running eva (see eva_server).
 
     Parameters:
-        config_file (str): The path to the configuration YAML file.
+        config_file (str): The path(s) to the configuration YAML file(s).
+        workers (int): Number of configurations of a batch to run at the same time.
 
     Returns:
         None
     """
 
+    # Long running server and its client
+    # ----------------------------------
+    if sys.argv[1:2] in [['serve'], ['submit']]:
+        from eva.eva_server import main as server_main
+        server_main(sys.argv[1:])
+        return
+
     # Arguments
     # ---------
     parser = argparse.ArgumentParser()
-    parser.add_argument('config_file', type=str, help='Configuration YAML file for driving ' +
-                        'the diagnostic. See documentation/examples for how to configure the YAML.')
+    parser.add_argument('config_file', type=str, nargs='+', help='Configuration YAML file(s) ' +
+                        'for driving the diagnostic. See documentation/examples for how to ' +
+                        'configure the YAML.')
+    parser.add_argument('--workers', type=int, default=1, help='Number of configuration files ' +
+                        'to run at the same time when several are given.')
 
-    # Get the configuation file
+    # Get the configuation file(s)
     args = parser.parse_args()
-    config_file = args.config_file
+    config_files = args.config_file
 
-    assert os.path.exists(config_file), "File " + config_file + " not found"
+    for config_file in config_files:
+        assert os.path.exists(config_file), "File " + config_file + " not found"
 
     # Run the diagnostic(s)
-    eva(config_file)
+    if len(config_files) == 1:
+        eva(config_files[0])
+    elif eva_batch(config_files, args.workers):
+        sys.exit(1)
 
 
 # --------------------------------------------------------------------------------------------------
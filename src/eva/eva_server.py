@@ -0,0 +1,467 @@
+# (C) Copyright 2021-2023 NOAA/NWS/EMC
+#
+# (C) Copyright 2021-2023 United States Government as represented by the Administrator of the
+# National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import argparse
+import glob
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+from eva.eva_path import return_eva_path
+from eva.utilities.logger import Logger
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+# Modules imported before the workers are started, in addition to those in the registry
+warm_modules = ['eva.data.dataset_cache',
+                'eva.time_series.time_series',
+                'eva.time_series.time_series_utils',
+                'eva.transforms.transform_driver',
+                'eva.plotting.batch.base.plot_tools.figure_driver',
+                'eva.plotting.batch.base.plot_tools.figure_manifest']
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def warm_up(logger):
+
+    """
+    Import the modules and parse the schema files used by eva so that jobs do not pay for it.
+
+    Args:
+        logger (Logger): An instance of the logger for logging messages.
+    """
+
+    start = time.perf_counter()
+
+    from eva.utilities.registry import registry
+    from eva.utilities.utils import load_schema_file
+
+    # Import all the readers, transforms and plots
+    module_names = list(warm_modules)
+    for kind_registry in registry.values():
+        module_names += [name for name in kind_registry.values() if name not in module_names]
+    for module_name in module_names:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as error:
+            # Optional backends (e.g. hvplot) may not be installed
+            logger.trace(f'Module {module_name} is not available: {error}')
+
+    # Parse the default schemas of the plots
+    schema_files = glob.glob(os.path.join(return_eva_path(), 'plotting', 'batch', '*',
+                                          'defaults', '*.yaml'))
+    for schema_file in schema_files:
+        load_schema_file(schema_file, logger)
+
+    logger.info(f'Imported eva modules and parsed {len(schema_files)} schema files in ' +
+                f'{time.perf_counter() - start:.2f} seconds.')
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+# Collections kept by a worker process between the jobs it runs
+_worker_cache = None
+
+
+def run_job(configs, submitted, cache_size):
+
+    """
+    Run the configurations of a job in a worker process.
+
+    The worker keeps the collections read for its last jobs, so a job reading the same datasets
+    as an earlier one does not read them again unless their files have changed.
+
+    Args:
+        configs (list): Configuration dictionaries or paths to YAML configuration files.
+        submitted (float): The time the job was submitted (seconds since the epoch).
+        cache_size (int): Number of groups of datasets the worker keeps between jobs.
+
+    Returns:
+        dict: The configurations that failed, the time the job waited for a worker and the time
+              it took to run.
+    """
+
+    global _worker_cache
+
+    from eva.data.dataset_cache import DatasetCache
+    from eva.eva_driver import eva_batch
+
+    if _worker_cache is None:
+        _worker_cache = DatasetCache(retain=cache_size)
+
+    started = time.time()
+    start = time.perf_counter()
+    failures = eva_batch(configs, dataset_cache=_worker_cache)
+
+    return {'failed': failures,
+            'queued': started - submitted,
+            'elapsed': time.perf_counter() - start}
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def config_name(config, ind):
+
+    """
+    Return a name for a configuration of a job.
+
+    Args:
+        config (dict or str): Configuration dictionary or path to a YAML configuration file.
+        ind (int): Position of the configuration in the job.
+
+    Returns:
+        str: The path to the file or the position of the configuration dictionary.
+    """
+
+    return config if isinstance(config, str) else f'config {ind}'
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+class EvaServer:
+
+    """
+    A long running eva that runs jobs in a pool of warm worker processes.
+
+    The modules of eva are imported and the schema files parsed once, before the workers are
+    forked, so a job only pays for reading its data and making its figures. Each worker keeps the
+    collections it read for its recent jobs, which later jobs reading the same (unchanged) files
+    reuse. Jobs are received on a Unix socket, where each connection sends one JSON line
+    {"configs": [...]} and receives one JSON line with the result, and/or from a spool directory,
+    where each YAML file is one configuration. Spooled files are moved to running/ while they run
+    and then to done/ or failed/ next to a JSON file with the result. Files must be moved into the
+    spool directory once complete (e.g. written elsewhere and renamed) so they are not read while
+    being written.
+    """
+
+    def __init__(self, workers=2, logger=None, cache_size=8):
+
+        """
+        Initialize the server.
+
+        Args:
+            workers (int, optional): Number of jobs to run at the same time. Default is 2.
+            logger (Logger, optional): An instance of the logger for logging messages.
+            cache_size (int, optional): Number of groups of datasets each worker keeps between
+                                        jobs. Default is 8.
+        """
+
+        self.logger = Logger('EvaServer') if logger is None else logger
+        self.workers = max(workers, 1)
+        self.cache_size = max(cache_size, 0)
+
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            self.logger.abort('eva serve needs worker processes to be forked, which is not ' +
+                              'possible on this platform.')
+
+        self.executor = None
+        self.lock = threading.Lock()
+        self.job_ids = itertools.count(1)
+        self.stop = threading.Event()
+
+    # ----------------------------------------------------------------------------------------------
+
+    def start_workers(self):
+
+        """
+        Start the pool of worker processes, which inherit the modules imported by this process.
+        """
+
+        fork_context = multiprocessing.get_context('fork')
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=fork_context)
+
+        # Fork the workers now rather than when the first job arrives
+        for future in [self.executor.submit(time.sleep, 0) for _ in range(self.workers)]:
+            future.result()
+
+    # ----------------------------------------------------------------------------------------------
+
+    def run(self, configs):
+
+        """
+        Run a job in the worker pool and wait for it to finish.
+
+        Args:
+            configs (list): Configuration dictionaries or paths to YAML configuration files.
+
+        Returns:
+            dict: The result of the job: its id, status, configurations that failed, time waiting
+                  for a worker and time running in seconds.
+        """
+
+        job_id = next(self.job_ids)
+        names = [config_name(config, ind) for ind, config in enumerate(configs)]
+        self.logger.info(f'Job {job_id} received: {names}')
+
+        with self.lock:
+            executor = self.executor
+
+        try:
+            result = executor.submit(run_job, configs, time.time(), self.cache_size).result()
+            result['status'] = 'failed' if result['failed'] else 'completed'
+        except BrokenProcessPool as error:
+            # A worker died, replace the pool so that later jobs can run
+            result = {'status': 'failed', 'failed': names, 'error': str(error)}
+            with self.lock:
+                if self.executor is executor:
+                    self.logger.info('A worker process died, restarting the workers.')
+                    executor.shutdown(wait=False)
+                    self.start_workers()
+        except SystemExit:
+            # The abort message has been logged by the worker
+            result = {'status': 'failed', 'failed': names, 'error': 'aborted'}
+        except Exception as error:
+            result = {'status': 'failed', 'failed': names,
+                      'error': f'{type(error).__name__}: {error}'}
+
+        result['job'] = job_id
+        if 'elapsed' in result:
+            self.logger.info(f'Job {job_id} {result["status"]} in {result["elapsed"]:.2f} ' +
+                             f'seconds after waiting {result["queued"]:.2f} seconds for a worker.')
+        else:
+            self.logger.info(f'Job {job_id} failed: {result["error"]}')
+
+        return result
+
+    # ----------------------------------------------------------------------------------------------
+
+    def serve_socket(self, socket_path):
+
+        """
+        Start a thread accepting jobs on a Unix socket.
+
+        Args:
+            socket_path (str): Path of the socket.
+
+        Returns:
+            socketserver.ThreadingUnixStreamServer: The socket server.
+        """
+
+        eva_server = self
+
+        class JobHandler(socketserver.StreamRequestHandler):
+
+            def handle(self):
+                try:
+                    request = json.loads(self.rfile.readline())
+                    configs = request['configs']
+                    if isinstance(configs, (str, dict)):
+                        configs = [configs]
+                    result = eva_server.run(configs)
+                except (ValueError, KeyError, TypeError) as error:
+                    result = {'status': 'failed', 'error': f'Invalid request: {error}'}
+                self.wfile.write((json.dumps(result) + '\n').encode())
+
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+        socket_server = socketserver.ThreadingUnixStreamServer(socket_path, JobHandler)
+        socket_server.daemon_threads = True
+        threading.Thread(target=socket_server.serve_forever, daemon=True).start()
+
+        self.logger.info(f'Accepting jobs on socket {socket_path}')
+        return socket_server
+
+    # ----------------------------------------------------------------------------------------------
+
+    def run_spooled(self, spool_dir, filename):
+
+        """
+        Run a configuration file from the spool directory and move it to done/ or failed/.
+
+        Args:
+            spool_dir (str): The spool directory.
+            filename (str): Name of the configuration file in the running/ directory.
+        """
+
+        running_file = os.path.join(spool_dir, 'running', filename)
+        result = self.run([running_file])
+
+        status_dir = os.path.join(spool_dir, 'done' if result['status'] == 'completed' else
+                                  'failed')
+        os.replace(running_file, os.path.join(status_dir, filename))
+        with open(os.path.join(status_dir, filename + '.json'), 'w') as result_file:
+            json.dump(result, result_file)
+
+    # ----------------------------------------------------------------------------------------------
+
+    def watch_spool(self, spool_dir, poll_interval=1.0):
+
+        """
+        Start a thread that runs the configuration files that appear in a spool directory.
+
+        Args:
+            spool_dir (str): The spool directory.
+            poll_interval (float, optional): Seconds between checks for new files. Default is 1.
+        """
+
+        for sub_dir in ['running', 'done', 'failed']:
+            os.makedirs(os.path.join(spool_dir, sub_dir), exist_ok=True)
+
+        def watch():
+            while not self.stop.is_set():
+                for filename in sorted(os.listdir(spool_dir)):
+                    if os.path.splitext(filename)[1] not in ['.yaml', '.yml']:
+                        continue
+
+                    # Claim the file so that it is only run once
+                    try:
+                        os.rename(os.path.join(spool_dir, filename),
+                                  os.path.join(spool_dir, 'running', filename))
+                    except OSError:
+                        continue
+
+                    threading.Thread(target=self.run_spooled, args=(spool_dir, filename),
+                                     daemon=True).start()
+
+                self.stop.wait(poll_interval)
+
+        threading.Thread(target=watch, daemon=True).start()
+        self.logger.info(f'Accepting jobs from spool directory {spool_dir}')
+
+    # ----------------------------------------------------------------------------------------------
+
+    def serve(self, socket_path=None, spool_dir=None, poll_interval=1.0):
+
+        """
+        Warm up, start the workers and run jobs until interrupted or terminated.
+
+        Args:
+            socket_path (str, optional): Path of the Unix socket to accept jobs on.
+            spool_dir (str, optional): Directory to take configuration files from.
+            poll_interval (float, optional): Seconds between checks of the spool directory.
+        """
+
+        if socket_path is None and spool_dir is None:
+            self.logger.abort('eva serve needs a socket and/or a spool directory to take jobs ' +
+                              'from.')
+
+        warm_up(self.logger)
+        self.start_workers()
+        self.logger.info(f'Started {self.workers} worker process(es).')
+
+        socket_server = None
+        if socket_path is not None:
+            socket_server = self.serve_socket(socket_path)
+        if spool_dir is not None:
+            self.watch_spool(spool_dir, poll_interval)
+
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop.set())
+        try:
+            while not self.stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            self.stop.set()
+
+        self.logger.info('Stopping, waiting for running jobs to finish.')
+        if socket_server is not None:
+            socket_server.shutdown()
+            socket_server.server_close()
+            os.remove(socket_path)
+        self.executor.shutdown(wait=True)
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def submit(socket_path, configs):
+
+    """
+    Send a job to a running eva server and wait for its result.
+
+    Args:
+        socket_path (str): Path of the socket the server accepts jobs on.
+        configs (list): Configuration dictionaries or paths to YAML configuration files.
+
+    Returns:
+        dict: The result of the job.
+    """
+
+    # The server may have a different working directory
+    configs = [os.path.abspath(config) if isinstance(config, str) else config
+               for config in configs]
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall((json.dumps({'configs': configs}) + '\n').encode())
+        with client.makefile('r') as reply:
+            return json.loads(reply.readline())
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def main(argv=None):
+
+    """
+    Entry point for eva serve and eva submit.
+
+    Parameters:
+        argv (list, optional): The arguments, starting with serve or submit. Default is the
+        arguments of the program.
+
+    Returns:
+        None
+    """
+
+    # Arguments
+    # ---------
+    parser = argparse.ArgumentParser(prog='eva')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Run jobs in warm worker processes.')
+    serve_parser.add_argument('--socket', type=str, help='Unix socket to accept jobs on.')
+    serve_parser.add_argument('--spool', type=str, help='Directory to take configuration ' +
+                              'files from.')
+    serve_parser.add_argument('--workers', type=int, default=2, help='Number of jobs to run at ' +
+                              'the same time.')
+    serve_parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds ' +
+                              'between checks of the spool directory.')
+    serve_parser.add_argument('--cache-size', type=int, default=8, help='Number of groups of ' +
+                              'datasets each worker keeps between jobs.')
+
+    submit_parser = subparsers.add_parser('submit', help='Send a job to a running eva serve.')
+    submit_parser.add_argument('--socket', type=str, required=True, help='Unix socket the ' +
+                               'server accepts jobs on.')
+    submit_parser.add_argument('config_file', type=str, nargs='+', help='Configuration YAML ' +
+                               'file(s) of the job.')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        EvaServer(args.workers, cache_size=args.cache_size).serve(args.socket, args.spool,
+                                                                  args.poll_interval)
+    else:
+        result = submit(args.socket, args.config_file)
+        print(json.dumps(result, indent=2))
+        if result['status'] != 'completed':
+            sys.exit(1)
+
+
+# --------------------------------------------------------------------------------------------------
@@ -67,6 +67,12 @@ class Histogram(ABC):
         if 'channel' in self.config['data']:
             channel = self.config['data'].get('channel')
 
+        # Without slicing the flattened and masked data can come straight from the collection
+        if 'slices' not in self.config['data']:
+            self.data = self.dataobj.get_valid_variable_data(var_cgv[0], var_cgv[1], var_cgv[2],
+                                                             channel)
+            return
+
         data = self.dataobj.get_variable_data(var_cgv[0], var_cgv[1], var_cgv[2], channel)
 
         # See if we need to slice data
@@ -31,6 +31,7 @@ class LinePlot(ABC):
                         "x": {"variable": "collection::group::variable"},
                         "y": {"variable": "collection::group::variable"},
                         "channel": "channel_name",
+                        "separate rows": False,
                         "plot_property": "property_value",
                         "plot_option": "option_value",
                         "schema": "path_to_schema_file.yaml"
@@ -95,6 +96,18 @@ class LinePlot(ABC):
         xdata = slice_var_from_str(self.config['x'], xdata, self.logger)
         ydata = slice_var_from_str(self.config['y'], ydata, self.logger)
 
+        # Two dimensional data (e.g. runs stacked along the Run dimension) can be drawn as one
+        # line per row. The rows are separated by NaN, which breaks the line between them.
+        if self.config.get('separate rows', False) and xdata.ndim == 2 and \
+           xdata.shape == ydata.shape:
+            valid = ~np.isnan(xdata) & ~np.isnan(ydata)
+            separator = np.array([np.nan])
+            self.xdata = np.concatenate([np.concatenate((xrow[valid_row], separator)) for
+                                         xrow, valid_row in zip(xdata, valid)])[:-1]
+            self.ydata = np.concatenate([np.concatenate((yrow[valid_row], separator)) for
+                                         yrow, valid_row in zip(ydata, valid)])[:-1]
+            return
+
         # line plot data should be flattened
         xdata = xdata.flatten()
         ydata = ydata.flatten()
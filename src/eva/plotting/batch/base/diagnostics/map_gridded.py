@@ -1,5 +1,7 @@
 from eva.eva_path import return_eva_path
 from eva.utilities.utils import get_schema, update_object, slice_var_from_str
+from eva.plotting.batch.base.plot_tools.grid_coarsening import auto_coarsening_factor, \
+    coarsen_grid
 
 from abc import ABC, abstractmethod
 
@@ -10,6 +12,12 @@ class MapGridded(ABC):
 
     """Base class for creating map gridded plots."""
 
+    # Whether the prepared grid can be reduced to the part covering a regional domain
+    cull_to_domain = True
+
+    # Whether the prepared grid can be coarsened before it is plotted
+    coarsen_to_pixels = True
+
     def __init__(self, config, logger, dataobj):
 
         """
@@ -28,6 +36,7 @@ class MapGridded(ABC):
                         "longitude": {"variable": "collection::group::variable"},
                         "latitude": {"variable": "collection::group::variable"},
                         "data": {"variable": "collection::group::variable"},
+                        "coarsen": {"factor": "auto", "statistic": "mean"},
                         "plot_property": "property_value",
                         "plot_option": "option_value",
                         "schema": "path_to_schema_file.yaml"
@@ -46,6 +55,12 @@ class MapGridded(ABC):
         self.datavar = []
         self.plotobj = None
 
+        # Map domain of the plot the layer belongs to, used to cull data outside of it
+        self.domain = None
+
+        # Width and height in pixels of the plot the layer belongs to, used to coarsen the grid
+        self.panel_pixels = None
+
 # --------------------------------------------------------------------------------------------------
 
     def data_prep(self):
@@ -67,6 +82,51 @@ class MapGridded(ABC):
                                                       datavar_cgv[2], None)
         self.datavar = slice_var_from_str(self.config['data'], self.datavar, self.logger)
 
+        # For regional domains only keep the sub grid covering the domain
+        if self.domain is not None and self.cull_to_domain and \
+           self.latvar.shape == self.lonvar.shape == self.datavar.shape:
+            index_key = (self.config['latitude']['variable'],
+                         self.config['latitude'].get('slices'),
+                         self.config['longitude']['variable'],
+                         self.config['longitude'].get('slices'))
+            index = self.dataobj.get_lat_lon_index(index_key, self.latvar, self.lonvar)
+            domain_slices = index.domain_slices(self.domain)
+            if domain_slices is not None:
+                self.lonvar = self.lonvar[domain_slices]
+                self.latvar = self.latvar[domain_slices]
+                self.datavar = self.datavar[domain_slices]
+
+        # Optionally coarsen grids that have more cells than there are pixels to show them
+        if self.config.get('coarsen', False) is not False and self.coarsen_to_pixels:
+            self.coarsen()
+
+# --------------------------------------------------------------------------------------------------
+
+    def coarsen(self):
+        """ Reduce blocks of grid cells to single cells as set by the coarsen option  """
+
+        coarsen = self.config['coarsen']
+        if not isinstance(coarsen, dict):
+            coarsen = {} if coarsen in [None, True] else {'factor': coarsen}
+        factor = coarsen.get('factor', 'auto')
+        statistic = coarsen.get('statistic', 'mean')
+
+        # The automatic factor keeps about one grid cell per pixel of the plot
+        if factor == 'auto':
+            if self.panel_pixels is None:
+                return
+            factor = auto_coarsening_factor(self.latvar, self.lonvar, self.datavar.size,
+                                            self.panel_pixels, self.domain)
+        elif not isinstance(factor, int) or factor < 1:
+            self.logger.abort(f'The coarsening factor must be \'auto\' or a positive integer, ' +
+                              f'not \'{factor}\'.')
+
+        if factor > 1:
+            self.logger.info(f'Coarsening the grid of {self.datavar_name} by a factor of ' +
+                             f'{factor} using the block {statistic}.')
+            self.latvar, self.lonvar, self.datavar = coarsen_grid(
+                self.logger, self.latvar, self.lonvar, self.datavar, factor, statistic)
+
 # --------------------------------------------------------------------------------------------------
 
     @abstractmethod
@@ -1,4 +1,7 @@
 from eva.eva_path import return_eva_path
+from eva.plotting.batch.base.plot_tools.point_aggregation import aggregate_points, \
+    aggregation_bins
+from eva.utilities.lat_lon_bucket_index import domain_bounds
 from eva.utilities.utils import get_schema, update_object, slice_var_from_str
 import numpy as np
 
@@ -30,6 +33,7 @@ class MapScatter(ABC):
                         "latitude": {"variable": "collection::group::variable"},
                         "data": {"variable": "collection::group::variable",
                                  "channel": "channel_name"},
+                        "aggregate": {"statistic": "mean"},
                         "plot_property": "property_value",
                         "plot_option": "option_value",
                         "schema": "path_to_schema_file.yaml"
@@ -46,6 +50,16 @@ class MapScatter(ABC):
         self.datavar = None
         self.plotobj = None
 
+        # Map domain of the plot the layer belongs to, used to cull data outside of it
+        self.domain = None
+
+        # Size in pixels of the panel the layer is plotted in, sets the default aggregation bins
+        self.panel_pixels = None
+
+        # Identifies the coordinates of the points so that figures plotting the same points can
+        # share their projection, None if the points are not a selection of the coordinates
+        self.coordinate_key = None
+
 # --------------------------------------------------------------------------------------------------
 
     def data_prep(self):
@@ -70,14 +84,42 @@ class MapScatter(ABC):
         datavar = self.dataobj.get_variable_data(datavar_cgv[0], datavar_cgv[1],
                                                  datavar_cgv[2], channel, level)
         datavar = slice_var_from_str(self.config['data'], datavar, self.logger)
-        self.lonvar = lonvar.flatten()
-        self.latvar = latvar.flatten()
+        # The data is copied since it can be modified below
+        self.lonvar = np.ravel(lonvar)
+        self.latvar = np.ravel(latvar)
         self.datavar = datavar.flatten()
 
+        index_key = (self.config['latitude']['variable'],
+                     self.config['latitude'].get('slices'),
+                     self.config['longitude']['variable'],
+                     self.config['longitude'].get('slices'))
+        self.coordinate_key = index_key + (self.domain,)
+
+        # For regional domains only keep the data inside the domain, which may be none of it
+        if self.domain is not None and self.datavar.size == self.latvar.size:
+            index = self.dataobj.get_lat_lon_index(index_key, self.latvar, self.lonvar)
+            inside = index.select_domain(self.domain)
+            if inside is not None:
+                self.lonvar = self.lonvar[inside]
+                self.latvar = self.latvar[inside]
+                self.datavar = self.datavar[inside]
+
         # If everything is nan plotting will fail so just plot some large values
         if np.isnan(self.datavar).all():
             self.datavar[np.isnan(self.datavar)] = 1.0e38
 
+        # Optionally reduce dense data to one point per bin of a raster covering the domain, by
+        # default one bin per pixel of the panel
+        elif 'aggregate' in self.config:
+            aggregate = self.config['aggregate'] or {}
+            extent = domain_bounds.get(self.domain, [-180.0, 180.0, -90.0, 90.0])
+            bins = aggregation_bins(aggregate, self.panel_pixels, [1440, 720])
+            lonvar = (self.lonvar + 180.0) % 360.0 - 180.0
+            self.coordinate_key = None
+            self.lonvar, self.latvar, self.datavar = \
+                aggregate_points(self.logger, lonvar, self.latvar, self.datavar,
+                                 aggregate.get('statistic', 'mean'), bins, extent)
+
 # --------------------------------------------------------------------------------------------------
 
     @abstractmethod
@@ -1,4 +1,6 @@
 from eva.eva_path import return_eva_path
+from eva.plotting.batch.base.plot_tools.point_aggregation import aggregate_points, \
+    aggregation_bins, linear_regression
 from eva.utilities.config import get
 from eva.utilities.utils import get_schema, update_object, slice_var_from_str
 import numpy as np
@@ -30,6 +32,7 @@ class Scatter(ABC):
                     config = {
                         "x": {"variable": "collection::group::variable"},
                         "y": {"variable": "collection::group::variable"},
+                        "aggregate": {},
                         "plot_property": "property_value",
                         "plot_option": "option_value",
                         "schema": "path_to_schema_file.yaml"
@@ -45,6 +48,12 @@ class Scatter(ABC):
         self.ydata = []
         self.plotobj = None
 
+        # Size in pixels of the panel the layer is plotted in, sets the default aggregation bins
+        self.panel_pixels = None
+
+        # Linear regression of all the points when they are aggregated
+        self.regression = None
+
 # --------------------------------------------------------------------------------------------------
 
     def data_prep(self):
@@ -92,6 +101,15 @@ class Scatter(ABC):
         self.xdata = xdata[mask]
         self.ydata = ydata[mask]
 
+        # Optionally keep a single point per bin of a raster spanning the data, by default one
+        # bin per pixel of the panel. The regression is of all the points, not of the bins.
+        if 'aggregate' in self.config:
+            aggregate = self.config['aggregate'] or {}
+            self.regression = linear_regression(self.xdata, self.ydata)
+            bins = aggregation_bins(aggregate, self.panel_pixels, [800, 800])
+            self.xdata, self.ydata, _ = aggregate_points(self.logger, self.xdata, self.ydata,
+                                                         bins=bins)
+
     @abstractmethod
     def configure_plot(self):
         """ Virtual method for configuring plot based on selected backend  """
@@ -12,7 +12,6 @@
 
 import math
 import numpy as np
-from scipy.stats import skew
 
 from eva.utilities.utils import replace_vars_dict
 
@@ -67,44 +66,30 @@ def vminvmaxcmap(logger, option_dict, plots_dict, data_collections):
     level = option_dict.get('level', None)
     datatype = option_dict.get('datatype', None)
 
-    # Get the data variable to use for determining cbar limits
+    # Get the statistics of the data variable to use for determining cbar limits
     varname = option_dict.get('data variable')
     varname_cgv = varname.split('::')
-    datavar = data_collections.get_variable_data(varname_cgv[0], varname_cgv[1],
-                                                 varname_cgv[2], channel, level, datatype)
+    datavar_stats = data_collections.get_variable_statistics(varname_cgv[0], varname_cgv[1],
+                                                             varname_cgv[2], channel, level,
+                                                             datatype)
 
-    # Reorder the data array
-    if datavar.size > 1:
-        datavar = np.sort(datavar)
-
-    # Decide how many values to throw out on each end of the dataset
-    n = datavar.size
-    n_throw_out = ((100-percentage_capture) * n / 100) / 2
-
-    # The value needs to be an integer
-    n_throw_out = np.floor(n_throw_out).astype(int)
-
-    # Create new array with only the data to consider
-    if n_throw_out == 0:
-        datavar_check = datavar
-    else:
-        datavar_check = datavar[n_throw_out:-n_throw_out]
+    # Range of the data once the extremes are trimmed so that the percentage is kept
+    trimmed_range = datavar_stats.trimmed_range(percentage_capture)
 
     # Find minimum and maximum values
     cmap = option_dict.get('sequential colormap', 'viridis')
 
     # If everything is nan plot some large min/max (plotting code should do the same)
-    if np.isnan(datavar_check).all():
+    if trimmed_range is None:
         vmax = 1.0e38
         vmin = 1.0e38
     else:
-        vmax = np.nanmax(datavar_check)
-        vmin = np.nanmin(datavar_check)
+        vmin, vmax = trimmed_range
 
     # If positive and negative values are present then a diverging colormap centered on zero should
     # be used.
     if vmin < 0.0 and vmax > 0.0:
-        vmax = np.nanmax(np.abs(datavar_check))
+        vmax = max(np.abs(vmin), np.abs(vmax))
         vmin = -vmax
         cmap = option_dict.get('diverging colormap', 'seismic')
 
@@ -162,14 +147,14 @@ def histogram_bins(logger, option_dict, plots_dict, data_collections):
     # Optionally the data might have a channel.
     channel = option_dict.get('channel', None)
 
-    # Get the data variable to use for determining cbar limits
+    # Get the statistics of the data variable to use for determining the bins
     varname = option_dict.get('data variable')
     varname_cgv = varname.split('::')
-    datavar = data_collections.get_variable_data(varname_cgv[0], varname_cgv[1],
-                                                 varname_cgv[2], channel)
+    datavar_stats = data_collections.get_variable_statistics(varname_cgv[0], varname_cgv[1],
+                                                             varname_cgv[2], channel)
 
     # Compute size of the array of data
-    n = np.count_nonzero(~np.isnan(datavar))
+    n = datavar_stats.count()
 
     # Check for zero data, set to 3 as a reasonable minimum
     if n == 0:
@@ -189,7 +174,7 @@ def histogram_bins(logger, option_dict, plots_dict, data_collections):
     elif rule == 'doane':
         if n < 3:
             logger.abort(f'Rule \'doane\' is not valid for data with fewer than 3 samples.')
-        g1 = skew(datavar, nan_policy='omit')
+        g1 = datavar_stats.skewness()
         sig_g1 = math.sqrt(6*(n-2)/((n+1)*(n+3)))
         nbins = 1 + math.log2(n) + math.log2(1 + abs(g1)/sig_g1)
     else:
@@ -14,14 +14,14 @@ from eva.eva_path import return_eva_path
 from eva.utilities.stats import stats_helper
 from eva.utilities.utils import get_schema, camelcase_to_underscore, parse_channel_list
 from eva.utilities.utils import replace_vars_dict
+from eva.utilities.registry import registered_object
 import copy
-import importlib as im
 import os
 
 # --------------------------------------------------------------------------------------------------
 
 
-def figure_driver(config, data_collections, timing, logger):
+def figure_driver(config, data_collections, timing, logger, figure_manifest=None):
     """
     Generates and saves multiple figures based on the provided configuration.
 
@@ -31,6 +31,8 @@ def figure_driver(config, data_collections, timing, logger):
         input data.
         timing (Timing): A timing instance to measure the execution time.
         logger (Logger): An instance of the logger for logging messages.
+        figure_manifest (FigureManifest): Manifest of the figures made previously. When provided
+        only the figures that are stale are made (optional).
 
     This function generates and saves multiple figures based on the provided configuration. It
     processes each graphic specified in the configuration and creates corresponding figures with
@@ -57,105 +59,190 @@ def figure_driver(config, data_collections, timing, logger):
             logger.abort("The hvplot backend is not available since \
                          hvplot is not in the environment.")
 
+    # Optionally draw each map background once and reuse it for every figure
+    # -----------------------------------------------------------------------
+    static_map_background = graphics_section.get('static_map_background', False)
+
+    if static_map_background and backend != 'Emcpy':
+        logger.info('static_map_background is only used by the Emcpy backend and will be ' +
+                    'ignored.')
+        static_map_background = False
+
     # Create handler
     # --------------
     handler_class_name = backend + 'FigureHandler'
     handler_module_name = camelcase_to_underscore(handler_class_name)
     handler_full_module = 'eva.plotting.batch.' + \
                           backend.lower() + '.plot_tools.' + handler_module_name
-    handler_class = getattr(im.import_module(handler_full_module), handler_class_name)
+    handler_class = registered_object('figure_handlers', handler_class_name, handler_full_module)
     handler = handler_class()
 
+    # Optionally encode and write figure images in the background while the next figure is made
+    # -----------------------------------------------------------------------------------------
+    figure_save_workers = graphics_section.get('figure_save_workers', 0)
+    handler.start_figure_writer(figure_save_workers)
+
     # Loop through specified graphics
     # -------------------
     timing.start('Graphics Loop')
-    for graphic in graphics:
-
-        # Parse configuration for this graphic
-        # -------------------
-        batch_conf = graphic.get("batch figure", {})  # batch configuration (default nothing)
-        figure_conf = graphic.get("figure")  # figure configuration
-        plots_conf = graphic.get("plots")  # list of plots/subplots
-        dynamic_options_conf = graphic.get("dynamic options", [])  # Dynamic overwrites
-
-        # update figure conf based on schema
-        # ----------------------------------
-        fig_schema = figure_conf.get('schema', os.path.join(return_eva_path(), 'plotting', 'batch',
-                                     backend.lower(), 'defaults', 'figure.yaml'))
-        figure_conf = get_schema(fig_schema, figure_conf, logger)
-
-        # pass configurations and make graphic(s)
-        # ---------------------------------------
-        if batch_conf:
-            # Get potential variables
-            variables = batch_conf.get('variables', [])
-
-            # Get list of channels and load step variables
-            channels_str_or_list = batch_conf.get('channels', [])
-            channels = parse_channel_list(channels_str_or_list, logger)
-
-            step_vars = channels if channels else ['none']
-            step_var_name = 'channel'
-            title_fill = ' Ch. '
-
-            # Get list of levels, load step variables
-            levels_str_or_list = batch_conf.get('levels', [])
-            levels = parse_channel_list(levels_str_or_list, logger)
-            if levels:
-                step_vars = levels
-                step_var_name = 'level'
-                title_fill = ' Lev. '
-
-            # Get list of datatypes and load step variables
-            datatypes = batch_conf.get('datatypes', [])
-            if datatypes:
-                step_vars = datatypes
-                step_var_name = 'datatype'
-                title_fill = ' Dtype. '
-
-            # Set some fake values to ensure the loops are entered
-            if not variables:
-                logger.abort("Batch Figure must provide variables, even if with channels")
-
-            # Loop over variables and channels
-            for variable in variables:
-                for step_var in step_vars:
-                    batch_conf_this = {}
-                    batch_conf_this['variable'] = variable
-
-                    # Version to be used in titles
-                    batch_conf_this['variable_title'] = variable.replace('_', ' ').title()
-
-                    step_var_str = str(step_var)
-                    if step_var_str != 'none':
-                        batch_conf_this[step_var_name] = step_var_str
-                        var_title = batch_conf_this['variable_title'] + title_fill + step_var_str
-                        batch_conf_this['variable_title'] = var_title
-
-                    # Replace templated variables in figure and plots config
-                    figure_conf_fill = copy.copy(figure_conf)
-                    figure_conf_fill = replace_vars_dict(figure_conf_fill, **batch_conf_this)
-                    plots_conf_fill = copy.copy(plots_conf)
-                    plots_conf_fill = replace_vars_dict(plots_conf_fill, **batch_conf_this)
-                    dynamic_options_conf_fill = copy.copy(dynamic_options_conf)
-                    dynamic_options_conf_fill = replace_vars_dict(dynamic_options_conf_fill,
-                                                                  **batch_conf_this)
+    try:
+        for graphic in graphics:
+
+            # Expand the graphic into the configurations of the figures it describes
+            # -------------------
+            channels, figure_configs = expand_graphic(graphic, backend, logger)
+
+            # The data for all channels is prepared at once, rather than once per channel, when the
+            # first figure that needs to be made is reached
+            batch_started = False
+            try:
+                for figure_conf, plots_conf, dynamic_options_conf in figure_configs:
+
+                    # Figures whose configuration and input data have not changed are not remade
+                    output_file = get_output_file(figure_conf)
+                    if figure_manifest is not None and not figure_manifest.is_stale(output_file):
+                        logger.info(f'Skipping up to date figure {output_file}')
+                        continue
+
+                    if channels and not batch_started:
+                        data_collections.begin_channel_batch(channels)
+                        batch_started = True
 
                     # Make plot
-                    make_figure(handler, figure_conf_fill, plots_conf_fill,
-                                dynamic_options_conf_fill, data_collections, logger)
+                    make_figure(handler, figure_conf, plots_conf, dynamic_options_conf,
+                                data_collections, logger, static_map_background)
 
-        else:
-            # make just one figure per configuration
-            make_figure(handler, figure_conf, plots_conf,
-                        dynamic_options_conf, data_collections, logger)
-    timing.stop('Graphics Loop')
+                    if figure_manifest is not None:
+                        figure_manifest.record(output_file)
+            finally:
+                if batch_started:
+                    data_collections.end_channel_batch()
+    finally:
+        timing.stop('Graphics Loop')
+
+        # All figures must be on disk before returning, including when making a figure failed
+        # ------------------------------------------------------------------------------------
+        timing.start('Figure Writer Finish')
+        errors = handler.finish_figure_writer()
+        timing.stop('Figure Writer Finish')
+
+        for output_file, exception in errors:
+            logger.info(f'Failed to save figure {output_file}: {exception}')
+
+    # Record the figures that were made so that they are not remade next time
+    # ------------------------------------------------------------------------
+    if figure_manifest is not None:
+        for output_file, _ in errors:
+            figure_manifest.forget(output_file)
+        figure_manifest.write()
+
+    if errors:
+        logger.abort(f'{len(errors)} figure(s) could not be saved.')
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def expand_graphic(graphic, backend, logger):
+    """
+    Expands a graphic from the configuration into the configurations of the figures it describes.
+
+    Args:
+        graphic (dict): A dictionary containing the configuration of the graphic.
+        backend (str): The plotting backend.
+        logger (Logger): An instance of the logger for logging messages.
+
+    Returns:
+        tuple: The channels of a batch figure (empty if there are none) and a list with the
+               figure, plots and dynamic options configurations of each figure.
+
+    Batch figures are expanded into one figure for each variable and channel, level or datatype
+    with the templated variables filled in. Other graphics describe a single figure.
+    """
+
+    # Parse configuration for this graphic
+    # -------------------
+    batch_conf = graphic.get("batch figure", {})  # batch configuration (default nothing)
+    figure_conf = graphic.get("figure")  # figure configuration
+    plots_conf = graphic.get("plots")  # list of plots/subplots
+    dynamic_options_conf = graphic.get("dynamic options", [])  # Dynamic overwrites
+
+    # update figure conf based on schema
+    # ----------------------------------
+    fig_schema = figure_conf.get('schema', os.path.join(return_eva_path(), 'plotting', 'batch',
+                                 backend.lower(), 'defaults', 'figure.yaml'))
+    figure_conf = get_schema(fig_schema, figure_conf, logger)
+
+    # just one figure per configuration
+    # ---------------------------------
+    if not batch_conf:
+        return [], [(figure_conf, plots_conf, dynamic_options_conf)]
+
+    # Get potential variables
+    variables = batch_conf.get('variables', [])
+
+    # Get list of channels and load step variables
+    channels_str_or_list = batch_conf.get('channels', [])
+    channels = parse_channel_list(channels_str_or_list, logger)
+
+    step_vars = channels if channels else ['none']
+    step_var_name = 'channel'
+    title_fill = ' Ch. '
+
+    # Get list of levels, load step variables
+    levels_str_or_list = batch_conf.get('levels', [])
+    levels = parse_channel_list(levels_str_or_list, logger)
+    if levels:
+        step_vars = levels
+        step_var_name = 'level'
+        title_fill = ' Lev. '
+
+    # Get list of datatypes and load step variables
+    datatypes = batch_conf.get('datatypes', [])
+    if datatypes:
+        step_vars = datatypes
+        step_var_name = 'datatype'
+        title_fill = ' Dtype. '
+
+    # Set some fake values to ensure the loops are entered
+    if not variables:
+        logger.abort("Batch Figure must provide variables, even if with channels")
+
+    # Loop over variables and channels
+    figure_configs = []
+    for variable in variables:
+        for step_var in step_vars:
+            batch_conf_this = {}
+            batch_conf_this['variable'] = variable
+
+            # Version to be used in titles
+            batch_conf_this['variable_title'] = variable.replace('_', ' ').title()
+
+            step_var_str = str(step_var)
+            if step_var_str != 'none':
+                batch_conf_this[step_var_name] = step_var_str
+                var_title = batch_conf_this['variable_title'] + title_fill + step_var_str
+                batch_conf_this['variable_title'] = var_title
+
+            # Replace templated variables in figure and plots config
+            figure_conf_fill = copy.copy(figure_conf)
+            figure_conf_fill = replace_vars_dict(figure_conf_fill, **batch_conf_this)
+            plots_conf_fill = copy.copy(plots_conf)
+            plots_conf_fill = replace_vars_dict(plots_conf_fill, **batch_conf_this)
+            dynamic_options_conf_fill = copy.copy(dynamic_options_conf)
+            dynamic_options_conf_fill = replace_vars_dict(dynamic_options_conf_fill,
+                                                          **batch_conf_this)
+
+            figure_configs.append((figure_conf_fill, plots_conf_fill, dynamic_options_conf_fill))
+
+    return channels, figure_configs
 
 
 # --------------------------------------------------------------------------------------------------
 
 
-def make_figure(handler, figure_conf, plots, dynamic_options, data_collections, logger):
+def make_figure(handler, figure_conf, plots, dynamic_options, data_collections, logger,
+                static_map_background=False):
     """
     Generates a figure based on the provided configuration and plots.
 
@@ -167,6 +254,8 @@ def make_figure(handler, figure_conf, plots, dynamic_options, data_collections,
         data_collections (DataCollections): An instance of the DataCollections class containing
         input data.
         logger (Logger): An instance of the logger for logging messages.
+        static_map_background (bool): If True the map features of map plots are rendered once per
+                                      projection, domain, map size and resolution and reused.
 
     This function generates a figure based on the provided configuration and plot settings. It
     processes the specified plots, applies dynamic options, and saves the generated figure.
@@ -176,8 +265,8 @@ def make_figure(handler, figure_conf, plots, dynamic_options, data_collections,
     # -----------------------------------------------------
     for dynamic_option in dynamic_options:
         mod_name = "eva.plotting.batch.base.plot_tools.dynamic_config"
-        dynamic_option_module = im.import_module(mod_name)
-        dynamic_option_method = getattr(dynamic_option_module, dynamic_option['type'])
+        dynamic_option_method = registered_object('dynamic_options', dynamic_option['type'],
+                                                  mod_name)
         plots = dynamic_option_method(logger, dynamic_option, plots, data_collections)
 
     # Grab some figure configuration
@@ -186,19 +275,18 @@ def make_figure(handler, figure_conf, plots, dynamic_options, data_collections,
     file_type = figure_conf.get("figure file type", "png")
     output_file = get_output_file(figure_conf)
 
+    figsize = tuple(figure_conf['figure size'])
+
+    # Size in pixels of each plot in the saved figure, figure options that eva does not use itself
+    # are passed on when saving
+    dpi = handler.figure_dpi(figure_conf)
+    panel_pixels = (figsize[0] * dpi / figure_layout[1], figsize[1] * dpi / figure_layout[0])
+
     # Set up layers and plots
     plot_list = []
+    plot_layers = []
+    map_backgrounds = []
     for plot in plots:
-        layer_list = []
-        for layer in plot.get("layers"):
-
-            eva_class_name = handler.BACKEND_NAME + layer.get("type")
-            eva_module_name = camelcase_to_underscore(eva_class_name)
-            full_module = handler.MODULE_NAME + eva_module_name
-            layer_class = getattr(im.import_module(full_module), eva_class_name)
-            layer = layer_class(layer, logger, data_collections)
-            layer.data_prep()
-            layer_list.append(layer.configure_plot())
 
         # get mapping dictionary
         proj = None
@@ -209,11 +297,44 @@ def make_figure(handler, figure_conf, plots, dynamic_options, data_collections,
             proj = mapoptions['projection']
             domain = mapoptions['domain']
 
+        layer_list = []
+        eva_layers = []
+        for layer in plot.get("layers"):
+
+            eva_class_name = handler.BACKEND_NAME + layer.get("type")
+            eva_module_name = camelcase_to_underscore(eva_class_name)
+            full_module = handler.MODULE_NAME + eva_module_name
+            layer_class = registered_object('layers', eva_class_name, full_module)
+            layer = layer_class(layer, logger, data_collections)
+            # Map layers only need the data inside the domain of the plot
+            if hasattr(layer, 'domain'):
+                layer.domain = domain
+            # Gridded and aggregated layers need at most about one cell or point per pixel
+            if hasattr(layer, 'panel_pixels'):
+                layer.panel_pixels = panel_pixels
+            layer.data_prep()
+            layer_list.append(layer.configure_plot())
+            eva_layers.append(layer)
+
+        # Map features can come from a background that is shared between figures
+        skip_keys = ['layers', 'mapping', 'statistics']
+        if proj is not None:
+            background = None
+            if static_map_background and 'add_map_features' in plot:
+                map_features = plot['add_map_features']
+                if isinstance(map_features, dict):
+                    map_features = map_features.get('feature_list', ['coastline'])
+                elif not isinstance(map_features, list):
+                    map_features = ['coastline']
+                background = (proj, domain, map_features)
+                skip_keys.append('add_map_features')
+            map_backgrounds.append(background)
+
         # create a subplot based on specified layers
         plotobj = handler.create_plot(layer_list, proj, domain)
         # make changes to subplot based on YAML configuration
         for key, value in plot.items():
-            if key not in ['layers', 'mapping', 'statistics']:
+            if key not in skip_keys:
                 if isinstance(value, dict):
                     getattr(plotobj, key)(**value)
                 elif value is None:
@@ -225,15 +346,19 @@ def make_figure(handler, figure_conf, plots, dynamic_options, data_collections,
                 stats_helper(logger, plotobj, data_collections, value)
 
         plot_list.append(plotobj)
+        plot_layers.append(eva_layers)
 
     # create figure
     nrows = figure_conf['layout'][0]
     ncols = figure_conf['layout'][1]
-    figsize = tuple(figure_conf['figure size'])
     fig = handler.create_figure(nrows, ncols, figsize)
     fig.plot_list = plot_list
     fig.create_figure()
 
+    # Map scatter layers plotting the same coordinates share a single projection of them
+    if map_backgrounds:
+        handler.use_projected_coordinates(fig, plot_layers)
+
     if 'title' in figure_conf:
         fig.add_suptitle(figure_conf['title'])
     if 'tight layout' in figure_conf:
@@ -247,8 +372,12 @@ def make_figure(handler, figure_conf, plots, dynamic_options, data_collections,
         fig.plot_logo(**figure_conf['plot logo'])
         figure_conf.pop('plot logo')
 
+    # Backgrounds are rendered for the final size of each map in the saved figure
+    if any(background is not None for background in map_backgrounds):
+        handler.add_map_backgrounds(fig, map_backgrounds, dpi)
+
     saveargs = get_saveargs(figure_conf)
-    fig.save_figure(output_file, **saveargs)
+    handler.save_figure(fig, output_file, saveargs)
 
     fig.close_figure()
 
@@ -0,0 +1,387 @@
+# (C) Copyright 2021-2023 NOAA/NWS/EMC
+#
+# (C) Copyright 2021-2023 United States Government as represented by the Administrator of the
+# National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+import hashlib
+from importlib.metadata import version, PackageNotFoundError
+import json
+import os
+import re
+
+from eva.plotting.batch.base.plot_tools.figure_driver import expand_graphic, get_output_file
+from eva.utilities.utils import config_strings, file_fingerprints
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+# Name of the manifest file written in each directory that figures are saved to
+manifest_name = '.eva_figure_manifest.json'
+
+# Collection part of a collection::group::variable reference, names cannot contain operators
+collection_reference = re.compile(r'([\w.]+)::[\w.]+::')
+
+# Option of each transform (with spaces replaced by underscores) that names what it writes, either
+# a collection::group::variable or just a collection
+transform_outputs = {
+    'accept_where': 'new name',
+    'arithmetic': 'new name',
+    'channel_stats': 'variable_name',
+    'latlon_match': 'new_collection_name',
+    'select_time': 'new name',
+}
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def eva_version():
+
+    """
+    Return the version of the installed eva package.
+
+    Returns:
+        str: The version of eva or 'unknown' if it is not installed as a package.
+    """
+
+    try:
+        return version('eva')
+    except PackageNotFoundError:
+        return 'unknown'
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def config_hash(config):
+
+    """
+    Return a hash of a configuration.
+
+    Args:
+        config (dict): The configuration.
+
+    Returns:
+        str: The hash of the configuration.
+    """
+
+    config_string = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(config_string.encode()).hexdigest()
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+class FigureManifest:
+
+    """
+    Record of the inputs each figure was made from, used to remake only the figures that are stale.
+
+    A figure is keyed by a hash of its expanded configuration, the configuration and input files
+    of the collections it references (including through transforms) and the eva version. It is
+    stale if the figure file does not exist or its key differs from the key in the manifest that
+    is kept next to it.
+    """
+
+    def __init__(self, eva_dict, logger):
+
+        """
+        Initialize the FigureManifest by computing the key of every figure in the configuration.
+
+        Args:
+            eva_dict (dict): The configuration dictionary for the EVA process.
+            logger (Logger): An instance of the logger for logging messages.
+        """
+
+        self.logger = logger
+
+        datasets = eva_dict.get('datasets', [])
+        transforms = eva_dict.get('transforms', [])
+        graphics_section = eva_dict.get('graphics')
+
+        # Collections that each transform writes to, None if that cannot be worked out
+        self.transform_collections = [self.written_collections(t) for t in transforms]
+
+        # Collections that are read or created by transforms
+        self.collections = set(dataset['name'] for dataset in datasets)
+        for written in self.transform_collections:
+            self.collections |= written or set()
+
+        # Transforms that could write to any collection, which every figure depends on
+        self.unknown_transforms = [t for t, written in zip(transforms, self.transform_collections)
+                                   if written is None]
+
+        # Fingerprint of the inputs to each collection
+        collection_fingerprints = {}
+        for collection in self.collections:
+            collection_fingerprint = {}
+            collection_fingerprint['datasets'] = [
+                [dataset, file_fingerprints(dataset)] for dataset in datasets
+                if dataset['name'] == collection]
+            collection_fingerprint['transforms'] = [
+                t for t, written in zip(transforms, self.transform_collections)
+                if written is not None and collection in written]
+            collection_fingerprints[collection] = collection_fingerprint
+
+        # Collections that each collection is computed from
+        self.collection_dependencies = {}
+        for collection in self.collections:
+            dependencies = set()
+            for transform, written in zip(transforms, self.transform_collections):
+                if written is not None and collection in written:
+                    dependencies |= self.referenced_collections(transform)
+            dependencies.discard(collection)
+            self.collection_dependencies[collection] = dependencies
+
+        # Graphics options other than the figures affect every figure
+        graphics_options = {key: value for key, value in graphics_section.items()
+                            if key != 'figure_list'}
+        backend = graphics_section.get('plotting_backend')
+
+        # Key and needed collections of every figure
+        self.figure_keys = {}
+        self.figure_collections = {}
+        for graphic in graphics_section.get('figure_list'):
+            _, figure_configs = expand_graphic(graphic, backend, logger)
+            for figure_conf, plots_conf, dynamic_options_conf in figure_configs:
+                output_file = get_output_file(figure_conf)
+                figure_config = [figure_conf, plots_conf, dynamic_options_conf]
+                needed = self.needed_collections([figure_config, self.unknown_transforms])
+
+                figure_inputs = {}
+                figure_inputs['config'] = figure_config
+                figure_inputs['graphics'] = graphics_options
+                figure_inputs['data'] = {c: collection_fingerprints[c] for c in sorted(needed)}
+                figure_inputs['unknown transforms'] = self.unknown_transforms
+                figure_inputs['eva version'] = eva_version()
+
+                self.figure_keys[output_file] = config_hash(figure_inputs)
+                self.figure_collections[output_file] = needed
+
+        # Keys of the figures made previously
+        self.previous_keys = {}
+        for output_dir in set(os.path.dirname(f) for f in self.figure_keys):
+            self.previous_keys[output_dir] = self.read_manifest(output_dir)
+
+        # Figures that have to be made
+        self.stale = set()
+        for output_file, key in self.figure_keys.items():
+            output_dir, output_name = os.path.split(output_file)
+            if not os.path.isfile(output_file) or \
+               self.previous_keys[output_dir].get(output_name) != key:
+                self.stale.add(output_file)
+
+        self.made = set()
+
+        logger.info(f'{len(self.stale)} of {len(self.figure_keys)} figures are stale and will ' +
+                    'be made.')
+
+    # ----------------------------------------------------------------------------------------------
+
+    def written_collections(self, transform):
+
+        """
+        Return the names of the collections a transform writes to.
+
+        Args:
+            transform (dict): The configuration of the transform.
+
+        Returns:
+            set: Names of the collections or None if the transform is not known, in which case it
+                 has to be assumed that it can write to any collection.
+        """
+
+        option = transform_outputs.get(str(transform.get('transform')).replace(' ', '_'))
+        if option is None or not isinstance(transform.get(option), str):
+            return None
+
+        # The collection might be a placeholder for each collection of the for loop
+        for_collections = transform.get('for', {}).get('collection', ['none'])
+
+        written = set()
+        for for_collection in for_collections:
+            output = transform[option].replace('${collection}', for_collection)
+            written.add(output.split('::')[0])
+        return written
+
+    # ----------------------------------------------------------------------------------------------
+
+    def referenced_collections(self, config):
+
+        """
+        Return the collections referenced directly in a configuration, either as part of a
+        collection::group::variable or by their name alone.
+
+        Args:
+            config (dict or list): The configuration.
+
+        Returns:
+            set: Names of the collections.
+        """
+
+        referenced = set()
+        for string in config_strings(config):
+            referenced |= set(collection_reference.findall(string))
+            referenced.add(string)
+        return referenced & self.collections
+
+    # ----------------------------------------------------------------------------------------------
+
+    def needed_collections(self, config):
+
+        """
+        Return the collections needed to make a figure, including those used by transforms.
+
+        Args:
+            config (dict or list): The configuration of the figure.
+
+        Returns:
+            set: Names of the collections.
+        """
+
+        needed = set()
+        to_visit = list(self.referenced_collections(config))
+        while to_visit:
+            collection = to_visit.pop()
+            if collection not in needed:
+                needed.add(collection)
+                to_visit.extend(self.collection_dependencies[collection])
+        return needed
+
+    # ----------------------------------------------------------------------------------------------
+
+    def read_manifest(self, output_dir):
+
+        """
+        Read the manifest of a directory of figures.
+
+        Args:
+            output_dir (str): The directory.
+
+        Returns:
+            dict: The key of each figure in the directory (empty if there is no valid manifest).
+        """
+
+        manifest_file = os.path.join(output_dir, manifest_name)
+        if not os.path.isfile(manifest_file):
+            return {}
+
+        try:
+            with open(manifest_file, 'r') as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            self.logger.info(f'Ignoring unreadable figure manifest {manifest_file}')
+            return {}
+
+    # ----------------------------------------------------------------------------------------------
+
+    def restrict_config(self, eva_dict):
+
+        """
+        Return the configuration with only the datasets and transforms the stale figures need.
+
+        Args:
+            eva_dict (dict): The configuration dictionary for the EVA process.
+
+        Returns:
+            dict: A copy of the configuration with the unneeded datasets and transforms removed.
+        """
+
+        needed = set()
+        for output_file in self.stale:
+            needed |= self.figure_collections[output_file]
+
+        restricted = dict(eva_dict)
+        restricted['datasets'] = [d for d in eva_dict.get('datasets', []) if d['name'] in needed]
+        # Transforms that could write to any collection are always kept
+        transforms = [t for t, written in zip(eva_dict.get('transforms', []),
+                                              self.transform_collections)
+                      if written is None or written & needed]
+        if transforms:
+            restricted['transforms'] = transforms
+        else:
+            restricted.pop('transforms', None)
+
+        return restricted
+
+    # ----------------------------------------------------------------------------------------------
+
+    def is_stale(self, output_file):
+
+        """
+        Return whether a figure has to be made.
+
+        Args:
+            output_file (str): The file the figure is saved to.
+
+        Returns:
+            bool: True unless the figure is up to date.
+        """
+
+        return output_file not in self.figure_keys or output_file in self.stale
+
+    # ----------------------------------------------------------------------------------------------
+
+    def record(self, output_file):
+
+        """
+        Record that a figure has been made.
+
+        Args:
+            output_file (str): The file the figure is saved to.
+        """
+
+        if output_file in self.figure_keys:
+            self.made.add(output_file)
+
+    # ----------------------------------------------------------------------------------------------
+
+    def forget(self, output_file):
+
+        """
+        Record that a figure could not be saved so it remains stale.
+
+        Args:
+            output_file (str): The file the figure is saved to.
+        """
+
+        self.made.discard(output_file)
+
+    # ----------------------------------------------------------------------------------------------
+
+    def write(self):
+
+        """
+        Write the keys of the figures that were made to the manifests next to them.
+        """
+
+        made_by_dir = {}
+        for output_file in self.made:
+            output_dir, output_name = os.path.split(output_file)
+            made_by_dir.setdefault(output_dir, {})[output_name] = self.figure_keys[output_file]
+
+        for output_dir, made_keys in made_by_dir.items():
+            manifest = dict(self.previous_keys.get(output_dir, {}))
+            manifest.update(made_keys)
+
+            manifest_file = os.path.join(output_dir, manifest_name)
+            manifest_tmp = manifest_file + '.tmp'
+            with open(manifest_tmp, 'w') as fh:
+                json.dump(manifest, fh, indent=2, sort_keys=True)
+            os.replace(manifest_tmp, manifest_file)
+
+            self.previous_keys[output_dir] = manifest
+            self.stale -= set(os.path.join(output_dir, name) for name in made_keys)
+
+        self.made = set()
+
+
+# --------------------------------------------------------------------------------------------------
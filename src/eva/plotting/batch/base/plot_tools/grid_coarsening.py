@@ -0,0 +1,192 @@
+# (C) Copyright 2021-2023 NOAA/NWS/EMC
+#
+# (C) Copyright 2021-2023 United States Government as represented by the Administrator of the
+# National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+import math
+import numpy as np
+
+from eva.utilities.lat_lon_bucket_index import domain_bounds
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+# Statistics that can be used to reduce the cells in each block
+valid_statistics = ['mean', 'min', 'max']
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def auto_coarsening_factor(latitude, longitude, ncells, panel_pixels, domain=None):
+
+    """
+    Return the largest coarsening factor that keeps at least one grid cell per pixel.
+
+    The number of pixels the grid covers is estimated from the latitude/longitude box of the grid
+    relative to the box of the map domain.
+
+    Args:
+        latitude (ndarray): Latitude of the grid.
+        longitude (ndarray): Longitude of the grid.
+        ncells (int): Number of cells in the grid.
+        panel_pixels (tuple): Width and height in pixels of the panel the grid is plotted in.
+        domain (str): Name of the map domain of the panel.
+
+    Returns:
+        int: The coarsening factor, 1 if the grid should not be coarsened.
+    """
+
+    lon_min, lon_max, lat_min, lat_max = domain_bounds.get(domain, [-180.0, 180.0, -90.0, 90.0])
+    view_area = (lon_max - lon_min) * (lat_max - lat_min)
+
+    if not (np.isfinite(latitude).any() and np.isfinite(longitude).any()):
+        return 1
+    grid_area = (np.nanmax(longitude) - np.nanmin(longitude)) * \
+        (np.nanmax(latitude) - np.nanmin(latitude))
+
+    # The grid covers at least a few pixels
+    pixels = panel_pixels[0] * panel_pixels[1] * min(grid_area / view_area, 1.0)
+    pixels = max(pixels, 1.0)
+
+    return max(int(math.sqrt(ncells / pixels)), 1)
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def block_reduce(array, factor, statistic='mean', ndim=2):
+
+    """
+    Reduce blocks of factor x factor cells along the first axes of an array.
+
+    Blocks at the end of an axis that is not a multiple of the factor are reduced over the cells
+    they contain. NaNs are ignored and blocks of only NaNs are NaN.
+
+    Args:
+        array (ndarray): The array to reduce.
+        factor (int): Number of cells along each axis in a block.
+        statistic (str): How to reduce the cells in a block: mean, min or max.
+        ndim (int): Number of leading axes to reduce (1 or 2), other axes are kept.
+
+    Returns:
+        ndarray: The reduced array.
+    """
+
+    dtype = array.dtype if np.issubdtype(array.dtype, np.floating) else np.float64
+
+    # Pad the reduced axes with NaN to a multiple of the factor
+    shape = array.shape
+    blocks = [-(-size // factor) for size in shape[:ndim]]
+    pad = [(0, nblocks * factor - size) for nblocks, size in zip(blocks, shape[:ndim])]
+    pad += [(0, 0)] * (array.ndim - ndim)
+    array = np.pad(array.astype(dtype, copy=False), pad, constant_values=np.nan)
+
+    # Reshape each reduced axis into blocks and cells within a block
+    block_shape = []
+    for nblocks in blocks:
+        block_shape += [nblocks, factor]
+    array = array.reshape(tuple(block_shape) + shape[ndim:])
+    cell_axes = tuple(range(1, 2*ndim, 2))
+
+    if statistic == 'min':
+        return np.fmin.reduce(array, axis=cell_axes)
+    if statistic == 'max':
+        return np.fmax.reduce(array, axis=cell_axes)
+
+    valid = ~np.isnan(array)
+    count = valid.sum(axis=cell_axes)
+    total = np.where(valid, array, 0).sum(axis=cell_axes, dtype=dtype)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (total / count).astype(dtype, copy=False)
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def block_reduce_longitude(longitude, factor, ndim=2):
+
+    """
+    Average blocks of longitudes without being affected by the date line.
+
+    Args:
+        longitude (ndarray): The longitudes to reduce.
+        factor (int): Number of cells along each axis in a block.
+        ndim (int): Number of leading axes to reduce (1 or 2), other axes are kept.
+
+    Returns:
+        ndarray: The mean longitude of each block, in the same range as the input.
+    """
+
+    # Longitudes relative to the first cell of each block
+    index = tuple(slice(None, None, factor) for _ in range(ndim))
+    reference = longitude[index]
+    for axis in range(ndim):
+        reference = np.repeat(reference, factor, axis=axis)
+    reference = reference[tuple(slice(0, size) for size in longitude.shape[:ndim])]
+    relative = (longitude - reference + 180.0) % 360.0 - 180.0
+
+    mean = reference[index] + block_reduce(relative, factor, 'mean', ndim)
+
+    if np.nanmin(longitude) >= 0.0:
+        return mean % 360.0
+    return (mean + 180.0) % 360.0 - 180.0
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def coarsen_grid(logger, latitude, longitude, data, factor, statistic='mean'):
+
+    """
+    Coarsen a grid by reducing blocks of factor x factor cells to a single cell.
+
+    The grid is coarsened along the first two axes of the data, any further axes (e.g. the tiles
+    of a cubed-sphere grid) are kept. The latitude and longitude are either the same shape as the
+    data or one dimensional along the first and second axes of the data respectively. The
+    coordinates of a coarse cell are the mean of the coordinates of the cells it contains.
+
+    Args:
+        logger (Logger): An instance of the logger for logging messages.
+        latitude (ndarray): Latitude of the grid.
+        longitude (ndarray): Longitude of the grid.
+        data (ndarray): The gridded data.
+        factor (int): Number of cells along each axis in a block.
+        statistic (str): How to reduce the data in each block: mean, min or max.
+
+    Returns:
+        tuple: The coarsened latitude, longitude and data. The inputs are returned unchanged if
+               the grid cannot be coarsened.
+    """
+
+    if statistic not in valid_statistics:
+        logger.abort(f'Coarsening statistic \'{statistic}\' is not valid. Valid options are ' +
+                     f'{valid_statistics}.')
+
+    if factor <= 1 or data.ndim < 2:
+        return latitude, longitude, data
+
+    if latitude.shape == longitude.shape == data.shape:
+        latitude = block_reduce(latitude, factor)
+        longitude = block_reduce_longitude(longitude, factor)
+    elif latitude.ndim == longitude.ndim == 1 and \
+            (latitude.size, longitude.size) == data.shape[:2]:
+        latitude = block_reduce(latitude, factor, ndim=1)
+        longitude = block_reduce_longitude(longitude, factor, ndim=1)
+    else:
+        logger.info(f'Grid with latitude {latitude.shape}, longitude {longitude.shape} and data ' +
+                    f'{data.shape} cannot be coarsened, it will be plotted at full resolution.')
+        return latitude, longitude, data
+
+    return latitude, longitude, block_reduce(data, factor, statistic)
+
+
+# --------------------------------------------------------------------------------------------------
@@ -0,0 +1,175 @@
+# (C) Copyright 2021-2023 NOAA/NWS/EMC
+#
+# (C) Copyright 2021-2023 United States Government as represented by the Administrator of the
+# National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+import numpy as np
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+# Statistics that can be computed for the points falling in each bin
+valid_statistics = ['mean', 'count', 'max', 'min']
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def aggregate_points(logger, x, y, values=None, statistic='mean', bins=(1440, 720), extent=None):
+
+    """
+    Bin points onto a regular raster and reduce the points in each bin to a single value.
+
+    Only bins that contain at least one point are returned, so the number of points handed to the
+    plotting backend is bounded by the raster size regardless of how many points are input.
+
+    Args:
+        logger (Logger): An instance of the logger for logging messages.
+        x (ndarray): The x coordinates (e.g. longitude) of the points.
+        y (ndarray): The y coordinates (e.g. latitude) of the points.
+        values (ndarray): The values at the points. Not needed for the 'count' statistic.
+        statistic (str): How to reduce the points in each bin: mean, count, max or min.
+        bins (list): Number of bins in the x and y directions.
+        extent (list): The [xmin, xmax, ymin, ymax] covered by the raster. Defaults to the range
+                       of the points.
+
+    Returns:
+        tuple: The x and y coordinates of the centers of the occupied bins and the value of the
+               statistic in those bins (None if no values were provided and statistic is not
+               'count').
+    """
+
+    if statistic not in valid_statistics:
+        logger.abort(f'Aggregation statistic \'{statistic}\' is not valid. Valid options are ' +
+                     f'{valid_statistics}.')
+    if values is None and statistic != 'count':
+        statistic = None
+
+    nx, ny = int(bins[0]), int(bins[1])
+
+    # Only points with valid coordinates and values are binned
+    valid = np.isfinite(x) & np.isfinite(y)
+    if values is not None:
+        valid &= np.isfinite(values)
+        values = values[valid]
+    x = x[valid]
+    y = y[valid]
+
+    if extent is None:
+        if x.size == 0:
+            return x, y, values
+        extent = [x.min(), x.max(), y.min(), y.max()]
+    x0, x1, y0, y1 = [float(e) for e in extent]
+
+    # Guard against a zero width raster when all the points are the same
+    if x1 <= x0:
+        x0, x1 = x0 - 0.5, x0 + 0.5
+    if y1 <= y0:
+        y0, y1 = y0 - 0.5, y0 + 0.5
+    dx = (x1 - x0) / nx
+    dy = (y1 - y0) / ny
+
+    # Index of the bin that each point falls in
+    ix = np.clip(((x - x0) / dx).astype(np.int64), 0, nx - 1)
+    iy = np.clip(((y - y0) / dy).astype(np.int64), 0, ny - 1)
+    cell = iy * nx + ix
+
+    count = np.bincount(cell, minlength=nx*ny)
+    occupied = np.flatnonzero(count)
+
+    # Reduce the values in each occupied bin
+    if statistic == 'count':
+        aggregated = count[occupied].astype(np.float32)
+    elif statistic == 'mean':
+        total = np.bincount(cell, weights=values, minlength=nx*ny)
+        aggregated = total[occupied] / count[occupied]
+    elif statistic == 'max':
+        extreme = np.full(nx*ny, -np.inf)
+        np.maximum.at(extreme, cell, values)
+        aggregated = extreme[occupied]
+    elif statistic == 'min':
+        extreme = np.full(nx*ny, np.inf)
+        np.minimum.at(extreme, cell, values)
+        aggregated = extreme[occupied]
+    else:
+        aggregated = None
+
+    if aggregated is not None and values is not None:
+        aggregated = aggregated.astype(values.dtype, copy=False)
+
+    # Centers of the occupied bins
+    x_center = x0 + (occupied % nx + 0.5) * dx
+    y_center = y0 + (occupied // nx + 0.5) * dy
+
+    return x_center, y_center, aggregated
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def aggregation_bins(aggregate, panel_pixels, default_bins):
+
+    """
+    Return the number of bins of the raster points are aggregated onto.
+
+    Args:
+        aggregate (dict): The aggregate section of a layer, 'bins' is used if given.
+        panel_pixels (tuple): Width and height in pixels of the panel the layer is plotted in,
+                              giving one bin per pixel. Can be None if not known.
+        default_bins (list): Number of bins used if neither of the above is available.
+
+    Returns:
+        list: Number of bins in the x and y directions.
+    """
+
+    if aggregate.get('bins') is not None:
+        return aggregate['bins']
+    if panel_pixels is not None:
+        return [max(int(round(pixels)), 1) for pixels in panel_pixels]
+    return default_bins
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def linear_regression(x, y):
+
+    """
+    Least squares fit of a straight line to points.
+
+    Args:
+        x (ndarray): The x coordinates of the points.
+        y (ndarray): The y coordinates of the points.
+
+    Returns:
+        dict: The slope, intercept and r^2 of the fit, or None if it cannot be computed.
+    """
+
+    if x.size < 2:
+        return None
+
+    x = x.astype(np.float64, copy=False)
+    y = y.astype(np.float64, copy=False)
+    dx = x - x.mean()
+    dy = y - y.mean()
+    sxx = np.dot(dx, dx)
+    syy = np.dot(dy, dy)
+    if sxx == 0.0:
+        return None
+    sxy = np.dot(dx, dy)
+
+    slope = sxy / sxx
+    return {'slope': slope,
+            'intercept': y.mean() - slope * x.mean(),
+            'r_squared': sxy * sxy / (sxx * syy) if syy > 0.0 else 1.0}
+
+
+# --------------------------------------------------------------------------------------------------
@@ -40,7 +40,7 @@ class EmcpyLinePlot(LinePlot):
         layer_schema = self.config.get('schema', os.path.join(return_eva_path(), 'plotting',
                                        'batch', 'emcpy', 'defaults', 'line_plot.yaml'))
         new_config = get_schema(layer_schema, self.config, self.logger)
-        delvars = ['x', 'y', 'type', 'schema', 'channel', 'level', 'datatype']
+        delvars = ['x', 'y', 'type', 'schema', 'channel', 'level', 'datatype', 'separate rows']
         for d in delvars:
             new_config.pop(d, None)
         self.plotobj = update_object(self.plotobj, new_config, self.logger)
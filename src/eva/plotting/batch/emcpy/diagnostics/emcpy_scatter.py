@@ -36,11 +36,20 @@ class EmcpyScatter(Scatter):
         layer_schema = self.config.get('schema', os.path.join(return_eva_path(), 'plotting',
                                        'batch', 'emcpy', 'defaults', 'scatter.yaml'))
         new_config = get_schema(layer_schema, self.config, self.logger)
-        delvars = ['x', 'y', 'type', 'schema']
+        delvars = ['x', 'y', 'type', 'schema', 'aggregate']
         for d in delvars:
             new_config.pop(d, None)
         self.plotobj = update_object(self.plotobj, new_config, self.logger)
 
+        # emcpy would fit the regression line to the aggregated points, so the line is not drawn
+        # and the regression of all the points is given in the label instead
+        if 'aggregate' in self.config:
+            self.plotobj.do_linear_regression = False
+            if self.regression is not None:
+                self.plotobj.label = f'{self.plotobj.label}, ' + \
+                    f'y={self.regression["slope"]:.3f}x+{self.regression["intercept"]:.3f}, ' + \
+                    f'r^2: {self.regression["r_squared"]:.3f}'
+
         return self.plotobj
 
 # --------------------------------------------------------------------------------------------------
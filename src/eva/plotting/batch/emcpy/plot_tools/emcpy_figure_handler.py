@@ -1,5 +1,10 @@
 from emcpy.plots.create_plots import CreatePlot, CreateFigure
 from eva.eva_path import return_eva_path
+from eva.plotting.batch.emcpy.plot_tools.figure_writer import FigureWriter
+from eva.plotting.batch.emcpy.plot_tools.projection_cache import ProjectionCache
+import matplotlib as mpl
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
 import os
 
 
@@ -10,8 +15,206 @@ class EmcpyFigureHandler():
         self.BACKEND_NAME = "Emcpy"
         self.MODULE_NAME = "eva.plotting.batch.emcpy.diagnostics."
 
+        # Rendered map backgrounds keyed by projection, domain, features and figure size
+        self.map_backgrounds = {}
+
+        # Projected coordinates shared by the map scatter layers of all figures
+        self.projection_cache = ProjectionCache()
+
+        # Background writer for figure images (figures are saved synchronously without one)
+        self.figure_writer = None
+
     def create_plot(self, layer_list, proj, domain):
         return CreatePlot(plot_layers=layer_list, projection=proj, domain=domain)
 
     def create_figure(self, nrows, ncols, figsize):
         return CreateFigure(nrows=nrows, ncols=ncols, figsize=figsize)
+
+    def figure_dpi(self, saveargs):
+
+        """
+        Return the resolution that a figure will be saved at.
+
+        Args:
+            saveargs (dict): Arguments the figure will be saved with, which are passed on to
+                             savefig and so may include a dpi.
+
+        Returns:
+            float: The number of pixels per inch of the saved figure.
+        """
+
+        dpi = saveargs.get('dpi', mpl.rcParams['savefig.dpi'])
+        if dpi == 'figure':
+            dpi = mpl.rcParams['figure.dpi']
+        return float(dpi)
+
+    def get_map_background(self, proj, domain, map_features, pixel_size, dpi):
+
+        """
+        Return the map background for a projection and domain, rendering it on first use.
+
+        The background (projection outline, coastlines and other map features) is drawn once into
+        an otherwise empty, transparent figure of the size of the map axes it is for, at the
+        resolution the figure is saved at, and the pixels covered by the map are kept along with
+        their extent in projection coordinates.
+
+        Args:
+            proj (str): Name of the map projection.
+            domain (str): Name of the map domain.
+            map_features (list): Map features to draw, as passed to add_map_features.
+            pixel_size (tuple): Width and height in pixels of the map axes in the saved figure.
+            dpi (float): Resolution the figure is saved at.
+
+        Returns:
+            dict: The background image, its extent and the zorder of the map features.
+        """
+
+        key = (proj, domain, tuple(map_features), tuple(pixel_size), dpi)
+        if key in self.map_backgrounds:
+            return self.map_backgrounds[key]
+
+        # Draw the background using the same code path as a regular map plot
+        figsize = (pixel_size[0] / dpi, pixel_size[1] / dpi)
+        background_plot = CreatePlot(plot_layers=[], projection=proj, domain=domain)
+        background_plot.add_map_features(map_features)
+        background_fig = CreateFigure(nrows=1, ncols=1, figsize=figsize)
+        background_fig.plot_list = [background_plot]
+        background_fig.create_figure()
+
+        mpl_fig = background_fig.fig
+        mpl_fig.set_dpi(dpi)
+        mpl_fig.set_size_inches(figsize)
+        ax = mpl_fig.axes[0]
+
+        # The map axes fills the figure so it has the size of the axes the background is for
+        ax.set_position([0.0, 0.0, 1.0, 1.0])
+
+        # Only the map features should end up in the image
+        mpl_fig.patch.set_alpha(0.0)
+        ax.patch.set_alpha(0.0)
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+
+        canvas = FigureCanvasAgg(mpl_fig)
+        canvas.draw()
+        rgba = np.asarray(canvas.buffer_rgba())
+
+        # Crop to the pixels covered by the map (pixel origin is the lower left)
+        bbox = ax.get_window_extent()
+        height = rgba.shape[0]
+        row_start = max(int(round(height - bbox.y1)), 0)
+        row_end = min(int(round(height - bbox.y0)), height)
+        col_start = max(int(round(bbox.x0)), 0)
+        col_end = min(int(round(bbox.x1)), rgba.shape[1])
+
+        map_artists = list(ax.collections) + list(ax.lines) + list(ax.patches) + list(ax.artists)
+        zorders = [artist.get_zorder() for artist in map_artists]
+
+        background = {}
+        background['image'] = rgba[row_start:row_end, col_start:col_end].copy()
+        background['extent'] = ax.get_xlim() + ax.get_ylim()
+        background['zorder'] = max(zorders) if zorders else 1.5
+
+        background_fig.close_figure()
+
+        self.map_backgrounds[key] = background
+        return background
+
+    def add_map_backgrounds(self, fig, backgrounds, dpi):
+
+        """
+        Blit map backgrounds, rendered for the size of each map axes, into a created figure.
+
+        This should be done once the layout of the figure is final so that the background has
+        one pixel for each pixel of the axes in the saved figure.
+
+        Args:
+            fig (CreateFigure): The figure after create_figure has been called.
+            backgrounds (list): The projection, domain and map features of the background (or None)
+                                for each plot with a projection, in the order the plots appear in
+                                the figure.
+            dpi (float): Resolution the figure is saved at.
+        """
+
+        map_axes = [ax for ax in fig.fig.axes if hasattr(ax, 'projection')]
+
+        for ax, background_spec in zip(map_axes, backgrounds):
+            if background_spec is None:
+                continue
+
+            # Size of the axes in the saved figure
+            bbox = ax.get_window_extent()
+            scale = dpi / fig.fig.dpi
+            pixel_size = (max(int(round(bbox.width * scale)), 1),
+                          max(int(round(bbox.height * scale)), 1))
+            background = self.get_map_background(*background_spec, pixel_size, dpi)
+
+            # Keep the limits of the map as they were set up for the data
+            xlim = ax.get_xlim()
+            ylim = ax.get_ylim()
+            ax.imshow(background['image'], extent=background['extent'], origin='upper',
+                      transform=ax.projection, zorder=background['zorder'])
+            ax.set_xlim(xlim)
+            ax.set_ylim(ylim)
+
+    def use_projected_coordinates(self, fig, layers):
+
+        """
+        Make the map scatter layers of a created figure draw from cached projected coordinates.
+
+        Args:
+            fig (CreateFigure): The figure after create_figure has been called.
+            layers (list): The eva layers of each plot of the figure.
+        """
+
+        map_axes = [ax for ax in fig.fig.axes if hasattr(ax, 'projection')]
+        map_layers = [plot_layers for plot, plot_layers in zip(fig.plot_list, layers)
+                      if plot.projection is not None]
+
+        for ax, plot_layers in zip(map_axes, map_layers):
+            self.projection_cache.apply_to_axes(ax, plot_layers)
+
+    def start_figure_writer(self, workers):
+
+        """
+        Encode and write figure images on background threads from now on.
+
+        Args:
+            workers (int): Number of threads encoding and writing images. Figures are saved
+                           synchronously if this is zero.
+        """
+
+        if workers > 0:
+            self.figure_writer = FigureWriter(workers)
+
+    def save_figure(self, fig, output_file, saveargs):
+
+        """
+        Save a created figure, handing the image to the background writer when there is one.
+
+        Args:
+            fig (CreateFigure): The figure after create_figure has been called.
+            output_file (str): The file to write the figure to.
+            saveargs (dict): Arguments for saving the figure.
+        """
+
+        if self.figure_writer is None:
+            fig.save_figure(output_file, **saveargs)
+        else:
+            self.figure_writer.save(fig, output_file, saveargs)
+
+    def finish_figure_writer(self):
+
+        """
+        Wait until the background writer has written all the figures.
+
+        Returns:
+            list: (output file, exception) for each figure that could not be written.
+        """
+
+        if self.figure_writer is None:
+            return []
+
+        errors = self.figure_writer.finish()
+        self.figure_writer = None
+        return errors
@@ -0,0 +1,179 @@
+# (C) Copyright 2021-2023 NOAA/NWS/EMC
+#
+# (C) Copyright 2021-2023 United States Government as represented by the Administrator of the
+# National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+from concurrent.futures import ThreadPoolExecutor
+import io
+import os
+import threading
+
+import matplotlib as mpl
+import numpy as np
+from PIL import Image
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+# Image formats that are encoded on the background threads, other formats are saved directly
+raster_formats = ['png', 'jpg', 'jpeg', 'tif', 'tiff', 'webp']
+
+# Arguments of savefig that are resolved when the figure is rendered
+render_arguments = ['dpi', 'facecolor', 'edgecolor', 'bbox_inches', 'pad_inches', 'transparent']
+
+# Arguments that are used when the image is encoded, or that are not for savefig at all
+encode_arguments = ['format', 'metadata', 'pil_kwargs', 'output name']
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def capture_image(figure, output_file, saveargs):
+
+    """
+    Render a figure to pixels along with everything needed to encode them.
+
+    The figure is rendered by savefig, so dpi, bbox_inches, facecolor and so on are resolved as
+    they would be for any other save, into an uncompressed PNG in memory. The costly compression
+    is left to encode_and_write.
+
+    Args:
+        figure (matplotlib.figure.Figure): The figure to render.
+        output_file (str): The file the image will be written to.
+        saveargs (dict): Arguments for saving the figure.
+
+    Returns:
+        dict: The rendered image and how to encode it or None if the figure has to be saved
+              directly, e.g. for vector formats or arguments that are not handled here.
+    """
+
+    file_format = saveargs.get('format') or os.path.splitext(output_file)[1][1:] or \
+        mpl.rcParams['savefig.format']
+    file_format = str(file_format).lower()
+    unhandled = set(saveargs) - set(render_arguments) - set(encode_arguments)
+    if file_format not in raster_formats or unhandled:
+        return None
+
+    # Resolution stored in the image file
+    dpi = saveargs.get('dpi', mpl.rcParams['savefig.dpi'])
+    if dpi == 'figure':
+        dpi = figure.dpi
+
+    render_args = {key: saveargs[key] for key in render_arguments if key in saveargs}
+    rendered = io.BytesIO()
+    figure.savefig(rendered, format='png', pil_kwargs={'compress_level': 0}, **render_args)
+
+    image = {}
+    image['file'] = output_file
+    image['rendered'] = rendered.getvalue()
+    image['format'] = file_format
+    image['dpi'] = dpi
+    image['metadata'] = saveargs.get('metadata')
+    image['pil_kwargs'] = saveargs.get('pil_kwargs')
+    return image
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def encode_and_write(image):
+
+    """
+    Encode a rendered image and write it to file.
+
+    Args:
+        image (dict): The rendered image and encoding options as returned by capture_image.
+    """
+
+    with Image.open(io.BytesIO(image['rendered'])) as rendered:
+        rgba = np.asarray(rendered.convert('RGBA'))
+
+    output_dir = os.path.dirname(image['file'])
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    mpl.image.imsave(image['file'], rgba, format=image['format'], origin='upper',
+                     dpi=image['dpi'], metadata=image['metadata'],
+                     pil_kwargs=image['pil_kwargs'])
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+class FigureWriter:
+
+    """Encode and write rendered figures on background threads."""
+
+    def __init__(self, workers=2, max_pending=None):
+
+        """
+        Initialize the FigureWriter.
+
+        Args:
+            workers (int): Number of threads encoding and writing images.
+            max_pending (int): Maximum number of images waiting to be written. Saving another figure
+                               blocks until there is room, which bounds the memory held by
+                               captured pixels. Defaults to twice the number of workers.
+        """
+
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.pending = threading.BoundedSemaphore(max_pending or 2*workers)
+        self.futures = []
+
+    # ----------------------------------------------------------------------------------------------
+
+    def save(self, fig, output_file, saveargs):
+
+        """
+        Render a figure and queue the encoding and writing of the image.
+
+        Figures that cannot be captured (e.g. vector formats) are saved directly.
+
+        Args:
+            fig (CreateFigure): The figure after create_figure has been called.
+            output_file (str): The file to write the figure to.
+            saveargs (dict): Arguments for saving the figure.
+        """
+
+        image = capture_image(fig.fig, output_file, saveargs)
+        if image is None:
+            fig.save_figure(output_file, **saveargs)
+            return
+
+        self.pending.acquire()
+        future = self.executor.submit(encode_and_write, image)
+        future.add_done_callback(lambda _: self.pending.release())
+        self.futures.append((output_file, future))
+
+    # ----------------------------------------------------------------------------------------------
+
+    def finish(self):
+
+        """
+        Wait for all queued images to be written and shut down the threads.
+
+        Returns:
+            list: (output file, exception) for each image that could not be written.
+        """
+
+        errors = []
+        for output_file, future in self.futures:
+            exception = future.exception()
+            if exception is not None:
+                errors.append((output_file, exception))
+
+        self.futures = []
+        self.executor.shutdown()
+
+        return errors
+
+
+# --------------------------------------------------------------------------------------------------
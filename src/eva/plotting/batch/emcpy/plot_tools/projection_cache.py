@@ -0,0 +1,126 @@
+# (C) Copyright 2021-2023 NOAA/NWS/EMC
+#
+# (C) Copyright 2021-2023 United States Government as represented by the Administrator of the
+# National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+from collections import OrderedDict
+
+import cartopy.crs as ccrs
+from cartopy.mpl.geoaxes import InterProjectionTransform
+from matplotlib.collections import PathCollection
+import numpy as np
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+class ProjectionCache:
+
+    """
+    Cache of map scatter coordinates projected from latitude/longitude to a map projection.
+
+    Projected points are keyed by the coordinate variables they come from, their slicing and the
+    domain they were culled to, so figures plotting the same points share one projection even
+    though each figure selects them again. Only scatter layers are handled. Gridded layers are
+    projected by cartopy when pcolormesh is called, before the figure handler sees them.
+    """
+
+    def __init__(self, max_entries=32):
+
+        """
+        Initialize the ProjectionCache.
+
+        Args:
+            max_entries (int): Maximum number of projected coordinate arrays to keep. The least
+                               recently used array is released once this is exceeded.
+        """
+
+        self.max_entries = max_entries
+        self._projected = OrderedDict()
+
+    # ----------------------------------------------------------------------------------------------
+
+    def project(self, coordinate_key, longitude, latitude, target_projection):
+
+        """
+        Project longitudes and latitudes, reusing the result for the same coordinates.
+
+        Args:
+            coordinate_key (tuple): Identifies the coordinates, the same for the same points.
+            longitude (ndarray): The longitudes of the points.
+            latitude (ndarray): The latitudes of the points.
+            target_projection (cartopy.crs.Projection): The coordinate system to project to.
+
+        Returns:
+            ndarray: An (n, 2) read-only array of points in target coordinates.
+        """
+
+        key = (coordinate_key, target_projection)
+
+        if key in self._projected:
+            self._projected.move_to_end(key)
+            return self._projected[key]
+
+        projected = target_projection.transform_points(ccrs.PlateCarree(), longitude,
+                                                       latitude)[:, 0:2]
+        projected.setflags(write=False)
+
+        self._projected[key] = projected
+        if len(self._projected) > self.max_entries:
+            self._projected.popitem(last=False)
+
+        return projected
+
+    # ----------------------------------------------------------------------------------------------
+
+    def apply_to_axes(self, ax, layers):
+
+        """
+        Replace the scatter points of a map axes by points projected once and cached.
+
+        Scatter offsets drawn from PlateCarree coordinates are otherwise re-projected every time
+        the figure is drawn. The scatter collections of the axes are matched in order with the
+        map scatter layers of the plot, nothing is changed if they cannot be matched.
+
+        Args:
+            ax (cartopy.mpl.geoaxes.GeoAxes): The map axes.
+            layers (list): The eva layers of the plot drawn in the axes.
+        """
+
+        uncached = InterProjectionTransform(ccrs.PlateCarree(), ax.projection) + ax.transData
+
+        scatter_layers = [layer for layer in layers if hasattr(layer, 'coordinate_key')]
+        collections = [collection for collection in ax.collections
+                       if isinstance(collection, PathCollection) and
+                       collection.get_offset_transform() == uncached]
+        if not scatter_layers or len(scatter_layers) != len(collections):
+            return
+
+        for layer, collection in zip(scatter_layers, collections):
+            longitude = np.asarray(layer.lonvar)
+            latitude = np.asarray(layer.latvar)
+            offsets = collection.get_offsets()
+            if layer.coordinate_key is None or longitude.ndim != 1 or \
+                    longitude.shape != latitude.shape or len(offsets) != longitude.size:
+                continue
+
+            projected = self.project(layer.coordinate_key, longitude, latitude, ax.projection)
+            if len(projected) != len(offsets):
+                continue
+
+            # Points that matplotlib masked (e.g. non-finite values) stay hidden
+            if np.ma.is_masked(offsets):
+                projected = np.ma.array(projected, mask=np.ma.getmaskarray(offsets))
+
+            collection.set_offsets(projected)
+            collection.set_offset_transform(ax.transData)
+
+
+# --------------------------------------------------------------------------------------------------
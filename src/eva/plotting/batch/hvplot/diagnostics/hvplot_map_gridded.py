@@ -11,6 +11,11 @@ class HvplotMapGridded(MapGridded):
     Attributes:
         Inherits attributes from the MapGridded class.
     """
+
+    # The plot is made from the full collection so the coordinates must not be culled or coarsened
+    cull_to_domain = False
+    coarsen_to_pixels = False
+
     def configure_plot(self):
         """
         Configures and generates a gridded map plot using hvplot.
@@ -15,3 +15,21 @@ class HvplotFigureHandler():
 
     def create_figure(self, nrows, ncols, figsize):
         return CreateFigure(nrows=nrows, ncols=ncols, figsize=figsize)
+
+    def figure_dpi(self, saveargs):
+        # Bokeh sizes figures in screen pixels, of which there are 96 per inch
+        return 96.0
+
+    def use_projected_coordinates(self, fig, layers):
+        # Projection of map layers is handled by geoviews when the figure is rendered
+        pass
+
+    def start_figure_writer(self, workers):
+        # Figures are saved through holoviews which does not expose the rendered image
+        pass
+
+    def save_figure(self, fig, output_file, saveargs):
+        fig.save_figure(output_file, **saveargs)
+
+    def finish_figure_writer(self):
+        return []
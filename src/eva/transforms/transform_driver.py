@@ -10,9 +10,7 @@
 # --------------------------------------------------------------------------------------------------
 
 from eva.utilities.config import get
-
-import importlib
-import os
+from eva.utilities.registry import registered_object
 
 # --------------------------------------------------------------------------------------------------
 
@@ -52,8 +50,8 @@ def transform_driver(config, data_collections, timing, logger):
         transform_type = transform_type.replace(' ', '_')
 
         # Instantiate the tranform object
-        transform_method = getattr(importlib.import_module('eva.transforms.'+transform_type),
-                                   transform_type)
+        transform_method = registered_object('transforms', transform_type,
+                                             'eva.transforms.'+transform_type)
 
         # Call the transform
         timing.start(f'Transform: {transform_type}')
@@ -0,0 +1,161 @@
+# (C) Copyright 2021-2023 NOAA/NWS/EMC
+#
+# (C) Copyright 2021-2023 United States Government as represented by the Administrator of the
+# National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+import math
+import numpy as np
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+# Latitude/longitude boxes [lon_min, lon_max, lat_min, lat_max] that contain everything visible
+# in the regional map domains. The boxes are deliberately generous so that culling never removes
+# data that would be drawn. Domains that are not listed (including global) are not culled.
+domain_bounds = {
+    'north': [-180.0, 180.0, 20.0, 90.0],
+    'south': [-180.0, 180.0, -90.0, -20.0],
+    'north america': [-180.0, -30.0, 0.0, 90.0],
+    'conus': [-140.0, -50.0, 10.0, 60.0],
+    'europe': [-35.0, 65.0, 20.0, 80.0],
+    'alaska': [-180.0, -120.0, 45.0, 80.0],
+    'hawaii': [-170.0, -145.0, 10.0, 30.0],
+}
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+class LatLonBucketIndex:
+
+    """Coarse latitude/longitude bucket index for selecting the points inside a region."""
+
+    def __init__(self, latitude, longitude, bucket_size=10.0):
+
+        """
+        Build the index by sorting the points into latitude/longitude buckets.
+
+        Args:
+            latitude (ndarray): Latitude of the points (any shape).
+            longitude (ndarray): Longitude of the points, same shape as latitude.
+            bucket_size (float): Size of the buckets in degrees.
+        """
+
+        self.shape = latitude.shape
+        self.bucket_size = bucket_size
+        self.nlon = int(math.ceil(360.0 / bucket_size))
+        self.nlat = int(math.ceil(180.0 / bucket_size))
+
+        self.latitude = latitude.reshape(-1)
+        self.longitude = (longitude.reshape(-1) + 180.0) % 360.0 - 180.0
+
+        # Bucket of each point, points with missing coordinates go in an extra last bucket
+        valid = np.isfinite(self.latitude) & np.isfinite(self.longitude)
+        ilat = np.zeros(self.latitude.size, dtype=np.int64)
+        ilon = np.zeros(self.latitude.size, dtype=np.int64)
+        ilat[valid] = np.clip(((self.latitude[valid] + 90.0) / bucket_size).astype(np.int64), 0,
+                              self.nlat - 1)
+        ilon[valid] = np.clip(((self.longitude[valid] + 180.0) / bucket_size).astype(np.int64), 0,
+                              self.nlon - 1)
+        bucket = ilat * self.nlon + ilon
+        bucket[~valid] = self.nlat * self.nlon
+
+        # Points sorted by bucket and where each bucket starts in the sorted list
+        self.order = np.argsort(bucket, kind='stable')
+        counts = np.bincount(bucket, minlength=self.nlat * self.nlon + 1)
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    # ----------------------------------------------------------------------------------------------
+
+    def select(self, lon_min, lon_max, lat_min, lat_max):
+
+        """
+        Return the flat indices of the points inside a latitude/longitude box.
+
+        Args:
+            lon_min (float): Western edge of the box in degrees (-180 to 180).
+            lon_max (float): Eastern edge of the box in degrees (-180 to 180).
+            lat_min (float): Southern edge of the box in degrees.
+            lat_max (float): Northern edge of the box in degrees.
+
+        Returns:
+            ndarray: Sorted flat indices of the points inside the box.
+        """
+
+        ilat0 = max(int((lat_min + 90.0) // self.bucket_size), 0)
+        ilat1 = min(int((lat_max + 90.0) // self.bucket_size), self.nlat - 1)
+        ilon0 = max(int((lon_min + 180.0) // self.bucket_size), 0)
+        ilon1 = min(int((lon_max + 180.0) // self.bucket_size), self.nlon - 1)
+
+        # Within a latitude row the buckets of the box are contiguous in the sorted list
+        candidates = []
+        for ilat in range(ilat0, ilat1 + 1):
+            start = self.offsets[ilat * self.nlon + ilon0]
+            end = self.offsets[ilat * self.nlon + ilon1 + 1]
+            candidates.append(self.order[start:end])
+        candidates = np.sort(np.concatenate(candidates)) if candidates else \
+            np.array([], dtype=np.int64)
+
+        # Remove the points in the edge buckets that fall outside the box
+        lat = self.latitude[candidates]
+        lon = self.longitude[candidates]
+        inside = (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+
+        return candidates[inside]
+
+    # ----------------------------------------------------------------------------------------------
+
+    def select_domain(self, domain):
+
+        """
+        Return the flat indices of the points inside a named map domain.
+
+        Args:
+            domain (str): Name of the map domain.
+
+        Returns:
+            ndarray: Sorted flat indices of the points inside the domain or None if the domain
+                     does not have known bounds, in which case no culling should be done.
+        """
+
+        if domain not in domain_bounds:
+            return None
+        return self.select(*domain_bounds[domain])
+
+    # ----------------------------------------------------------------------------------------------
+
+    def domain_slices(self, domain, margin=1):
+
+        """
+        Return the smallest index box of the (gridded) points that contains a named map domain.
+
+        Args:
+            domain (str): Name of the map domain.
+            margin (int): Number of extra grid cells to keep around the box along each axis.
+
+        Returns:
+            tuple: Slices along each axis of the grid, or None if no culling should be done.
+        """
+
+        indices = self.select_domain(domain)
+        if indices is None or indices.size == 0:
+            return None
+
+        slices = []
+        for axis_indices, axis_size in zip(np.unravel_index(indices, self.shape), self.shape):
+            start = max(int(axis_indices.min()) - margin, 0)
+            end = min(int(axis_indices.max()) + margin + 1, axis_size)
+            slices.append(slice(start, end))
+
+        return tuple(slices)
+
+
+# --------------------------------------------------------------------------------------------------
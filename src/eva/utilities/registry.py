@@ -0,0 +1,115 @@
+# (C) Copyright 2021-2023 NOAA/NWS/EMC
+#
+# (C) Copyright 2021-2023 United States Government as represented by the Administrator of the
+# National Aeronautics and Space Administration. All Rights Reserved.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+import importlib
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+# Module of each class or function that can be named in a configuration. A module is only imported
+# when something it provides is used. Names that are not listed here are looked for in the module
+# given by the naming convention of their kind.
+registry = {
+
+    # Dataset readers (type of a dataset)
+    'data': {
+        'CsvSpace': 'eva.data.csv_space',
+        'CubedSphereRestart': 'eva.data.cubed_sphere_restart',
+        'GeovalSpace': 'eva.data.geoval_space',
+        'GsiObsSpace': 'eva.data.gsi_obs_space',
+        'IodaObsSpace': 'eva.data.ioda_obs_space',
+        'JediLog': 'eva.data.jedi_log',
+        'JediVariationalBiasCorrection': 'eva.data.jedi_variational_bias_correction',
+        'LatLon': 'eva.data.lat_lon',
+        'MonDataSpace': 'eva.data.mon_data_space',
+        'SocaRestart': 'eva.data.soca_restart',
+    },
+
+    # Transforms (transform of a transform, with spaces replaced by underscores)
+    'transforms': {
+        'accept_where': 'eva.transforms.accept_where',
+        'arithmetic': 'eva.transforms.arithmetic',
+        'channel_stats': 'eva.transforms.channel_stats',
+        'latlon_match': 'eva.transforms.latlon_match',
+        'select_time': 'eva.transforms.select_time',
+    },
+
+    # Dynamic options of a graphic (type of a dynamic option)
+    'dynamic_options': {
+        'histogram_bins': 'eva.plotting.batch.base.plot_tools.dynamic_config',
+        'vminvmaxcmap': 'eva.plotting.batch.base.plot_tools.dynamic_config',
+    },
+
+    # Figure handler of each plotting backend
+    'figure_handlers': {
+        'EmcpyFigureHandler': 'eva.plotting.batch.emcpy.plot_tools.emcpy_figure_handler',
+        'HvplotFigureHandler': 'eva.plotting.batch.hvplot.plot_tools.hvplot_figure_handler',
+    },
+
+    # Layers of a plot (backend name followed by the type of a layer)
+    'layers': {
+        'EmcpyDensity': 'eva.plotting.batch.emcpy.diagnostics.emcpy_density',
+        'EmcpyHistogram': 'eva.plotting.batch.emcpy.diagnostics.emcpy_histogram',
+        'EmcpyHorizontalLine': 'eva.plotting.batch.emcpy.diagnostics.emcpy_horizontal_line',
+        'EmcpyLinePlot': 'eva.plotting.batch.emcpy.diagnostics.emcpy_line_plot',
+        'EmcpyMapGridded': 'eva.plotting.batch.emcpy.diagnostics.emcpy_map_gridded',
+        'EmcpyMapScatter': 'eva.plotting.batch.emcpy.diagnostics.emcpy_map_scatter',
+        'EmcpyScatter': 'eva.plotting.batch.emcpy.diagnostics.emcpy_scatter',
+        'EmcpyVerticalLine': 'eva.plotting.batch.emcpy.diagnostics.emcpy_vertical_line',
+        'HvplotDensity': 'eva.plotting.batch.hvplot.diagnostics.hvplot_density',
+        'HvplotHistogram': 'eva.plotting.batch.hvplot.diagnostics.hvplot_histogram',
+        'HvplotHorizontalLine': 'eva.plotting.batch.hvplot.diagnostics.hvplot_horizontal_line',
+        'HvplotLinePlot': 'eva.plotting.batch.hvplot.diagnostics.hvplot_line_plot',
+        'HvplotMapGridded': 'eva.plotting.batch.hvplot.diagnostics.hvplot_map_gridded',
+        'HvplotMapScatter': 'eva.plotting.batch.hvplot.diagnostics.hvplot_map_scatter',
+        'HvplotScatter': 'eva.plotting.batch.hvplot.diagnostics.hvplot_scatter',
+        'HvplotVerticalLine': 'eva.plotting.batch.hvplot.diagnostics.hvplot_vertical_line',
+    },
+}
+
+
+# Classes and functions that have already been looked up
+_loaded = {}
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def registered_object(kind, name, default_module):
+
+    """
+    Return the class or function of a kind with a given name, importing its module if needed.
+
+    Args:
+        kind (str): The kind of object: data, transforms, dynamic_options, figure_handlers or
+                    layers.
+        name (str): The name of the class or function.
+        default_module (str): Module to look in if the name is not in the registry.
+
+    Returns:
+        object: The class or function.
+
+    Raises:
+        ImportError: If the module cannot be imported.
+        AttributeError: If the module does not have the class or function.
+    """
+
+    key = (kind, name)
+    if key not in _loaded:
+        module_name = registry[kind].get(name, default_module)
+        _loaded[key] = getattr(importlib.import_module(module_name), name)
+
+    return _loaded[key]
+
+
+# --------------------------------------------------------------------------------------------------
@@ -46,6 +46,11 @@ def get_field_data(logger, field, data_collections):
     if 'channel' in field:
         channel = field['channel']
 
+    # Without slicing the flattened and masked data can come straight from the collection
+    if 'slices' not in field:
+        return data_collections.get_valid_variable_data(var_cgv[0], var_cgv[1], var_cgv[2],
+                                                        channel)
+
     # Get the field data
     field_data = data_collections.get_variable_data(var_cgv[0], var_cgv[1], var_cgv[2], channel)
 
@@ -63,6 +68,49 @@ def get_field_data(logger, field, data_collections):
 # --------------------------------------------------------------------------------------------------
 
 
+def compute_statistics(field_data, stats_variables):
+
+    """
+    Compute the requested statistics of a field in a single call.
+
+    The mean is computed once and reused for the variance and standard deviation, and the
+    median uses a partial sort rather than a full sort of the data.
+
+    Args:
+        field_data (ndarray): The flattened field data with missing values removed.
+        stats_variables (list): The statistics to compute (n, min, max, mean, median, std, var).
+
+    Returns:
+        dict: The value of each requested statistic.
+    """
+
+    field_data = np.asarray(field_data)
+    stats = {}
+
+    if 'n' in stats_variables:
+        stats['n'] = field_data.size
+    if 'min' in stats_variables:
+        stats['min'] = np.min(field_data)
+    if 'max' in stats_variables:
+        stats['max'] = np.max(field_data)
+    if 'median' in stats_variables:
+        stats['median'] = np.median(field_data)
+
+    if any(stat in stats_variables for stat in ['mean', 'std', 'var']):
+        mean = np.mean(field_data)
+        stats['mean'] = mean
+        if 'std' in stats_variables or 'var' in stats_variables:
+            anomaly = field_data - mean
+            var = anomaly.dtype.type(np.sum(anomaly * anomaly) / field_data.size)
+            stats['var'] = var
+            stats['std'] = np.sqrt(var)
+
+    return stats
+
+
+# --------------------------------------------------------------------------------------------------
+
+
 def stats_helper(logger, plot_obj, data_collections, config):
 
     """
@@ -87,13 +135,17 @@ def stats_helper(logger, plot_obj, data_collections, config):
     # Rounding
     digits = config.get('round', 3)
 
+    # Check the statistics are supported
+    supported_stats = ['n', 'min', 'max', 'mean', 'median', 'std', 'var']
+    for stats_variable in stats_variables:
+        if stats_variable not in supported_stats:
+            logger.abort(f'In stats_helper the statistic {stats_variable} is not supported.')
+
+    # Get the data for each field once
+    fields_data = [get_field_data(logger, field, data_collections) for field in fields]
+
     # Find the max data length in order to format the string
-    counts = []
-    for field in fields:
-        # Field name
-        field_name = field['field_name']
-        field_data = get_field_data(logger, field, data_collections)
-        counts.append(len(field_data))
+    counts = [len(field_data) for field_data in fields_data]
     n_len = str(len(str(np.max(counts))))
 
     # Format dictionary
@@ -108,37 +160,24 @@ def stats_helper(logger, plot_obj, data_collections, config):
     format_dict['var'] = double_format
 
     # Loop over fields and assemble statistics as a string
-    for field in fields:
-
-        # Field name
-        field_name = field['field_name']
-
-        # Get field data
-        field_data = get_field_data(logger, field, data_collections)
+    for field, field_data in zip(fields, fields_data):
 
         # Stats will fail if the field_data list is empty
         if not field_data.any():
-            field_data = [1.0e38, 1.0e38, 1.0e38]
-
-        # Initialize the stats string
-        stats_string = ''
-
-        # Loop over statistics list and assemble string
-        for index, stats_variable in enumerate(stats_variables):
+            field_data = np.array([1.0e38, 1.0e38, 1.0e38])
 
-            if stats_variable in ['n']:
-                stat_value = len(field_data)
-            elif stats_variable in ['min', 'max', 'mean', 'median', 'std', 'var']:
-                stat_value = eval(f'np.nan{stats_variable}(field_data)')
-                stat_value = eval(f'np.round(stat_value, {digits})')
-            else:
-                logger.abort(f'In stats_helper the statistic {stats_variable} is not supported.')
+        # Compute all the statistics for the field
+        stats = compute_statistics(field_data, stats_variables)
 
+        # Assemble the statistics string
+        stats_strings = []
+        for stats_variable in stats_variables:
+            stat_value = stats[stats_variable]
+            if stats_variable != 'n':
+                stat_value = np.round(stat_value, digits)
             stat_formatted = format_dict[stats_variable].format(stat_value)
-            stats_string = stats_string + f'{stats_variable} = ' + stat_formatted
-
-            if index < len(stats_variables) - 1:
-                stats_string = stats_string + ' | '
+            stats_strings.append(f'{stats_variable} = ' + stat_formatted)
+        stats_string = ' | '.join(stats_strings)
 
         # Get the location for the annotation
         x_loc = field.get('xloc', 0.5)
@@ -152,3 +191,113 @@ def stats_helper(logger, plot_obj, data_collections, config):
 
 
 # --------------------------------------------------------------------------------------------------
+
+
+class VariableStatistics:
+
+    """
+    Statistics of a (selection of a) variable that are reused by several figures.
+
+    Results are computed on first request and kept, so dynamic options that look at the same
+    variable, channel, level or datatype for different figures only pay for them once. Only the
+    results are kept, the data is fetched again if a statistic that has not been computed yet is
+    requested.
+    """
+
+    def __init__(self, load_data):
+
+        """
+        Initialize the VariableStatistics.
+
+        Args:
+            load_data (callable): Returns the flattened variable data with missing values removed
+                                  and the number of elements of the variable including missing
+                                  values.
+        """
+
+        self._load_data = load_data
+
+        valid_data, self.size = load_data()
+        self._count = valid_data.size
+
+        # Trimming nothing keeps the whole range of the valid data
+        self._trimmed_ranges = {}
+        if self._count > 0:
+            self._trimmed_ranges[0] = (valid_data.min(), valid_data.max())
+        else:
+            self._trimmed_ranges[0] = None
+
+        self._skewness = None
+
+    # ----------------------------------------------------------------------------------------------
+
+    def count(self):
+
+        """
+        Return the number of valid (non-missing) elements.
+
+        Returns:
+            int: The number of valid elements.
+        """
+
+        return self._count
+
+    # ----------------------------------------------------------------------------------------------
+
+    def trimmed_range(self, percentage_capture):
+
+        """
+        Return the minimum and maximum of the data once the extremes have been trimmed.
+
+        Conceptually the data is sorted (missing values last) and the same number of elements is
+        thrown out at each end so that percentage_capture percent of the elements are kept. Only
+        the two order statistics bounding the kept data are needed so they are found by selection
+        rather than by sorting all of the data.
+
+        Args:
+            percentage_capture (float): Percentage of the elements to keep.
+
+        Returns:
+            tuple: The (min, max) of the kept valid data or None if it contains no valid data.
+        """
+
+        # Decide how many values to throw out on each end of the dataset
+        n_throw_out = int(np.floor(((100 - percentage_capture) * self.size / 100) / 2))
+        n_throw_out = max(n_throw_out, 0)
+
+        if n_throw_out in self._trimmed_ranges:
+            return self._trimmed_ranges[n_throw_out]
+
+        # The kept elements that are valid are those between the two order statistics below
+        first = n_throw_out
+        last = min(self.size - n_throw_out, self._count) - 1
+
+        if last < first:
+            trimmed_range = None
+        else:
+            kth = [first, last] if last > first else [first]
+            partitioned = np.partition(self._load_data()[0], kth)
+            trimmed_range = (partitioned[first], partitioned[last])
+
+        self._trimmed_ranges[n_throw_out] = trimmed_range
+        return trimmed_range
+
+    # ----------------------------------------------------------------------------------------------
+
+    def skewness(self):
+
+        """
+        Return the skewness of the valid data.
+
+        Returns:
+            float: The skewness of the valid data.
+        """
+
+        if self._skewness is None:
+            # Imported here since scipy is slow to import and only needed for this statistic
+            from scipy.stats import skew
+            self._skewness = skew(self._load_data()[0])
+        return self._skewness
+
+
+# --------------------------------------------------------------------------------------------------
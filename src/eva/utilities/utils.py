@@ -6,6 +6,9 @@
 
 # --------------------------------------------------------------------------------------------------
 
+import copy
+import glob
+import os
 import re
 import string
 import yaml
@@ -102,6 +105,40 @@ def load_yaml_file(eva_config, logger):
 # --------------------------------------------------------------------------------------------------
 
 
+# Parsed schema files keyed by path, with the modification time they were parsed at
+_schema_cache = {}
+
+
+def load_schema_file(YamlFile, logger=None):
+
+    """
+    Load a schema YAML file, parsing it again only if it changed since it was last loaded.
+
+    Args:
+        YamlFile (str): Path to the YAML file.
+        logger (Logger, optional): The logger object for logging messages. Defaults to None.
+
+    Returns:
+        dict: The contents of the YAML file. This is shared between calls and must not be
+              modified.
+    """
+
+    try:
+        mtime = os.stat(YamlFile).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    cached = _schema_cache.get(YamlFile)
+    if cached is None or mtime is None or cached[0] != mtime:
+        cached = (mtime, load_yaml_file(YamlFile, logger))
+        _schema_cache[YamlFile] = cached
+
+    return cached[1]
+
+
+# --------------------------------------------------------------------------------------------------
+
+
 def get_schema(YamlFile, configDict={}, logger=None):
 
     """
@@ -125,7 +162,7 @@ def get_schema(YamlFile, configDict={}, logger=None):
     skipvars = ['type', 'comparison']
 
     # read schema from YAML file
-    fullConfig = load_yaml_file(YamlFile, logger)
+    fullConfig = copy.deepcopy(load_schema_file(YamlFile, logger))
 
     # update full config dict based on input configDict
     for key, value in configDict.items():
@@ -455,6 +492,76 @@ def slice_var_from_str(config, datavar, logger):
 # --------------------------------------------------------------------------------------------------
 
 
+def read_variable_levels(nc_variable, levels=None):
+
+    """
+    Read a netCDF variable, optionally only some of its vertical levels, and squeeze out the
+    dimensions of size one.
+
+    The vertical dimension is the one before the two horizontal dimensions of variables with more
+    than three dimensions, e.g. (Time, zaxis, yaxis, xaxis). Only the slabs of the requested
+    levels are read from the file and the vertical dimension is kept even if one level is
+    requested.
+
+    The variable is read without a mask. Missing values of float variables are set to NaN in
+    place, missing values of other variables are left as they are in the file.
+
+    Parameters:
+        nc_variable (netCDF4.Variable): The variable to read.
+        levels (list): Sorted indices (starting from 0) of the levels to read. All levels are read
+                       if None or empty.
+
+    Returns:
+        ndarray: The (squeezed) contiguous array of the variable.
+
+    Raises:
+        IndexError: If a level is not in the variable.
+    """
+
+    # Imported here so that utilities used at start up do not need them
+    from netCDF4 import default_fillvals
+    import numpy as np
+
+    # Packed variables are read with a mask since their fill value is not scaled
+    attributes = nc_variable.ncattrs()
+    packed = 'scale_factor' in attributes or 'add_offset' in attributes
+    nc_variable.set_auto_mask(packed)
+
+    if not levels or nc_variable.ndim <= 3:
+        var = np.squeeze(nc_variable[:])
+    else:
+        level_axis = nc_variable.ndim - 3
+        nlevels = nc_variable.shape[level_axis]
+        if levels[0] < 0 or levels[-1] >= nlevels:
+            raise IndexError(f'Levels {levels} are not all within the {nlevels} levels of ' +
+                             f'{nc_variable.name}')
+
+        index = [slice(None)] * nc_variable.ndim
+        index[level_axis] = levels
+        var = nc_variable[tuple(index)]
+
+        squeeze_axes = tuple(axis for axis, size in enumerate(var.shape)
+                             if size == 1 and axis != level_axis)
+        var = np.squeeze(var, axis=squeeze_axes)
+
+    is_float = np.issubdtype(var.dtype, np.floating)
+    if np.ma.isMaskedArray(var):
+        var = np.ma.filled(var, np.nan) if is_float else np.ma.getdata(var)
+    elif is_float:
+        # Values that netCDF4 would have masked
+        missing_values = [nc_variable.getncattr('_FillValue') if '_FillValue' in attributes
+                          else default_fillvals[var.dtype.str[1:]]]
+        if 'missing_value' in attributes:
+            missing_values.extend(np.atleast_1d(nc_variable.getncattr('missing_value')))
+        for missing_value in missing_values:
+            var[var == missing_value] = np.nan
+
+    return np.ascontiguousarray(var)
+
+
+# --------------------------------------------------------------------------------------------------
+
+
 def is_number(s):
 
     """
@@ -474,3 +581,56 @@ def is_number(s):
         return False
 
 # --------------------------------------------------------------------------------------------------
+
+
+def config_strings(config):
+
+    """
+    Return all the strings in a (nested) configuration.
+
+    Args:
+        config (dict or list or str): The configuration.
+
+    Returns:
+        list: The strings found in the keys and values of the configuration.
+    """
+
+    if isinstance(config, str):
+        return [config]
+    if isinstance(config, dict):
+        return [s for key, value in config.items() for s in config_strings(key) +
+                config_strings(value)]
+    if isinstance(config, (list, tuple)):
+        return [s for value in config for s in config_strings(value)]
+    return []
+
+
+# --------------------------------------------------------------------------------------------------
+
+
+def file_fingerprints(config):
+
+    """
+    Return the size and modification time of the files named in a configuration.
+
+    Args:
+        config (dict): The configuration, e.g. of a dataset.
+
+    Returns:
+        list: The path, size and modification time of each file. Strings containing wildcards are
+              expanded.
+    """
+
+    fingerprints = []
+    for string in config_strings(config):
+        paths = [string] if os.path.isfile(string) else []
+        if not paths and glob.has_magic(string):
+            paths = sorted(p for p in glob.glob(string) if os.path.isfile(p))
+        for path in paths:
+            stat = os.stat(path)
+            fingerprints.append([path, stat.st_size, stat.st_mtime_ns])
+
+    return fingerprints
+
+
+# --------------------------------------------------------------------------------------------------